@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Per-turn allocation profile of the graph hot path (tracemalloc).
+
+Runs the corpus through the compiled graph on the fake backend and reports,
+per turn, the peak traced allocation, the memory still held after the turn
+and the wall time. ``--entry models`` seeds each turn with the Pydantic
+``InputPayload`` / ``Questions`` models, which every tree accepts;
+``--entry records`` seeds it with ``graph.state.new_turn_state`` (trees that
+have it). The entry only changes how the first state is built, so compare
+trees, not entries: run the script from a checkout of the older tree with
+``--label`` and ``--append`` to put both runs in one report.
+
+Usage:
+    python benchmarks/alloc_profile.py
+    git worktree add /tmp/before <commit>
+    cp benchmarks/alloc_profile.py /tmp/before/benchmarks/
+    python /tmp/before/benchmarks/alloc_profile.py --entry models --label before --output benchmarks/reports/alloc_profile.txt
+    python benchmarks/alloc_profile.py --entry models,records --label after --append --output benchmarks/reports/alloc_profile.txt
+"""
+
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import common  # noqa: F401  (sets up sys.path)
+from common import install_fake_backend, summarize
+from corpus import CORPUS
+
+
+def _entry_factory(mode: str) -> Callable[[str], Dict[str, Any]]:
+    if mode == "models":
+        from graph.state import InputPayload, Questions
+        return lambda text: {"input": InputPayload(raw_text=text), "questions": Questions()}
+    if mode == "records":
+        from graph.state import new_turn_state
+        return lambda text: new_turn_state(text)
+    raise ValueError(f"unknown entry mode: {mode}")
+
+
+def profile_entry(graph: Any, make_state: Callable[[str], Dict[str, Any]], iterations: int) -> Dict[str, Dict[str, float]]:
+    """Peak / retained KB and wall ms per turn for one way of seeding the state."""
+    graph.invoke(make_state(CORPUS[0]["text"]))  # warm caches outside the measurement
+    peak_kb: List[float] = []
+    retained_kb: List[float] = []
+    turn_ms: List[float] = []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            for entry in CORPUS:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                graph.invoke(make_state(entry["text"]))
+                turn_ms.append((time.perf_counter() - start) * 1000)
+                current, peak = tracemalloc.get_traced_memory()
+                peak_kb.append((peak - before) / 1024)
+                retained_kb.append((current - before) / 1024)
+    finally:
+        tracemalloc.stop()
+    return {"peak_kb": summarize(peak_kb), "retained_kb": summarize(retained_kb), "turn_ms": summarize(turn_ms)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=5, help="Passes over the corpus per entry mode")
+    parser.add_argument("--entry", default="models,records", help="Comma-separated entry modes: models, records")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the fake backend")
+    parser.add_argument("--label", default="HEAD", help="Name of the tree being measured (first report column)")
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--append", action="store_true", help="Append rows to --output instead of rewriting it")
+    args = parser.parse_args()
+    args.latency_ms = args.jitter_ms = args.error_rate = 0.0
+    install_fake_backend(args)
+
+    from graph.build_graph import get_compiled_graph
+    graph = get_compiled_graph()
+
+    lines = []
+    if not (args.append and args.output and os.path.exists(args.output)):
+        lines.append(f"Allocation per turn (tracemalloc, {args.iterations} x {len(CORPUS)} turns, fake LLM)")
+        lines.append("-" * 88)
+        lines.append(f"{'tree':<10}{'entry':<10}{'metric':<14}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>12}")
+    for mode in [m.strip() for m in args.entry.split(",") if m.strip()]:
+        result = profile_entry(graph, _entry_factory(mode), args.iterations)
+        for metric, stats in result.items():
+            lines.append(f"{args.label:<10}{mode:<10}{metric:<14}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['max']:>12.1f}")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "a" if args.append else "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""End-to-end graph benchmark against the deterministic fake LLM backend.
+
+Runs every message in the corpus through the compiled graph and reports
+per-node and end-to-end latency percentiles, LLM calls per turn and the peak
+memory allocated per turn. No API key or network is needed.
+
+Usage:
+    python benchmarks/bench_graph.py --iterations 20 --latency-ms 40 --jitter-ms 20
+    python benchmarks/bench_graph.py --cassette cassettes/prod.jsonl --simulate-latency --speedup 20
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import common  # noqa: F401  (sets up sys.path)
+from common import NodeTimer, add_backend_args, cassette_stats, install_fake_backend, load_messages, print_table, summarize
+from corpus import CORPUS
+
+
+def run(args) -> dict:
+    install_fake_backend(args)
+    messages = load_messages(args, CORPUS)
+
+    from graph.build_graph import build_graph
+    from graph.state import new_turn_state
+    from llm.call_ledger import get_call_ledger
+    from llm.router import get_model_router
+    from app.settings import Settings
+
+    timer = NodeTimer()
+    graph = build_graph(node_wrapper=timer)
+    ledger = get_call_ledger()
+
+    turn_ms = []
+    llm_calls = []
+    queue_ms = []
+    alloc_kb = []
+    failures = 0
+    by_behavior = {}
+
+    if args.alloc:
+        tracemalloc.start()
+
+    # Warm-up turn so one-off imports/compilation are not measured
+    graph.invoke(new_turn_state(messages[0]["text"]))
+    timer.timings.clear()
+
+    for _ in range(args.iterations):
+        for entry in messages:
+            calls_before = ledger.total_calls
+            if args.alloc:
+                tracemalloc.reset_peak()
+                mem_before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                graph.invoke(new_turn_state(entry["text"]))
+            except Exception as e:
+                failures += 1
+                print(f"Turn failed ({entry['behavior']}): {e}")
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            turn_ms.append(elapsed_ms)
+            calls = ledger.total_calls - calls_before
+            llm_calls.append(calls)
+            if calls:
+                # Time spent waiting on the client-side rate limiter (0 unless LLM_RATE_LIMITS is set)
+                queue_ms.extend(r.queue_ms for r in ledger.records()[-calls:])
+            by_behavior.setdefault(entry["behavior"], []).append(elapsed_ms)
+            if args.alloc:
+                alloc_kb.append((tracemalloc.get_traced_memory()[1] - mem_before) / 1024)
+
+    if args.alloc:
+        tracemalloc.stop()
+
+    return {
+        "config": {
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "cassette": args.cassette,
+            "speedup": args.speedup,
+        },
+        "turns": len(turn_ms),
+        "failures": failures,
+        "end_to_end_ms": summarize(turn_ms),
+        "llm_calls_per_turn": summarize([float(c) for c in llm_calls]),
+        "llm_queue_ms": summarize(queue_ms),
+        "alloc_peak_kb_per_turn": summarize(alloc_kb),
+        "nodes_ms": {name: summarize(values) for name, values in sorted(timer.timings.items())},
+        "behaviors_ms": {name: summarize(values) for name, values in sorted(by_behavior.items())},
+        "cassette": cassette_stats(args),
+        "routes": _route_counts(get_model_router(Settings(), ledger)),
+    }
+
+
+def _route_counts(router) -> dict:
+    """Routing decisions per task, e.g. {"extract": {"pro/static": 40}}."""
+    counts = {}
+    for decision in router.decisions():
+        key = f"{decision.tier}/{decision.reason}"
+        task_counts = counts.setdefault(decision.task, {})
+        task_counts[key] = task_counts.get(key, 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=5, help="Passes over the corpus")
+    parser.add_argument("--no-alloc", dest="alloc", action="store_false", help="Skip tracemalloc allocation tracking")
+    parser.add_argument("--json", help="Write the full report to this file")
+    add_backend_args(parser)
+    args = parser.parse_args()
+
+    report = run(args)
+
+    print(f"\nTurns: {report['turns']}  Failures: {report['failures']}")
+    if report["cassette"]:
+        # Misses mean the graph now sends prompts that were never recorded (drift)
+        print(f"Cassette: {report['cassette']}")
+    print_table("End to end (ms)", {"turn": report["end_to_end_ms"]})
+    print_table("LLM calls per turn", {"calls": report["llm_calls_per_turn"]})
+    print_table("LLM rate-limit queue wait (ms)", {"wait": report["llm_queue_ms"]})
+    if args.alloc:
+        print_table("Peak allocation per turn (KB)", {"alloc": report["alloc_peak_kb_per_turn"]})
+    print_table("Per node (ms)", report["nodes_ms"])
+    print_table("Per behavior (ms)", report["behaviors_ms"])
+    print("\nModel routing decisions")
+    for task, counts in sorted(report["routes"].items()):
+        print(f"  {task:<12} " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Shared helpers for the offline benchmark scripts."""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Add src to path so benchmarks run from the project root or this directory
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0..100); 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+def add_backend_args(parser) -> None:
+    """LLM backend flags shared by every benchmark script (fake backend or cassette)."""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per fake LLM call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform extra latency per fake LLM call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a fake LLM call raises")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for latency/error injection")
+    parser.add_argument("--cassette", help="Replay LLM responses from this cassette instead of the fake backend")
+    parser.add_argument("--record", action="store_true", help="Record a cassette from the live Gemini backend (needs an API key)")
+    parser.add_argument("--simulate-latency", action="store_true", help="Sleep for recorded latencies when replaying")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Divide simulated cassette latencies by this factor")
+    parser.add_argument("--messages", help="JSONL file of {\"text\": ...} messages to run instead of the built-in corpus")
+
+
+def install_fake_backend(args) -> None:
+    """Route every LLMClient to the fake backend, or to a cassette if one was given."""
+    if getattr(args, "cassette", None):
+        os.environ["LLM_CASSETTE_MODE"] = "record" if args.record else "replay"
+        os.environ["LLM_CASSETTE_PATH"] = args.cassette
+        os.environ["LLM_CASSETTE_SIMULATE_LATENCY"] = "true" if args.simulate_latency else "false"
+        os.environ["LLM_CASSETTE_SPEEDUP"] = str(args.speedup)
+        if args.record:
+            return  # live backend underneath the recorder
+
+    from llm.client import set_llm_backend
+    from llm.fake_backend import fake_backend_factory
+    set_llm_backend(fake_backend_factory(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed
+    ))
+
+
+def load_messages(args, corpus: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Messages from --messages (captured traffic) or the built-in corpus."""
+    if not getattr(args, "messages", None):
+        return corpus
+    messages = []
+    with open(args.messages, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                messages.append({"trip": entry.get("trip"), "behavior": entry.get("behavior", "captured"), "text": entry["text"]})
+    return messages
+
+
+def cassette_stats(args) -> Optional[Dict[str, int]]:
+    if not getattr(args, "cassette", None):
+        return None
+    from llm.cassette import get_cassette
+    return get_cassette(args.cassette).stats()
+
+
+class NodeTimer:
+    """build_graph node_wrapper that records wall time per node (thread-safe)."""
+
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, fn: Callable) -> Callable:
+        def timed(state: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return fn(state)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                with self._lock:
+                    self.timings.setdefault(name, []).append(elapsed_ms)
+        return timed
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print("\n" + title)
+    print("-" * 78)
+    print(f"{'name':<32}{'count':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>11}")
+    for name, stats in rows.items():
+        print(f"{name:<32}{stats['count']:>8}{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['p99']:>9.2f}{stats['max']:>11.2f}")
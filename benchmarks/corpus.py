@@ -0,0 +1,42 @@
+"""Realistic WhatsApp message corpus for offline benchmarks.
+
+Each entry is tagged with the trip it targets (or None) and the behavior it
+exercises so results can be sliced per trip / per behavior.
+"""
+
+CORPUS = [
+    # --- Kashmir ---
+    {"trip": "kashmir", "behavior": "logistics", "text": "Is pickup included in the Kashmir trip, or do I need to reach Srinagar on my own?"},
+    {"trip": "kashmir", "behavior": "weather", "text": "What kind of weather should I expect during the Kashmir trip, and will there definitely be snowfall?"},
+    {"trip": "kashmir", "behavior": "seat_availability", "text": "Are seats available on 18th January 2026 for Kashmir?"},
+    {"trip": "kashmir", "behavior": "pricing", "text": "kashmir trip ka total cost kitna hai? what is the price"},
+    # --- Spiti ---
+    {"trip": "spiti", "behavior": "itinerary", "text": "Tell me about the Spiti trip?"},
+    {"trip": "spiti", "behavior": "logistics", "text": "Where is the meeting point for Spiti, Delhi or Chandigarh?"},
+    {"trip": "spiti", "behavior": "safety", "text": "Is the Spiti expedition safe for a solo female traveller and what precautions should I take"},
+    # --- Rajasthan ---
+    {"trip": "rajasthan", "behavior": "itinerary", "text": "Can you share the day wise itinerary for Rajasthan?"},
+    {"trip": "rajasthan", "behavior": "seat_availability", "text": "How many seats are left for the Rajasthan trip on 24th January 2026?"},
+    {"trip": "rajasthan", "behavior": "packing", "text": "What should I pack for Rajasthan in winter"},
+    # --- South India ---
+    {"trip": "south_india", "behavior": "logistics", "text": "For South India trip do we start from Bangalore? is accommodation on sharing basis"},
+    {"trip": "south_india", "behavior": "pricing", "text": "What's the price for South India and what is included?"},
+    # --- Andaman ---
+    {"trip": "andaman", "behavior": "weather", "text": "How is the weather in Andaman in February and can we do scuba?"},
+    {"trip": "andaman", "behavior": "seat_availability", "text": "Can I book the Andaman trip for 31st January 2026?"},
+    {"trip": "andaman", "behavior": "logistics", "text": "Is the ferry to Havelock included and where do we meet in Port Blair?"},
+    # --- Behaviors ---
+    {"trip": None, "behavior": "group_size", "text": "Can you share how many people have registered so far?"},
+    {"trip": None, "behavior": "gender_ratio", "text": "How many female travelers are usually there in the group?"},
+    {"trip": None, "behavior": "decision_confirmation", "text": "Okay thanks, I will confirm after discussing with my friends"},
+    {"trip": None, "behavior": "call_request", "text": "Can we get on a quick call"},
+    {"trip": None, "behavior": "booking_confirmation", "text": "I just booked the trip!"},
+    {"trip": None, "behavior": "booking_with_concern", "text": "Booked... but after that no update, is there an issue?"},
+    {"trip": None, "behavior": "discount", "text": "Any discounts for first time travelers?"},
+    {"trip": None, "behavior": "refund", "text": "What's your cancellation policy and will I get a full refund?"},
+    {"trip": None, "behavior": "forbidden", "text": "Can you guarantee a refund if I cancel next week?"},
+    {"trip": None, "behavior": "hostile", "text": "this is a stupid useless service"},
+    {"trip": None, "behavior": "malformed", "text": "??"},
+    {"trip": None, "behavior": "multi_question", "text": "Is pickup included and what about refunds? also how many days is the trip"},
+]
+
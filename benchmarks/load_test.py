@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Concurrent load generator simulating many WhatsApp sessions in one process.
+
+Each synthetic session runs a multi-turn script (trip inquiry, price, seats,
+call request, booking) through ConversationMemory and the compiled graph, with
+randomized think time between turns. Turns are served by a bounded worker
+pool, so once the pool saturates turns queue up and the queue wait grows.
+
+Reports throughput, turn/queue latency percentiles, StateStore ops/s and
+memory growth. Use --sweep to find the saturation point.
+
+Usage:
+    python benchmarks/load_test.py --sessions 1000 --workers 32 --latency-ms 300 --jitter-ms 200
+    python benchmarks/load_test.py --sessions 500 --sweep 8,16,32,64 --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import common  # noqa: F401  (sets up sys.path)
+from common import add_backend_args, install_fake_backend, print_table, summarize
+
+SESSION_SCRIPT = [
+    "Hi, tell me about the Kashmir trip?",
+    "What is the total cost of the trip?",
+    "Are seats available on 7th February 2026?",
+    "Can we get on a quick call",
+    "I want to book the trip, call me tomorrow evening",
+    "I just booked the trip!",
+]
+
+
+class CountingStateStore:
+    """StateStore proxy counting get/get_many/set/delete calls (thread-safe)."""
+
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.Lock()
+        self.ops = 0
+
+    def _count(self):
+        with self._lock:
+            self.ops += 1
+
+    def get(self, key):
+        self._count()
+        return self._store.get(key)
+
+    def get_many(self, keys):
+        self._count()
+        return self._store.get_many(keys)
+
+    def set(self, key, value):
+        self._count()
+        self._store.set(key, value)
+
+    def delete(self, key):
+        self._count()
+        self._store.delete(key)
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _session(session_id, script, loop, executor, run_turn, rng, args, results):
+    for text in script:
+        ready = time.perf_counter()
+        start_holder = {}
+
+        def timed_turn():
+            start_holder["start"] = time.perf_counter()
+            return run_turn(session_id, text)
+
+        try:
+            await loop.run_in_executor(executor, timed_turn)
+            finished = time.perf_counter()
+            start = start_holder["start"]
+            results["queue_ms"].append((start - ready) * 1000)
+            results["service_ms"].append((finished - start) * 1000)
+            results["turn_ms"].append((finished - ready) * 1000)
+        except Exception as e:
+            results["errors"] += 1
+            if results["errors"] <= 5:
+                print(f"Turn failed for {session_id}: {e}")
+
+        think_ms = rng.uniform(args.think_min_ms, args.think_max_ms) * args.think_scale
+        await asyncio.sleep(think_ms / 1000)
+
+
+def run_level(args, workers: int) -> dict:
+    from app.turn import process_turn
+    from app.warmup import warmup
+    from graph.build_graph import get_compiled_graph
+    from state.memory import ConversationMemory
+    from state.store import StateStore
+
+    warmup()
+    graph = get_compiled_graph()
+    store = CountingStateStore(StateStore())
+    memory = ConversationMemory(store)
+
+    def run_turn(session_id, text):
+        return process_turn(graph, memory, session_id, text)
+
+    results = {"queue_ms": [], "service_ms": [], "turn_ms": [], "errors": 0}
+    rng = random.Random(args.seed)
+    script = SESSION_SCRIPT[:args.turns] if args.turns else SESSION_SCRIPT
+
+    if args.trace_malloc:
+        tracemalloc.start()
+        mem_start = tracemalloc.get_traced_memory()[0]
+    rss_start = _rss_mb()
+    started = time.perf_counter()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tasks = []
+            for i in range(args.sessions):
+                # Stagger session arrivals over the ramp-up window
+                delay = rng.uniform(0, args.ramp_up_s) if args.ramp_up_s else 0
+
+                async def start_session(i=i, delay=delay):
+                    await asyncio.sleep(delay)
+                    await _session(f"load_session_{i}", script, loop, executor, run_turn,
+                                   random.Random(args.seed + i), args, results)
+                tasks.append(asyncio.create_task(start_session()))
+            await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    duration = time.perf_counter() - started
+    mem_growth_mb = mem_peak_mb = None
+    if args.trace_malloc:
+        mem_end, mem_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mem_growth_mb = round((mem_end - mem_start) / 1024 / 1024, 2)
+        mem_peak_mb = round(mem_peak / 1024 / 1024, 2)
+
+    turns = len(results["turn_ms"])
+    return {
+        "workers": workers,
+        "sessions": args.sessions,
+        "turns": turns,
+        "errors": results["errors"],
+        "duration_s": round(duration, 2),
+        "throughput_turns_per_s": round(turns / duration, 2) if duration else 0.0,
+        "turn_ms": summarize(results["turn_ms"]),
+        "service_ms": summarize(results["service_ms"]),
+        "queue_wait_ms": summarize(results["queue_ms"]),
+        "state_store_ops": store.ops,
+        "state_store_ops_per_s": round(store.ops / duration, 2) if duration else 0.0,
+        "traced_memory_growth_mb": mem_growth_mb,
+        "traced_memory_peak_mb": mem_peak_mb,
+        "rss_growth_mb": round(_rss_mb() - rss_start, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sessions", type=int, default=200, help="Concurrent synthetic sessions")
+    parser.add_argument("--workers", type=int, default=16, help="Worker threads serving turns")
+    parser.add_argument("--sweep", help="Comma-separated worker counts to run in sequence, e.g. 8,16,32")
+    parser.add_argument("--turns", type=int, default=0, help="Only run the first N turns of the script")
+    parser.add_argument("--ramp-up-s", type=float, default=2.0, help="Spread session starts over this many seconds")
+    parser.add_argument("--think-min-ms", type=float, default=2000, help="Minimum think time between turns")
+    parser.add_argument("--think-max-ms", type=float, default=15000, help="Maximum think time between turns")
+    parser.add_argument("--think-scale", type=float, default=0.01, help="Compress think times (1.0 = real time)")
+    parser.add_argument("--trace-malloc", action="store_true", help="Track Python allocations with tracemalloc (slows turns)")
+    parser.add_argument("--json", help="Write the report(s) to this file")
+    add_backend_args(parser)
+    args = parser.parse_args()
+
+    install_fake_backend(args)
+
+    levels = [int(w) for w in args.sweep.split(",")] if args.sweep else [args.workers]
+    reports = []
+    for workers in levels:
+        report = run_level(args, workers)
+        reports.append(report)
+        print(f"\nworkers={workers} sessions={report['sessions']} turns={report['turns']} errors={report['errors']} "
+              f"duration={report['duration_s']}s throughput={report['throughput_turns_per_s']} turns/s")
+        memory = f"rss +{report['rss_growth_mb']} MB"
+        if args.trace_malloc:
+            memory += f", traced +{report['traced_memory_growth_mb']} MB (peak {report['traced_memory_peak_mb']} MB)"
+        print(f"state store: {report['state_store_ops']} ops ({report['state_store_ops_per_s']} ops/s)  memory: {memory}")
+        print_table("Latency (ms)", {
+            "turn (queue + service)": report["turn_ms"],
+            "service": report["service_ms"],
+            "queue wait": report["queue_wait_ms"],
+        })
+
+    if len(reports) > 1:
+        print("\nSaturation sweep")
+        print("-" * 78)
+        print(f"{'workers':>8}{'turns/s':>12}{'turn p95':>12}{'queue p95':>12}{'errors':>8}")
+        for r in reports:
+            print(f"{r['workers']:>8}{r['throughput_turns_per_s']:>12.2f}{r['turn_ms']['p95']:>12.2f}"
+                  f"{r['queue_wait_ms']['p95']:>12.2f}{r['errors']:>8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports if len(reports) > 1 else reports[0], f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Cold-start profile for a worker process (python -X importtime).
+
+Each stage runs in a fresh interpreter so nothing is cached in-process:
+importing the graph module, building and compiling the graph, and serving one
+turn on the fake backend. For every stage the wall time is the median over
+--runs; the last run's ``-X importtime`` log gives the slowest imports by
+cumulative time.
+
+Usage:
+    python benchmarks/startup_profile.py
+    python benchmarks/startup_profile.py --runs 5 --top 25 --output benchmarks/reports/startup_profile.txt
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+import common  # noqa: F401  (sets up sys.path)
+from common import _src_dir
+
+STAGES = {
+    "import graph.build_graph": "import graph.build_graph",
+    "build_graph()": "from graph.build_graph import build_graph; build_graph()",
+    "first turn (fake LLM)": (
+        "from graph.build_graph import build_graph; "
+        "from graph.state import new_turn_state; "
+        "build_graph().invoke(new_turn_state('What is the price of the Kashmir trip?'))"
+    ),
+}
+
+_TIMER = "import time as _t; _s = _t.perf_counter(); {code}; print('STAGE_MS', (_t.perf_counter() - _s) * 1000)"
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_stage(code: str) -> Tuple[float, str]:
+    """Run ``code`` in a fresh interpreter; return (wall ms, importtime log)."""
+    env = dict(os.environ, PYTHONPATH=_src_dir, LLM_BACKEND="fake", TRANSFORMERS_NO_TORCH="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _TIMER.format(code=code)],
+        capture_output=True, text=True, env=env, check=True
+    )
+    stage_ms = next(float(line.split()[1]) for line in result.stdout.splitlines() if line.startswith("STAGE_MS"))
+    return stage_ms, result.stderr
+
+
+def parse_importtime(log: str) -> List[Dict[str, object]]:
+    """Imports from an importtime log as {module, self_ms, cumulative_ms, depth}."""
+    rows = []
+    for line in log.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_ms": int(match.group(1)) / 1000,
+                "cumulative_ms": int(match.group(2)) / 1000,
+                "depth": len(match.group(3)) // 2,
+            })
+    return rows
+
+
+def top_level_packages(rows: List[Dict[str, object]]) -> Dict[str, float]:
+    """Cumulative import time per top-level package (depth-0 imports only)."""
+    totals: Dict[str, float] = {}
+    for row in rows:
+        if row["depth"] == 0:
+            package = str(row["module"]).split(".")[0]
+            totals[package] = totals.get(package, 0.0) + float(row["cumulative_ms"])
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per stage (median is reported)")
+    parser.add_argument("--top", type=int, default=20, help="Slowest imports to list")
+    parser.add_argument("--output", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    lines = ["Startup profile (python -X importtime, median of %d runs)" % args.runs, "-" * 78]
+    last_log = ""
+    for name, code in STAGES.items():
+        timings = []
+        for _ in range(args.runs):
+            stage_ms, last_log = run_stage(code)
+            timings.append(stage_ms)
+        lines.append(f"{name:<40}{statistics.median(timings):>10.1f} ms")
+
+    rows = parse_importtime(last_log)
+    lines += ["", "Import time by top-level package (first turn)", "-" * 78]
+    for package, ms in list(top_level_packages(rows).items())[:args.top]:
+        lines.append(f"{package:<60}{ms:>10.1f} ms")
+
+    lines += ["", f"Slowest {args.top} imports by cumulative time (first turn)", "-" * 78]
+    lines.append(f"{'module':<52}{'self ms':>12}{'cumul. ms':>14}")
+    for row in sorted(rows, key=lambda r: -float(r["cumulative_ms"]))[:args.top]:
+        lines.append(f"{str(row['module']):<52}{float(row['self_ms']):>12.1f}{float(row['cumulative_ms']):>14.1f}")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""Replay an exported JSONL of conversations through the graph (see src/app/replay.py).
+
+Usage:
+    python replay_conversations.py export.jsonl --output results.jsonl --workers 8
+    python replay_conversations.py export.jsonl --fake --workers 0 --limit 20
+"""
+
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+# Prevent torch loading issues on Windows (set before any imports)
+os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
+
+from app.replay import main
+
+
+if __name__ == "__main__":
+    main()
@@ -11,45 +11,25 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
 
 # Configure LangSmith before importing (if using env vars)
-from app.settings import Settings
-settings = Settings()
+from app.tracing import configure_tracing
+configure_tracing()
 
-if settings.langsmith_tracing:
-    langsmith_key = settings.effective_langsmith_api_key()
-    if langsmith_key:
-        os.environ["LANGCHAIN_TRACING_V2"] = "true"
-        os.environ["LANGCHAIN_API_KEY"] = langsmith_key
-        os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
-        os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
-        # Handle workspace ID for org-scoped API keys (optional - set if available)
-        workspace_id = (
-            os.getenv("LANGSMITH_WORKSPACE_ID") or 
-            settings.langsmith_workspace_id or
-            os.getenv("LANGCHAIN_WORKSPACE_ID")
-        )
-        if workspace_id:
-            os.environ["LANGSMITH_WORKSPACE_ID"] = workspace_id
-            os.environ["LANGCHAIN_WORKSPACE_ID"] = workspace_id
-
-from graph.build_graph import build_graph
-from graph.state import ConversationWorkflowState, InputPayload, Questions
+from graph.build_graph import get_compiled_graph
+from graph.state import new_turn_state
 
 
 def main():
     """Run the test scenario."""
     
-    # Build the graph (tracing configured in build_graph)
-    graph = build_graph()
+    # Compiled once per process (tracing configured above)
+    graph = get_compiled_graph()
     
-    # Create initial state as dict (TypedDict requires dict input)
-    initial_state = {
-        "input": InputPayload(raw_text="Is pickup included and what about refunds?"),
-        "questions": Questions()
-    }
+    # Create initial state as dict records (TypedDict requires dict input)
+    initial_state = new_turn_state("Is pickup included and what about refunds?")
     
     # Run the graph
     print("Running workflow...")
-    input_text = initial_state["input"].raw_text if hasattr(initial_state["input"], "raw_text") else initial_state["input"].get("raw_text", "")
+    input_text = initial_state["input"]["raw_text"]
     print(f"Input: {input_text}")
     print("-" * 50)
     
@@ -11,37 +11,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
 
 # Configure LangSmith BEFORE importing graph modules (IMPORTANT for tracing!)
-from app.settings import Settings
-settings = Settings()
-
-if settings.langsmith_tracing:
-    langsmith_key = settings.effective_langsmith_api_key()
-    if langsmith_key:
-        os.environ["LANGCHAIN_TRACING_V2"] = "true"
-        os.environ["LANGCHAIN_API_KEY"] = langsmith_key
-        os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
-        os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
-        # Handle workspace ID for org-scoped API keys (optional)
-        workspace_id = (
-            os.getenv("LANGSMITH_WORKSPACE_ID") or 
-            settings.langsmith_workspace_id or
-            os.getenv("LANGCHAIN_WORKSPACE_ID")
-        )
-        if workspace_id:
-            os.environ["LANGSMITH_WORKSPACE_ID"] = workspace_id
-            os.environ["LANGCHAIN_WORKSPACE_ID"] = workspace_id
-    elif os.getenv("LANGCHAIN_API_KEY"):
-        os.environ["LANGCHAIN_TRACING_V2"] = "true"
-        os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
-        os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
+from app.tracing import configure_tracing
+configure_tracing()
 
 # Suppress LangSmith warnings for cleaner output
 import warnings
 warnings.filterwarnings('ignore')
 
-# NOW import build_graph (after env vars are set)
-from graph.build_graph import build_graph
-from graph.state import InputPayload, Questions
+# NOW import graph modules (after env vars are set)
+from graph.build_graph import get_compiled_graph
+from graph.state import new_turn_state
 
 def main():
     """Run Kashmir pickup query and show final response."""
@@ -54,13 +33,10 @@ def main():
     
     try:
         # Build graph
-        graph = build_graph()
+        graph = get_compiled_graph()
         
         # Create initial state
-        initial_state = {
-            "input": InputPayload(raw_text=query),
-            "questions": Questions()
-        }
+        initial_state = new_turn_state(query)
         
         # Run workflow
         print("Running workflow...\n")
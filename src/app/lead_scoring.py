@@ -0,0 +1,136 @@
+"""Lead qualification batch scoring over stored conversation state.
+
+``update_conversation_state`` keeps per-session ``intent_level``,
+``risk_level``, ``momentum_state``, ``focus``, ``topic_decay`` and
+``handoff_status`` under ``state:{session_id}``. This job walks those entries
+with ``StateStore.scan`` (a cursor, ``batch_size`` keys at a time, each batch
+fetched with one ``get_many``) and folds every session into a ``LeadReport``
+as it goes. Only the aggregates and the top leads are kept, so memory does
+not grow with the number of sessions.
+
+    from app.lead_scoring import run_lead_scoring
+    report = run_lead_scoring(store, output="reports/leads.json")
+"""
+
+import heapq
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+INTENT_POINTS = {"browsing": 10, "evaluating": 30, "booking_ready": 50}
+MOMENTUM_POINTS = {"building": 15, "stalled": 0, "looping": -10}
+RISK_POINTS = {"low": 10, "medium": 5, "high": 0}
+HANDOFF_POINTS = {"prepared": 10, "completed": 5}
+
+# Score bands: the first band whose floor the score reaches
+BANDS = (("hot", 70), ("warm", 40), ("cold", 0))
+SEGMENTS = ("booking_ready", "stalled", "looping", "handoff_prepared")
+
+
+def lead_score(state: Dict[str, Any]) -> int:
+    """0-100 score from one session's conversation state."""
+    focus = state.get("focus") or {}
+    score = INTENT_POINTS.get(state.get("intent_level"), 0)
+    score += 20 * float(focus.get("confidence") or 0.0)
+    score += MOMENTUM_POINTS.get(state.get("momentum_state"), 0)
+    score += RISK_POINTS.get(state.get("risk_level"), 0)
+    score += HANDOFF_POINTS.get(state.get("handoff_status"), 0)
+    # A lead focused on one destination is closer to booking than one spread over many
+    decay = state.get("topic_decay") or {}
+    total = sum(decay.values())
+    if total > 0:
+        score += 10 * max(decay.values()) / total
+    return max(0, min(100, round(score)))
+
+
+def lead_segments(state: Dict[str, Any]) -> List[str]:
+    segments = []
+    if state.get("intent_level") == "booking_ready":
+        segments.append("booking_ready")
+    if state.get("momentum_state") in ("stalled", "looping"):
+        segments.append(state["momentum_state"])
+    if state.get("handoff_status") == "prepared":
+        segments.append("handoff_prepared")
+    return segments
+
+
+def score_band(score: int) -> str:
+    for band, floor in BANDS:
+        if score >= floor:
+            return band
+    return BANDS[-1][0]
+
+
+class LeadReport:
+    """Running aggregates: segment / band / topic counts, a 10-point score histogram and the top leads."""
+
+    def __init__(self, top_n: int = 20):
+        self.top_n = top_n
+        self.sessions = 0
+        self.score_total = 0
+        self.segments = {segment: 0 for segment in SEGMENTS}
+        self.bands = {band: 0 for band, _ in BANDS}
+        self.topics: Dict[str, int] = {}
+        self.histogram = [0] * 11  # 0-9, 10-19, ..., 90-99, 100
+        self._top: List[Tuple[int, str, Dict[str, Any]]] = []
+
+    def add(self, session_id: str, state: Dict[str, Any]) -> int:
+        score = lead_score(state)
+        self.sessions += 1
+        self.score_total += score
+        for segment in lead_segments(state):
+            self.segments[segment] += 1
+        self.bands[score_band(score)] += 1
+        topic = (state.get("focus") or {}).get("primary_topic") or "none"
+        self.topics[topic] = self.topics.get(topic, 0) + 1
+        self.histogram[score // 10] += 1
+        lead = (score, session_id, {
+            "session_id": session_id,
+            "score": score,
+            "primary_topic": topic,
+            "intent_level": state.get("intent_level"),
+            "momentum_state": state.get("momentum_state"),
+            "handoff_status": state.get("handoff_status"),
+        })
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, lead)
+        elif lead[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, lead)
+        return score
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "sessions": self.sessions,
+            "mean_score": round(self.score_total / self.sessions, 1) if self.sessions else 0.0,
+            "segments": dict(self.segments),
+            "bands": dict(self.bands),
+            "topics": dict(sorted(self.topics.items(), key=lambda item: item[1], reverse=True)),
+            "score_histogram": {f"{bucket * 10}-{bucket * 10 + 9}" if bucket < 10 else "100": count
+                                for bucket, count in enumerate(self.histogram)},
+            "top_leads": [lead for _, _, lead in sorted(self._top, key=lambda item: item[:2], reverse=True)],
+        }
+
+
+def run_lead_scoring(store: Any, output: Optional[str] = None, batch_size: int = 500, top_n: int = 20) -> Dict[str, Any]:
+    """Score every ``state:*`` entry in ``store``; writes the report to ``output`` (JSON) when given."""
+    report = LeadReport(top_n)
+    started = time.perf_counter()
+    cursor = 0
+    while True:
+        cursor, keys = store.scan(cursor, match="state:*", count=batch_size)
+        if keys:
+            for key, state in store.get_many(keys).items():
+                if isinstance(state, dict):
+                    report.add(key[len("state:"):], state)
+        if cursor == 0:
+            break
+    result = report.to_dict()
+    result["duration_s"] = round(time.perf_counter() - started, 3)
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return result
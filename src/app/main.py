@@ -3,10 +3,19 @@
 
 from fastapi import FastAPI
 from .settings import Settings
+from .tracing import configure_tracing
+from .warmup import warmup
 
 settings = Settings()
+configure_tracing()
 app = FastAPI(title=settings.app_name)
 
+
+@app.on_event("startup")
+def prewarm():
+    # Compile the graph and create the shared LLM client before the first webhook
+    warmup()
+
 @app.get("/")
 def root():
     return {"message": "WhatsApp Lead Qualification API"}
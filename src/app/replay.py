@@ -0,0 +1,248 @@
+"""Bulk offline replay of exported conversations (re-qualify old leads after catalog or prompt changes).
+
+Input is JSONL with either one session per line::
+
+    {"session_id": "s1", "messages": [{"role": "user", "content": "...", "timestamp": "..."}, ...]}
+
+or one message per line (``{"session_id", "role", "content" or "text", "timestamp"}``).
+Session lines are streamed; message lines are grouped by session first.
+Only user messages are replayed. Within a session they run in timestamp
+order through ``app.turn.process_turn`` with a fresh ``ConversationMemory``.
+Turns run back to back, so every earlier turn is inside the history window.
+
+Independent sessions are spread over a process pool. Each worker compiles
+the graph and creates its shared LLM client once (``app.warmup``), and at
+most ``workers * 4`` sessions are in flight, so memory stays flat however
+large the export is. Output is one JSONL line per turn; a summary (trip
+resolution rate, escalations, turn latency percentiles) is printed at the end.
+With ``--lead-report`` the sessions' final states are also scored into a lead
+report (see ``app.lead_scoring``).
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+NOT_RESOLVED = "Not resolved"
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    return (message.get("content") or message.get("text") or "").strip()
+
+
+def _user_texts(messages: List[Dict[str, Any]]) -> List[str]:
+    """User messages of one session in timestamp order (file order for ties / missing timestamps)."""
+    ordered = sorted(messages, key=lambda message: message.get("timestamp") or "")
+    return [
+        _message_text(message) for message in ordered
+        if (message.get("role") or "user") == "user" and _message_text(message)
+    ]
+
+
+def iter_sessions(path: str) -> Iterator[Tuple[str, List[str]]]:
+    """(session_id, user texts) per session in the export."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Replay: skipping line {line_number}: {e}", file=sys.stderr)
+                continue
+            session_id = str(record.get("session_id") or f"line-{line_number}")
+            if isinstance(record.get("messages"), list):
+                yield session_id, _user_texts(record["messages"])
+            else:
+                grouped.setdefault(session_id, []).append(record)
+    for session_id, messages in grouped.items():
+        yield session_id, _user_texts(messages)
+
+
+def init_worker(fake_backend: bool = False, seed: int = 7) -> None:
+    """Per-process setup: optional fake LLM backend, compiled graph, shared client, private store."""
+    from app.warmup import warmup
+    from graph.build_graph import get_compiled_graph
+    from state.memory import ConversationMemory
+    from state.store import StateStore
+
+    if fake_backend:
+        from llm.client import set_llm_backend
+        from llm.fake_backend import fake_backend_factory
+        set_llm_backend(fake_backend_factory(seed=seed))
+    warmup()
+    _WORKER["graph"] = get_compiled_graph()
+    _WORKER["memory"] = ConversationMemory(StateStore())
+
+
+def replay_session(session_id: str, texts: List[str]) -> Dict[str, Any]:
+    """Replay one session's user messages in order; returns its turn records and final state."""
+    from app.lead_scoring import lead_score
+    from app.turn import process_turn
+
+    if not _WORKER:
+        init_worker()
+    graph, memory = _WORKER["graph"], _WORKER["memory"]
+    turns = []
+    for index, text in enumerate(texts):
+        start = time.perf_counter()
+        error = None
+        try:
+            result = process_turn(graph, memory, session_id, text)
+        except Exception as e:
+            result = {}
+            error = f"{type(e).__name__}: {e}"
+        turns.append({
+            "session_id": session_id,
+            "turn": index,
+            "text": text,
+            "final_text": result.get("final_text"),
+            "trip_id": result.get("trip_id", NOT_RESOLVED),
+            "confidence": result.get("confidence"),
+            "decision_stage": result.get("decision_stage"),
+            "escalation_flag": bool(result.get("escalation_flag")),
+            "turn_ms": round((time.perf_counter() - start) * 1000, 2),
+            "error": error,
+        })
+    state = memory.store.get(f"state:{session_id}") or {}
+    # Sessions never come back to the same worker; drop them so worker memory stays flat
+    for key in (f"history:{session_id}", f"state:{session_id}", f"summary:{session_id}"):
+        memory.store.delete(key)
+    return {
+        "session_id": session_id,
+        "turns": turns,
+        "state": state,
+        "final_state": {
+            "lead_score": lead_score(state),
+            "intent_level": state.get("intent_level"),
+            "risk_level": state.get("risk_level"),
+            "momentum_state": state.get("momentum_state"),
+            "primary_topic": (state.get("focus") or {}).get("primary_topic"),
+            "handoff_status": state.get("handoff_status"),
+        },
+    }
+
+
+class ReplayStats:
+    """Running totals over replayed sessions."""
+
+    def __init__(self):
+        self.sessions = 0
+        self.turns = 0
+        self.errors = 0
+        self.resolved = 0
+        self.escalated = 0
+        self.turn_ms: List[float] = []
+
+    def add(self, session: Dict[str, Any]) -> None:
+        self.sessions += 1
+        for turn in session["turns"]:
+            self.turns += 1
+            self.errors += turn["error"] is not None
+            self.resolved += turn["trip_id"] != NOT_RESOLVED
+            self.escalated += turn["escalation_flag"]
+            self.turn_ms.append(turn["turn_ms"])
+
+    def _percentile(self, pct: float) -> float:
+        if not self.turn_ms:
+            return 0.0
+        ordered = sorted(self.turn_ms)
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+    def report(self, duration_s: float) -> Dict[str, Any]:
+        return {
+            "sessions": self.sessions,
+            "turns": self.turns,
+            "errors": self.errors,
+            "trip_resolution_rate": round(self.resolved / self.turns, 3) if self.turns else 0.0,
+            "escalated_turns": self.escalated,
+            "turn_ms": {"p50": self._percentile(50), "p95": self._percentile(95), "p99": self._percentile(99)},
+            "duration_s": round(duration_s, 2),
+            "turns_per_s": round(self.turns / duration_s, 2) if duration_s else 0.0,
+        }
+
+
+def _write_session(out: Optional[TextIO], session: Dict[str, Any]) -> None:
+    """One line per turn; the session's last turn also carries its final conversation state."""
+    if out is None:
+        return
+    last = len(session["turns"]) - 1
+    for index, turn in enumerate(session["turns"]):
+        record = {**turn, "final_state": session["final_state"]} if index == last else turn
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def run_replay(
+    path: str,
+    output: Optional[str] = None,
+    workers: int = 4,
+    fake_backend: bool = False,
+    seed: int = 7,
+    limit: int = 0,
+    lead_report: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Replay every session in ``path``; ``workers=0`` runs in this process. Returns the summary."""
+    from app.lead_scoring import LeadReport
+
+    stats = ReplayStats()
+    leads = LeadReport() if lead_report else None
+    started = time.perf_counter()
+    out = open(output, "w", encoding="utf-8") if output else None
+    sessions = iter_sessions(path)
+    if limit:
+        sessions = islice(sessions, limit)
+
+    def collect(session: Dict[str, Any]) -> None:
+        stats.add(session)
+        _write_session(out, session)
+        if leads is not None and session["state"]:
+            leads.add(session["session_id"], session["state"])
+
+    try:
+        if workers <= 0:
+            init_worker(fake_backend, seed)
+            for session_id, texts in sessions:
+                collect(replay_session(session_id, texts))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(fake_backend, seed)) as pool:
+                in_flight: Set[Future] = set()
+                for session_id, texts in sessions:
+                    if len(in_flight) >= workers * 4:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+                    in_flight.add(pool.submit(replay_session, session_id, texts))
+                for future in in_flight:
+                    collect(future.result())
+    finally:
+        if out is not None:
+            out.close()
+    if leads is not None:
+        with open(lead_report, "w", encoding="utf-8") as f:
+            json.dump(leads.to_dict(), f, indent=2)
+    return stats.report(time.perf_counter() - started)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("input", help="JSONL export of conversations")
+    parser.add_argument("--output", help="Write per-turn results (JSONL) to this file")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes (0 = run in this process)")
+    parser.add_argument("--limit", type=int, default=0, help="Only replay the first N sessions")
+    parser.add_argument("--fake", action="store_true", help="Use the deterministic fake LLM backend (dry run, no API key)")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the fake backend")
+    parser.add_argument("--lead-report", help="Also score the replayed sessions into this lead report (JSON)")
+    args = parser.parse_args(argv)
+
+    summary = run_replay(args.input, args.output, args.workers, args.fake, args.seed, args.limit, args.lead_report)
+    print(json.dumps(summary, indent=2))
+    return summary
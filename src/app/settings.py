@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import os
 
 
@@ -27,11 +27,109 @@ class Settings(BaseSettings):
     langchain_project: Optional[str] = None
     langsmith_workspace_id: Optional[str] = None
     langsmith_tracing: bool = True
+    # Turn-level sampling (app.tracing): head-sample this fraction of turns and always
+    # export turns with errors or slower than trace_slow_turn_ms. 1.0 = trace every call inline
+    trace_sample_rate: float = 0.05
+    trace_slow_turn_ms: float = 8000.0
+    trace_queue_size: int = 256
+    trace_max_spans: int = 200
+    trace_export_path: Optional[str] = None  # write sampled traces to this JSONL file instead of LangSmith
     
     # Model configuration
     gemini_model: str = "gemini-2.5-pro"
     gemini_video_model: Optional[str] = None
-    
+
+    # LLM backend - "gemini" (default) or "fake" for offline runs
+    llm_backend: str = "gemini"
+    fake_llm_latency_ms: float = 0.0
+    fake_llm_error_rate: float = 0.0
+    fake_llm_seed: int = 0
+
+    # LLM cassette - "record" live prompt/response pairs or "replay" them offline
+    llm_cassette_mode: Optional[str] = None
+    llm_cassette_path: str = "cassettes/llm_cassette.jsonl"
+    llm_cassette_simulate_latency: bool = False
+    llm_cassette_speedup: float = 1.0
+
+    # LLM call ledger - bounded in-memory ring buffer, optional JSONL spill
+    llm_call_history_size: int = 500
+    llm_call_ledger_path: Optional[str] = None
+    llm_call_ledger_max_bytes: int = 10 * 1024 * 1024
+    llm_call_ledger_backups: int = 5
+
+    # Cross-session micro-batching of classify/categorize calls (0 ms = off)
+    llm_coalesce_window_ms: float = 0.0
+    llm_coalesce_max_batch: int = 16
+
+    # Client-side quota per model, e.g. {"gemini-2.5-pro": {"rpm": 150, "tpm": 2000000}}
+    # (JSON in LLM_RATE_LIMITS). Models without an entry are not limited.
+    llm_rate_limits: Dict[str, Dict[str, int]] = {}
+
+    # Per-turn latency budget (0 = no deadline) and retries for transient LLM errors
+    turn_budget_ms: float = 30000.0
+    llm_max_retries: int = 2
+    llm_retry_base_ms: float = 200.0
+    llm_retry_max_ms: float = 2000.0
+
+    # Hedged duplicate requests once a call exceeds its method's recent p95
+    llm_hedging: bool = False
+    llm_hedge_methods: List[str] = ["classify_question", "classify_questions_batch", "compose_answer"]
+    llm_hedge_min_samples: int = 20
+    # Threads for deadline-bounded and hedged calls (one per in-flight call, duplicates included)
+    llm_call_threads: int = 64
+
+    # Per-model circuit breaker; Pro tasks fail over to llm_failover_model (or Flash) while open
+    llm_circuit_breaker: bool = True
+    llm_breaker_window_s: float = 60.0
+    llm_breaker_min_calls: int = 10
+    llm_breaker_error_threshold: float = 0.5
+    llm_breaker_slow_call_ms: float = 0.0
+    llm_breaker_open_s: float = 30.0
+    llm_failover_model: Optional[str] = None
+
+    # Model routing per task: weighted tiers ("pro", "flash", "secondary" = llm_failover_model
+    # or Flash), optional failover tier and optional p95 ceiling (JSON in LLM_ROUTES replaces it)
+    llm_routes: Dict[str, Dict[str, Any]] = {
+        "classify": {"models": {"flash": 1.0}},
+        "categorize": {"models": {"flash": 1.0}},
+        "intent": {"models": {"flash": 1.0}},
+        "extract": {"models": {"pro": 1.0}, "failover": "secondary"},
+        "plan": {"models": {"pro": 1.0}, "failover": "secondary"},
+        "compose": {"models": {"flash": 1.0}},
+    }
+    llm_routing_min_samples: int = 20
+    # A tier whose recent error rate for a task is above this is routed around (routes may set max_error_rate)
+    llm_routing_max_error_rate: float = 0.25
+
+    # Input token budget per task (see llm.router.TASK_BY_METHOD); trip data is trimmed to fit
+    prompt_token_budgets: Dict[str, int] = {"extract": 3000, "plan": 2000}
+
+    # Trip catalog (domain.trips.catalog): JSON/YAML trip files layered over the built-in
+    # trips, re-read every trip_catalog_poll_s seconds (0 = load once)
+    trip_data_dir: Optional[str] = None
+    trip_catalog_poll_s: float = 5.0
+    # Optional SQLite trip store (domain.trips.store) for large catalogs: trips are loaded
+    # lazily, keeping at most trip_store_cache_size parsed trips in memory
+    trip_store_path: Optional[str] = None
+    trip_store_cache_size: int = 64
+
+    # Live seat inventory (domain.inventory): poll a JSON file and/or an HTTP endpoint
+    # for batch updates every inventory_poll_s seconds
+    inventory_feed_path: Optional[str] = None
+    inventory_feed_url: Optional[str] = None
+    inventory_poll_s: float = 5.0
+
+    # Seat-availability intent cache (domain.behaviors.intent): normalized questions kept
+    intent_cache_size: int = 2048
+
+    # Conversation history (state.compaction): past history_max_messages raw messages, all but
+    # the last history_keep_messages are folded into a rolling summary (0 = never compact)
+    history_max_messages: int = 40
+    history_keep_messages: int = 20
+
+    # app.warmup: also send a tiny request to each model at worker start
+    warmup_ping_models: bool = False
+
     def effective_gemini_api_key(self) -> str:
         """Get Gemini API key from any available source."""
         return (
@@ -0,0 +1,328 @@
+"""LangSmith tracing configuration and turn-level trace sampling.
+
+Inline ``@traceable`` tracing posts every LLM call of every turn. In
+production turns are traced through a sampling policy instead:
+
+- head sampling: a ``trace_sample_rate`` fraction of turns is kept up front
+- tail sampling: turns that failed, had an LLM error or ran longer than
+  ``trace_slow_turn_ms`` are always kept
+- export: kept turns go on a bounded queue drained by a background thread;
+  when the queue is full the trace is dropped (and counted), never waited on
+
+While a turn runs, graph nodes and LLM calls append compact spans to the
+turn's trace (a context variable, so nothing is threaded through state).
+"""
+
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.settings import Settings
+
+_CONFIGURED = False
+
+
+def configure_tracing(force: bool = False) -> None:
+    """Export LangSmith settings to the environment (once per process unless ``force``).
+
+    Per-call inline tracing (LANGCHAIN_TRACING_V2) is only switched on when
+    ``trace_sample_rate`` is 1.0; otherwise turns are sampled by this module.
+    Call before the first traced call; entry points call it before importing graph modules.
+    """
+    global _CONFIGURED
+    if _CONFIGURED and not force:
+        return
+    settings = Settings()
+    inline = settings.trace_sample_rate >= 1.0
+
+    if settings.langsmith_tracing:
+        langsmith_key = settings.effective_langsmith_api_key()
+        if langsmith_key:
+            if inline:
+                os.environ["LANGCHAIN_TRACING_V2"] = "true"
+            os.environ["LANGCHAIN_API_KEY"] = langsmith_key
+            os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
+            os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
+            # Handle workspace ID for org-scoped API keys (optional - set if available)
+            workspace_id = (
+                os.getenv("LANGSMITH_WORKSPACE_ID") or
+                settings.langsmith_workspace_id or
+                os.getenv("LANGCHAIN_WORKSPACE_ID")
+            )
+            if workspace_id:
+                os.environ["LANGSMITH_WORKSPACE_ID"] = workspace_id
+                os.environ["LANGCHAIN_WORKSPACE_ID"] = workspace_id
+        elif os.getenv("LANGCHAIN_API_KEY"):
+            # Use existing environment variable if set
+            if inline:
+                os.environ["LANGCHAIN_TRACING_V2"] = "true"
+            os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
+            os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
+    _CONFIGURED = True
+
+
+class TurnTrace:
+    """Spans collected during one turn (bounded by ``max_spans``)."""
+
+    def __init__(self, session_id: Optional[str], turn_id: str, sampled: bool, max_spans: int = 200):
+        self.session_id = session_id
+        self.turn_id = turn_id
+        self.sampled = sampled
+        self.max_spans = max_spans
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.dropped_spans = 0
+        self.error_count = 0
+        self.inputs: Dict[str, Any] = {}
+        self.outputs: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, kind: str, name: str, duration_ms: float, error: Optional[str] = None, **attrs: Any) -> None:
+        start_ms = (time.perf_counter() - self._t0) * 1000 - duration_ms
+        span = {"kind": kind, "name": name, "start_ms": round(start_ms, 2), "duration_ms": round(duration_ms, 2), "error": error}
+        span.update(attrs)
+        with self._lock:
+            if error:
+                self.error_count += 1
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            else:
+                self.dropped_spans += 1
+
+    def to_dict(self, duration_ms: float, error: Optional[str], reason: str) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "turn_id": self.turn_id,
+            "reason": reason,
+            "start": self.start,
+            "duration_ms": round(duration_ms, 2),
+            "error": error,
+            "inputs": self.inputs,
+            "outputs": self.outputs,
+            "spans": self.spans,
+            "dropped_spans": self.dropped_spans,
+        }
+
+
+class TracePolicy:
+    """Head sampling rate plus always-keep rules for errors and slow turns."""
+
+    def __init__(self, sample_rate: float = 0.05, slow_turn_ms: float = 8000.0, rng: Optional[random.Random] = None):
+        self.sample_rate = sample_rate
+        self.slow_turn_ms = slow_turn_ms
+        self._rng = rng or random.Random()
+
+    def head_sample(self) -> bool:
+        return self.sample_rate > 0 and self._rng.random() < self.sample_rate
+
+    def export_reason(self, trace: TurnTrace, duration_ms: float, error: Optional[str]) -> Optional[str]:
+        """Why this turn should be exported, or None to discard it."""
+        if error or trace.error_count:
+            return "error"
+        if self.slow_turn_ms and duration_ms >= self.slow_turn_ms:
+            return "slow"
+        if trace.sampled:
+            return "sampled"
+        return None
+
+
+class TraceExporter:
+    """Bounded queue drained by one daemon thread; submit() never blocks."""
+
+    def __init__(self, sink: Callable[[Dict[str, Any]], None], max_queue: int = 256):
+        self.sink = sink
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, trace: Dict[str, Any]) -> bool:
+        """Queue a trace for export; False if the queue was full and it was dropped."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(trace)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until queued traces are exported (tests and shutdown)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": self._queue.qsize(), "exported": self.exported, "dropped": self.dropped, "failed": self.failed}
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                self.sink(trace)
+                self.exported += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Trace export error: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def jsonl_sink(path: str) -> Callable[[Dict[str, Any]], None]:
+    """Append each trace as one JSON line."""
+    def export(trace: Dict[str, Any]) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(trace, default=str) + "\n")
+    return export
+
+
+def langsmith_sink(settings: Settings) -> Callable[[Dict[str, Any]], None]:
+    """Post each trace to LangSmith as a turn run with one child run per span."""
+    from datetime import datetime, timedelta, timezone
+    from langsmith import Client
+    from langsmith.run_trees import RunTree
+
+    client = Client(api_key=settings.effective_langsmith_api_key())
+    project = settings.effective_langsmith_project()
+
+    def export(trace: Dict[str, Any]) -> None:
+        start = datetime.fromtimestamp(trace["start"], tz=timezone.utc)
+        root = RunTree(
+            name="turn",
+            run_type="chain",
+            inputs=trace["inputs"],
+            start_time=start,
+            session_name=project,
+            ls_client=client,
+            tags=[trace["reason"]],
+            extra={"metadata": {"session_id": trace["session_id"], "turn_id": trace["turn_id"], "dropped_spans": trace["dropped_spans"]}},
+        )
+        for span in trace["spans"]:
+            span_start = start + timedelta(milliseconds=span["start_ms"])
+            attrs = {k: v for k, v in span.items() if k not in ("kind", "name", "start_ms", "duration_ms", "error")}
+            child = root.create_child(
+                name=span["name"],
+                run_type="llm" if span["kind"] == "llm" else "chain",
+                inputs=attrs,
+                start_time=span_start,
+            )
+            child.end(error=span["error"], end_time=span_start + timedelta(milliseconds=span["duration_ms"]))
+        root.end(outputs=trace["outputs"], error=trace["error"], end_time=start + timedelta(milliseconds=trace["duration_ms"]))
+        root.post(exclude_child_runs=False)
+    return export
+
+
+_CURRENT_TRACE: contextvars.ContextVar = contextvars.ContextVar("turn_trace", default=None)
+_POLICY: Optional[TracePolicy] = None
+_EXPORTER: Optional[TraceExporter] = None
+_MAX_SPANS = 200
+_INITIALIZED = False
+_INIT_LOCK = threading.Lock()
+
+
+def _init_from_settings() -> None:
+    global _POLICY, _EXPORTER, _MAX_SPANS, _INITIALIZED
+    with _INIT_LOCK:
+        if _INITIALIZED:
+            return
+        settings = Settings()
+        _MAX_SPANS = settings.trace_max_spans
+        _POLICY = TracePolicy(settings.trace_sample_rate, settings.trace_slow_turn_ms)
+        sink = None
+        if settings.trace_export_path:
+            sink = jsonl_sink(settings.trace_export_path)
+        elif settings.langsmith_tracing and settings.trace_sample_rate < 1.0 and settings.effective_langsmith_api_key():
+            sink = langsmith_sink(settings)
+        _EXPORTER = TraceExporter(sink, settings.trace_queue_size) if sink else None
+        _INITIALIZED = True
+
+
+def get_trace_exporter() -> Optional[TraceExporter]:
+    """Shared exporter (None when sampled tracing has nowhere to export)."""
+    if not _INITIALIZED:
+        _init_from_settings()
+    return _EXPORTER
+
+
+def set_trace_exporter(exporter: Optional[TraceExporter], policy: Optional[TracePolicy] = None) -> None:
+    """Replace the shared exporter (and optionally the policy), e.g. in tests."""
+    global _EXPORTER, _POLICY, _INITIALIZED
+    if not _INITIALIZED:
+        _init_from_settings()
+    _EXPORTER = exporter
+    if policy is not None:
+        _POLICY = policy
+
+
+def new_turn_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def traced_turn(session_id: Optional[str], turn_id: Optional[str] = None) -> Iterator[Optional[TurnTrace]]:
+    """Collect spans for one turn and hand it to the exporter if the policy keeps it.
+
+    Yields None (and collects nothing) when no exporter is configured.
+    Set ``trace.inputs`` / ``trace.outputs`` inside the block.
+    """
+    exporter = get_trace_exporter()
+    if exporter is None:
+        yield None
+        return
+    trace = TurnTrace(session_id, turn_id or new_turn_id(), _POLICY.head_sample(), _MAX_SPANS)
+    token = _CURRENT_TRACE.set(trace)
+    error = None
+    try:
+        yield trace
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _CURRENT_TRACE.reset(token)
+        duration_ms = (time.perf_counter() - trace._t0) * 1000
+        reason = _POLICY.export_reason(trace, duration_ms, error)
+        if reason:
+            exporter.submit(trace.to_dict(duration_ms, error, reason))
+
+
+def add_span(kind: str, name: str, duration_ms: float, error: Optional[str] = None, **attrs: Any) -> None:
+    """Record a span on the current turn's trace (no-op outside a traced turn)."""
+    trace = _CURRENT_TRACE.get()
+    if trace is not None:
+        trace.add_span(kind, name, duration_ms, error, **attrs)
+
+
+def trace_node(name: str, fn: Callable) -> Callable:
+    """build_graph wrapper recording each node call as a span."""
+    def traced(state: Any) -> Any:
+        if _CURRENT_TRACE.get() is None:
+            return fn(state)
+        start = time.perf_counter()
+        error = None
+        try:
+            return fn(state)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            add_span("node", name, (time.perf_counter() - start) * 1000, error)
+    return traced
@@ -0,0 +1,75 @@
+"""Single conversation turn: load memory -> run graph -> save memory."""
+
+from typing import Any, Dict, Optional
+
+from app.tracing import new_turn_id, traced_turn
+from graph.state import new_turn_state
+
+
+def process_turn(
+    graph: Any,
+    memory: Any,
+    session_id: str,
+    text: str,
+    max_messages: int = 6,
+    max_gap_hours: float = 36.0
+) -> Dict[str, Any]:
+    """
+    Run one user message through the graph with ConversationMemory context.
+    Same flow as the Streamlit chat and the conversation test.
+
+    Returns:
+        {"turn_id", "final_text", "trip_id", "confidence", "decision_stage", "escalation_flag",
+         "interaction_state", "conversation_state"}
+    """
+    with traced_turn(session_id) as trace:
+        turn_id = trace.turn_id if trace else new_turn_id()
+        if trace:
+            trace.inputs = {"text": text}
+
+        # STEP 1: Load conversation state
+        recent_history, conversation_state = memory.load_turn_context(session_id, max_messages=max_messages, max_gap_hours=max_gap_hours)
+
+        # STEP 2: Initialize graph state
+        initial_state = new_turn_state(
+            text,
+            conversation_history=recent_history if recent_history else None,
+            conversation_state=conversation_state,
+            session_id=session_id,
+            turn_id=turn_id
+        )
+
+        # STEP 3: Run graph
+        final_state = graph.invoke(initial_state, config={"metadata": {"session_id": session_id, "turn_id": turn_id}})
+
+        merged_output = final_state.get("merged_output") or {}
+        final_text = merged_output.get("final_text", "No output generated")
+
+        answerable_processing = final_state.get("answerable_processing") or {}
+        trip_context = answerable_processing.get("trip_context") or {}
+        trip_id = trip_context.get("trip_id") or "Not resolved"
+
+        interaction_state = final_state.get("interaction_state") or {}
+
+        # STEP 4: Save updated conversation state
+        memory.add_message(session_id, {"role": "user", "content": text})
+        memory.add_message(session_id, {"role": "assistant", "content": final_text})
+        updated_state = memory.update_conversation_state(
+            session_id,
+            trip_context=trip_context if trip_id != "Not resolved" else None,
+            interaction_state=interaction_state if interaction_state else None
+        )
+
+        if trace:
+            trace.outputs = {"final_text": final_text, "trip_id": trip_id}
+
+        return {
+            "turn_id": turn_id,
+            "final_text": final_text,
+            "trip_id": trip_id,
+            "confidence": trip_context.get("confidence", "N/A"),
+            "decision_stage": interaction_state.get("decision_stage", "N/A"),
+            "escalation_flag": interaction_state.get("escalation_flag", False),
+            "interaction_state": interaction_state,
+            "conversation_state": updated_state
+        }
@@ -0,0 +1,41 @@
+"""Pre-warm a worker so the first user message does not pay one-off startup costs."""
+
+import time
+from typing import Dict, Optional
+
+from app.settings import Settings
+
+
+def warmup(ping_models: Optional[bool] = None) -> Dict[str, float]:
+    """
+    Compile the graph, build the trip keyword index and seat inventory and
+    create the shared LLM client; optionally send a tiny request to each model (``Settings.warmup_ping_models``).
+
+    Safe to call more than once - every step is cached per process.
+
+    Returns:
+        Elapsed ms per step (plus ``ping:<model>`` entries when models are pinged)
+    """
+    from graph.build_graph import get_compiled_graph
+    from domain.inventory.seats import get_seat_inventory
+    from graph.nodes.non_skippable.resolve_trip_context import get_trip_keyword_index
+    from llm.client import get_llm_client
+
+    if ping_models is None:
+        ping_models = Settings().warmup_ping_models
+
+    timings = {}
+    for name, step in (
+        ("graph", get_compiled_graph),
+        ("trip_index", get_trip_keyword_index),
+        ("seat_inventory", get_seat_inventory),
+        ("llm_client", get_llm_client),
+    ):
+        start = time.perf_counter()
+        step()
+        timings[name] = (time.perf_counter() - start) * 1000
+
+    if ping_models:
+        for model, latency_ms in get_llm_client().warmup_models().items():
+            timings[f"ping:{model}"] = latency_ms
+    return timings
@@ -1,4 +1,11 @@
 from .empathetic_responses import EMPATHETIC_RESPONSES
+from .intent import detect_question_intent, get_intent_cache, set_intent_cache
 from .seat_availability import check_seat_availability_behavior
 
-__all__ = ["EMPATHETIC_RESPONSES", "check_seat_availability_behavior"]
+__all__ = [
+    "EMPATHETIC_RESPONSES",
+    "check_seat_availability_behavior",
+    "detect_question_intent",
+    "get_intent_cache",
+    "set_intent_cache",
+]
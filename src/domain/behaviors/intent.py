@@ -0,0 +1,189 @@
+"""Seat-availability intent detection: lexical rules first, then a shared cache over the LLM.
+
+Questions that mention "available" / "book" / "booking" without a clear seat
+phrase are ambiguous. Most of them ("can we still book?", "what activities
+are available?") follow a handful of shapes that the rules below settle
+without a model call. The rest go to ``detect_intent`` once per normalized
+question text: results are kept in a process-wide LRU, and concurrent
+callers asking the same question (handlers of one turn, or parallel turns)
+wait for the first call instead of issuing their own.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+SEAT_AVAILABILITY = "SEAT_AVAILABILITY"
+DATES = "DATES"
+OTHER = "OTHER"
+
+_MONTHS = r"(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)"
+
+# Things travellers book or ask about that are not a seat on the trip
+_NON_TRIP_OBJECTS = r"(cabs?|taxis?|cars?|bikes?|hotels?|rooms?|flights?|trains?|bus|buses|tickets?|nights?|parking|transfers?|homestays?|guides?)"
+
+# What a seat question books: the trip / batch / seats, or people ("for 2", "me", "us")
+_TRIP_OBJECT = (
+    r"(it|this|that|now|today|yet"
+    r"|(the|this|that|a|your|next)\s+(\w+\s+)?(trip|tour|batch|departure|package|seat|spot|slot)s?"
+    r"|(\d+|one|two|three|four|five)\s+(seats?|spots?|slots?|people|persons?|pax)"
+    r"|(for\s+)?(me|us|\d+|two|three|four|five)(\s+(people|persons?|pax|of\s+us))?)\b"
+)
+# A booking verb followed by the trip (or nothing: "can I book?")
+_BOOKS_TRIP = r"(\s+" + _TRIP_OBJECT + r"|\s*[?.!]|\s*$)"
+
+# Checked in order; the first matching rule decides. Anything else goes to the LLM.
+_LEXICAL_RULES = [
+    # How to book / booking logistics, not whether seats exist
+    (OTHER, r"\bhow\s+(do|can|should|to)\s+(i\s+|we\s+)?(book|make\s+(a\s+)?booking)\b"),
+    (OTHER, r"\b(booking|book)\s+(process|procedure|link|amount|fee|form|confirmation|policy|id|details)\b"),
+    (OTHER, r"\b(cancel|cancellation|refund|reschedule)\b"),
+    (OTHER, r"^booked\b|\b(i|we|i've|we've|i\s+have|we\s+have)\s+(just\s+|already\s+)?booked\b"),
+    # Booking a cab, an extra night, a hotel room... is not a trip seat
+    (OTHER, r"\b(book|reserve|arrange)\s+(a|an|the|my|our|some|extra|one|two)?\s*(\w+\s+)?" + _NON_TRIP_OBJECTS + r"\b"),
+    (OTHER, r"\b(what|which)\b.*\b(activities|options|food|meals?|rooms?|stays?|facilities|amenities|vehicles?)\b"),
+    (OTHER, r"\b(wifi|wi-fi|network|internet|signal|charging|doctor|oxygen|laundry|atm|" + _NON_TRIP_OBJECTS[1:-1] + r")\b.*\bavailable\b"),
+    (OTHER, r"\bavailable\b.*\b(wifi|wi-fi|network|internet|signal|charging|doctor|oxygen|laundry|atm|" + _NON_TRIP_OBJECTS[1:-1] + r")\b"),
+    (DATES, r"\bwhen\b.*\b(available|book|booking)\b"),
+    # Whether the trip (or a date) can still be booked
+    (SEAT_AVAILABILITY, r"\b(can|could|may)\s+(i|we)\s+(still\s+|also\s+)?(book|reserve|join)" + _BOOKS_TRIP),
+    (SEAT_AVAILABILITY, r"\b(want|like|ready|planning|plan)\s+to\s+(book|reserve)" + _BOOKS_TRIP),
+    (SEAT_AVAILABILITY, r"\bbook(ing|ings)?\s+(still\s+)?(open|available|closed|full)\b"),
+    (SEAT_AVAILABILITY, r"\b(is|are)\s+(it|this|that|the\s+trip|this\s+trip|the\s+batch|this\s+batch)\s+(still\s+)?available\b"),
+    (SEAT_AVAILABILITY, r"\b(it|trip|tour|batch|seats?|spots?)\s+(still\s+)?available\s+(on|for|in)\s+(the\s+)?(\d\w*|" + _MONTHS + r"|next|this|that|booking)\b"),
+    (SEAT_AVAILABILITY, r"\b(spots?|slots?)\s+(left|available|open|remaining)\b"),
+    (SEAT_AVAILABILITY, r"\b(sold\s+out|fully\s+booked|(is|are)\s+(it|they|the\s+trip|this\s+trip|the\s+batch|this\s+batch)\s+(already\s+)?full)\b"),
+    (SEAT_AVAILABILITY, r"\bbook\s+" + _TRIP_OBJECT),
+]
+_COMPILED_RULES = [(intent, re.compile(pattern)) for intent, pattern in _LEXICAL_RULES]
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_DIGITS = re.compile(r"\d+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(text: str) -> str:
+    """Cache key: lowercase, no punctuation, numbers collapsed, single spaces."""
+    text = _NON_WORD.sub(" ", text.lower())
+    text = _DIGITS.sub("0", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def lexical_intent(text: str) -> Optional[str]:
+    """Intent from the lexical rules, or None when they do not decide."""
+    text_lower = text.lower()
+    for intent, pattern in _COMPILED_RULES:
+        if pattern.search(text_lower):
+            return intent
+    return None
+
+
+class _Pending:
+    __slots__ = ("done", "intent")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.intent: Optional[str] = None
+
+
+class IntentCache:
+    """Bounded LRU of normalized question -> intent, with one in-flight call per question."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._pending: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.lexical = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            intent = self._entries.get(key)
+            if intent is not None:
+                self._entries.move_to_end(key)
+            return intent
+
+    def put(self, key: str, intent: str) -> None:
+        with self._lock:
+            self._entries[key] = intent
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[str]]) -> Optional[str]:
+        """Cached intent for ``key``; otherwise run ``compute`` once for all concurrent callers.
+
+        A None result (the call failed) is handed to the waiting callers but not cached.
+        """
+        with self._lock:
+            intent = self._entries.get(key)
+            if intent is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return intent
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._pending[key] = _Pending()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not leader:
+            pending.done.wait()
+            return pending.intent
+        try:
+            pending.intent = compute()
+            if pending.intent is not None:
+                self.put(key, pending.intent)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.done.set()
+        return pending.intent
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "lexical": self.lexical}
+
+
+_CACHE: Optional[IntentCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_intent_cache() -> IntentCache:
+    """Process-wide intent cache (``Settings.intent_cache_size`` entries)."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                from app.settings import Settings
+                _CACHE = IntentCache(Settings().intent_cache_size)
+    return _CACHE
+
+
+def set_intent_cache(cache: Optional[IntentCache]) -> Optional[IntentCache]:
+    """Replace the shared cache (None rebuilds it on next use); returns the previous one."""
+    global _CACHE
+    with _CACHE_LOCK:
+        previous = _CACHE
+        _CACHE = cache
+    return previous
+
+
+def detect_question_intent(question_text: str, detect: Optional[Callable[[str], Optional[str]]] = None) -> str:
+    """SEAT_AVAILABILITY, DATES or OTHER for an ambiguous question.
+
+    ``detect`` defaults to the shared LLM client's ``detect_intent``.
+    """
+    intent = lexical_intent(question_text)
+    cache = get_intent_cache()
+    if intent is not None:
+        cache.lexical += 1
+        return intent
+    if detect is None:
+        from llm.client import get_llm_client
+        llm = get_llm_client()
+        detect = lambda text: llm.detect_intent(text, fallback=None)
+    return cache.get_or_compute(normalize_question(question_text), lambda: detect(question_text)) or OTHER
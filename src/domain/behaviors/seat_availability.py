@@ -2,7 +2,8 @@
 from typing import Optional, Dict, Any
 from datetime import datetime
 import re
-from llm.client import LLMClient
+from domain.inventory.seats import TripSeats, get_seat_inventory, is_bookable, normalize_batch
+from domain.behaviors.intent import detect_question_intent
 
 
 def extract_date_from_text(text: str) -> Optional[str]:
@@ -74,29 +75,13 @@ def find_next_available_date(batches: list, after_date: Optional[str] = None) ->
     """
     if not batches:
         return None
-    
-    # Sort batches by start_date
-    sorted_batches = sorted(batches, key=lambda x: x.get("start_date", ""))
-    
-    for batch in sorted_batches:
-        start_date = batch.get("start_date")
-        if not start_date:
-            continue
-        
-        # If after_date is specified, skip batches before that date
-        if after_date and start_date <= after_date:
-            continue
-        
-        seats_left = batch.get("seats_left", "0")
-        try:
-            seats_int = int(seats_left) if seats_left != "<dynamic>" else 0
-            if seats_int > 0:
-                return batch
-        except (ValueError, TypeError):
-            # If seats_left is not a number, assume available
-            return batch
-    
-    return None
+    return TripSeats("", [normalize_batch(batch) for batch in batches]).next_available(after_date)
+
+
+def _trip_seats(trip_data: Dict[str, Any]) -> TripSeats:
+    """Live seat index for the trip (seat inventory), or one built from the trip data."""
+    seats = get_seat_inventory().trip(trip_data.get("trip_id", ""))
+    return seats if seats is not None else TripSeats.from_trip_data(trip_data)
 
 
 def check_seat_availability_behavior(trip_data: Dict[str, Any], question_text: str) -> Optional[str]:
@@ -133,7 +118,6 @@ def check_seat_availability_behavior(trip_data: Dict[str, Any], question_text: s
         r'\b(seats?|seat\s+availability)\s+(available|left|remaining)\b',
         r'\b(are|is)\s+there\s+seats?\b',
         r'\b(do|does)\s+(you|we)\s+have\s+seats?\b',
-        r'\bcan\s+i\s+book\b',
         r'\bis\s+it\s+available\s+to\s+book\b',
         r'\bseats?\s+left\b',
         r'\bseats?\s+remaining\b',
@@ -148,76 +132,39 @@ def check_seat_availability_behavior(trip_data: Dict[str, Any], question_text: s
         has_ambiguous_keywords = any(keyword in text_lower for keyword in ambiguous_keywords)
         
         if has_ambiguous_keywords:
-            # Use LLM to disambiguate (only for ambiguous cases)
-            llm = LLMClient()
-            intent = llm.detect_intent(question_text)
+            # Lexical rules first; the LLM (cached per normalized question) only for the rest
+            intent = detect_question_intent(question_text)
             if intent != "SEAT_AVAILABILITY":
                 return None
         else:
             # No relevant keywords at all, definitely not seat availability
             return None
     
-    # STEP 3: Proceed with batch checking (same logic for both clear and LLM-confirmed cases)
-    batches = trip_data.get("batches", {})
-    available_batches = batches.get("available_batches", [])
-    
-    if not available_batches:
+    # STEP 3: Look up the trip's batches in the seat inventory (indexed by start date)
+    seats = _trip_seats(trip_data)
+    if not len(seats):
         return None
     
     # Extract date from question if mentioned
     mentioned_date = extract_date_from_text(question_text)
     
     if mentioned_date:
-        # Check availability for the mentioned date
-        for batch in available_batches:
-            if batch.get("start_date") == mentioned_date:
-                seats_left = batch.get("seats_left", "0")
-                
-                # Check if seats are available
-                try:
-                    seats_int = int(seats_left) if seats_left != "<dynamic>" else 0
-                    if seats_int > 0:
-                        return "Seats are available, book fast!"
-                    else:
-                        # Find next available date
-                        next_available = find_next_available_date(available_batches, mentioned_date)
-                        if next_available:
-                            next_date_formatted = format_date_for_display(next_available["start_date"])
-                            mentioned_date_formatted = format_date_for_display(mentioned_date)
-                            return f"Unfortunately, we do not have seats on this date ({mentioned_date_formatted}), but we do have seats on next available date ({next_date_formatted})."
-                        else:
-                            mentioned_date_formatted = format_date_for_display(mentioned_date)
-                            return f"Unfortunately, we do not have seats on this date ({mentioned_date_formatted})."
-                except (ValueError, TypeError):
-                    # If seats_left is not a number, assume available
-                    return "Limited seats available — book soon to secure your spot."
-        
-        # Date mentioned but not found in batches
         mentioned_date_formatted = format_date_for_display(mentioned_date)
-        next_available = find_next_available_date(available_batches)
-        if next_available:
-            next_date_formatted = format_date_for_display(next_available["start_date"])
-            return f"Unfortunately, we do not have seats on this date ({mentioned_date_formatted}), but we do have seats on next available date ({next_date_formatted})."
-        else:
-            return f"Unfortunately, we do not have seats on this date ({mentioned_date_formatted})."
-    else:
-        # No specific date mentioned, check if any seats are available
-        for batch in available_batches:
-            seats_left = batch.get("seats_left", "0")
-            try:
-                seats_int = int(seats_left) if seats_left != "<dynamic>" else 0
-                if seats_int > 0:
-                    return "Seats are available, book fast!"
-            except (ValueError, TypeError):
-                # If seats_left is not a number, assume available
-                return "Seats are available, book fast!"
+        batch = seats.batch_on(mentioned_date)
+        if batch and is_bookable(batch):
+            if batch["seats_left"] is None:
+                # Count unknown but bookable
+                return "Limited seats available — book soon to secure your spot."
+            return "Seats are available, book fast!"
         
-        # No seats available in any batch
-        next_available = find_next_available_date(available_batches)
+        # No seats (or no batch) on that date: suggest the next date after it
+        next_available = seats.next_available(mentioned_date)
         if next_available:
             next_date_formatted = format_date_for_display(next_available["start_date"])
-            return f"Unfortunately, we do not have seats available right now, but we do have seats on next available date ({next_date_formatted})."
-        else:
-            return "Unfortunately, we do not have seats available right now."
+            return f"Unfortunately, we do not have seats on this date ({mentioned_date_formatted}), but we do have seats on next available date ({next_date_formatted})."
+        return f"Unfortunately, we do not have seats on this date ({mentioned_date_formatted})."
     
-    return None
+    # No specific date mentioned, check if any seats are available
+    if seats.has_available():
+        return "Seats are available, book fast!"
+    return "Unfortunately, we do not have seats available right now."
@@ -0,0 +1,13 @@
+from .seats import SeatInventory, TripSeats, get_seat_inventory, set_seat_inventory
+from .feeds import HttpFeed, InventoryUpdater, JsonFileFeed, QueueFeed
+
+__all__ = [
+    "SeatInventory",
+    "TripSeats",
+    "get_seat_inventory",
+    "set_seat_inventory",
+    "HttpFeed",
+    "InventoryUpdater",
+    "JsonFileFeed",
+    "QueueFeed",
+]
@@ -0,0 +1,127 @@
+"""Pluggable seat inventory feeds and the background updater that polls them.
+
+A feed's ``poll()`` returns a list of batch updates, or None when nothing
+changed since the last poll. Each update is a dict of
+``{"trip_id", "batch_id" or "start_date", "seats_left", "status", ...}``
+(``"removed": true`` drops a batch). Updates are upserts, so a feed may
+resend its whole snapshot.
+"""
+
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+from domain.inventory.seats import SeatInventory
+
+
+def _updates_from_payload(payload: Any) -> List[Dict[str, Any]]:
+    """Accept a bare list or ``{"updates": [...]}``."""
+    if isinstance(payload, dict):
+        payload = payload.get("updates", [])
+    return [entry for entry in payload or [] if isinstance(entry, dict)]
+
+
+class JsonFileFeed:
+    """Watches a JSON file of updates; reports it again whenever its mtime or size changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._signature = None
+
+    def poll(self) -> Optional[List[Dict[str, Any]]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        self._signature = signature
+        return _updates_from_payload(payload)
+
+
+class HttpFeed:
+    """Polls an inventory endpoint (e.g. a local stub API) with ETag revalidation."""
+
+    def __init__(self, url: str, timeout_s: float = 2.0):
+        self.url = url
+        self.timeout_s = timeout_s
+        self._etag: Optional[str] = None
+
+    def poll(self) -> Optional[List[Dict[str, Any]]]:
+        request = urllib.request.Request(self.url, headers={"Accept": "application/json"})
+        if self._etag:
+            request.add_header("If-None-Match", self._etag)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
+                payload = json.loads(response.read().decode("utf-8"))
+                self._etag = response.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+        return _updates_from_payload(payload)
+
+
+class QueueFeed:
+    """In-process feed: push() updates, the next poll() returns them (tests, local stubs)."""
+
+    def __init__(self):
+        self._pending: deque = deque()
+
+    def push(self, updates: List[Dict[str, Any]]) -> None:
+        self._pending.extend(updates)
+
+    def poll(self) -> Optional[List[Dict[str, Any]]]:
+        if not self._pending:
+            return None
+        updates = []
+        while self._pending:
+            updates.append(self._pending.popleft())
+        return updates
+
+
+class InventoryUpdater:
+    """Daemon thread polling ``feeds`` every ``interval_s`` and applying their updates."""
+
+    def __init__(self, inventory: SeatInventory, feeds: Sequence[Any], interval_s: float = 5.0):
+        self.inventory = inventory
+        self.feeds = list(feeds)
+        self.interval_s = interval_s
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll_once(self) -> int:
+        """Poll every feed once; returns the number of updates applied."""
+        applied = 0
+        for feed in self.feeds:
+            try:
+                updates = feed.poll()
+            except Exception as e:
+                self.errors += 1
+                print(f"Inventory feed error ({type(feed).__name__}): {e}")
+                continue
+            if updates:
+                applied += self.inventory.apply(updates)
+        return applied
+
+    def start(self) -> "InventoryUpdater":
+        if self._thread is None:
+            self.poll_once()
+            self._thread = threading.Thread(target=self._run, name="inventory-updater", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.poll_once()
@@ -0,0 +1,245 @@
+"""Seat inventory: each trip's batches indexed by start date.
+
+Trip files only carry placeholder ``seats_left`` values ("5", "<dynamic>");
+live counts arrive as incremental updates from a feed (see ``feeds.py``).
+Seat counts are parsed once when a batch enters the inventory, and every
+trip is held as an immutable ``TripSeats`` index that is swapped on update,
+so lookups never lock and never re-sort.
+"""
+
+import threading
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DYNAMIC_SEATS = "<dynamic>"
+BOOKABLE_STATUSES = ("open",)
+
+
+def parse_seats(value: Any) -> Optional[int]:
+    """Seats left as an int; None when the value is not a number (bookable, count unknown).
+
+    The ``"<dynamic>"`` placeholder (and a missing value) means the count was
+    never fetched, so it counts as 0 until a feed reports it.
+    """
+    if value is None or value == DYNAMIC_SEATS:
+        return 0
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def normalize_batch(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Batch record with parsed ``seats_left`` (int or None) and a status."""
+    return {
+        "batch_id": batch.get("batch_id") or batch.get("start_date"),
+        "start_date": batch.get("start_date", ""),
+        "end_date": batch.get("end_date", ""),
+        "seats_left": parse_seats(batch.get("seats_left")),
+        "status": batch.get("status") or "open",
+    }
+
+
+def is_bookable(batch: Dict[str, Any]) -> bool:
+    seats = batch["seats_left"]
+    return batch["status"] in BOOKABLE_STATUSES and (seats is None or seats > 0)
+
+
+class TripSeats:
+    """Immutable index of one trip's batches: by start date, plus the sorted bookable dates."""
+
+    __slots__ = ("trip_id", "batches", "_by_date", "_bookable_dates")
+
+    def __init__(self, trip_id: str, batches: Iterable[Dict[str, Any]]):
+        self.trip_id = trip_id
+        self.batches: Tuple[Dict[str, Any], ...] = tuple(sorted(
+            (batch for batch in batches if batch.get("start_date")),
+            key=lambda batch: batch["start_date"]
+        ))
+        self._by_date: Dict[str, Dict[str, Any]] = {}
+        self._bookable_dates: List[str] = []
+        for batch in self.batches:
+            if batch["start_date"] in self._by_date:
+                continue
+            self._by_date[batch["start_date"]] = batch
+            if is_bookable(batch):
+                self._bookable_dates.append(batch["start_date"])
+
+    @classmethod
+    def from_trip_data(cls, trip_data: Dict[str, Any]) -> "TripSeats":
+        raw = (trip_data.get("batches") or {}).get("available_batches") or []
+        return cls(trip_data.get("trip_id", ""), [normalize_batch(batch) for batch in raw])
+
+    def batch_on(self, date: str) -> Optional[Dict[str, Any]]:
+        """Batch starting on ``date`` (YYYY-MM-DD), if any."""
+        return self._by_date.get(date)
+
+    def next_available(self, after: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """First bookable batch starting strictly after ``after`` (or the first bookable one)."""
+        index = bisect_right(self._bookable_dates, after) if after else 0
+        if index < len(self._bookable_dates):
+            return self._by_date[self._bookable_dates[index]]
+        return None
+
+    def has_available(self) -> bool:
+        return bool(self._bookable_dates)
+
+    def with_updates(self, updates: Iterable[Dict[str, Any]]) -> "TripSeats":
+        """New index with ``updates`` applied; batches are matched by batch_id, then start_date."""
+        merged = {batch["batch_id"]: batch for batch in self.batches}
+        by_date = {batch["start_date"]: batch["batch_id"] for batch in self.batches}
+        for update in updates:
+            key = update.get("batch_id") or by_date.get(update.get("start_date", ""))
+            current = merged.get(key, {})
+            if update.get("removed"):
+                merged.pop(key, None)
+                continue
+            batch = normalize_batch({**current, **{k: v for k, v in update.items() if v is not None}})
+            if update.get("seats_left") is None and current:
+                batch["seats_left"] = current["seats_left"]
+            merged[batch["batch_id"]] = batch
+        return TripSeats(self.trip_id, merged.values())
+
+    def __len__(self) -> int:
+        return len(self.batches)
+
+
+class SeatInventory:
+    """Current seat counts for every trip.
+
+    Readers get the trip's current ``TripSeats`` without locking; ``apply``
+    rebuilds only the trips an update touches (a few batches each) and swaps
+    them in under a lock. Feed updates are also kept per trip, so when the
+    catalog reloads a trip's batches (``load_trip``) live counts still win.
+    """
+
+    def __init__(self, trips: Optional[Dict[str, TripSeats]] = None):
+        self._trips: Dict[str, TripSeats] = dict(trips or {})
+        self._live: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+        self.updated_at: Optional[float] = None
+
+    @classmethod
+    def from_trips(cls, all_trips: Dict[str, Dict[str, Any]]) -> "SeatInventory":
+        """Seed from trip data (the batches shipped in the trip files)."""
+        return cls({trip_id: TripSeats.from_trip_data(data) for trip_id, data in all_trips.items()})
+
+    def trip(self, trip_id: str) -> Optional[TripSeats]:
+        return self._trips.get(trip_id)
+
+    def load_trip(self, trip_id: str, batches: Iterable[Dict[str, Any]]) -> None:
+        """Replace the base batches of one trip (feed updates are re-applied on top)."""
+        seats = TripSeats(trip_id, [normalize_batch(batch) for batch in batches])
+        with self._lock:
+            live = self._live.get(trip_id)
+            self._trips[trip_id] = seats.with_updates(live.values()) if live else seats
+            self._bump()
+
+    def remove_trip(self, trip_id: str) -> None:
+        with self._lock:
+            self._trips.pop(trip_id, None)
+            self._live.pop(trip_id, None)
+            self._bump()
+
+    def apply(self, updates: Iterable[Dict[str, Any]]) -> int:
+        """Apply ``{"trip_id", "batch_id"|"start_date", "seats_left", "status", ...}`` updates.
+
+        Returns the number of updates applied (entries without a trip_id are skipped).
+        """
+        by_trip: Dict[str, List[Dict[str, Any]]] = {}
+        for update in updates:
+            trip_id = update.get("trip_id")
+            if trip_id and (update.get("batch_id") or update.get("start_date")):
+                by_trip.setdefault(trip_id, []).append(update)
+        if not by_trip:
+            return 0
+        with self._lock:
+            for trip_id, trip_updates in by_trip.items():
+                current = self._trips.get(trip_id) or TripSeats(trip_id, [])
+                self._trips[trip_id] = current.with_updates(trip_updates)
+                live = self._live.setdefault(trip_id, {})
+                for update in trip_updates:
+                    key = update.get("batch_id") or update.get("start_date")
+                    live[key] = {**live.get(key, {}), **update}
+            self._bump()
+        return sum(len(trip_updates) for trip_updates in by_trip.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "trips": len(self._trips),
+            "batches": sum(len(seats) for seats in self._trips.values()),
+            "version": self.version,
+            "updated_at": self.updated_at,
+        }
+
+    def _bump(self) -> None:
+        self.version += 1
+        self.updated_at = time.time()
+
+
+_INVENTORY: Optional[SeatInventory] = None
+_UPDATER = None
+_INVENTORY_LOCK = threading.Lock()
+
+
+def get_seat_inventory() -> SeatInventory:
+    """Process-wide inventory, seeded from the trip catalog.
+
+    Trips that change in the catalog are re-seeded one by one. When
+    ``inventory_feed_path`` / ``inventory_feed_url`` is set, a background
+    updater polls the feed every ``inventory_poll_s`` seconds.
+    """
+    global _INVENTORY, _UPDATER
+    if _INVENTORY is None:
+        with _INVENTORY_LOCK:
+            if _INVENTORY is None:
+                from app.settings import Settings
+                from domain.inventory.feeds import HttpFeed, InventoryUpdater, JsonFileFeed
+                from domain.trips.catalog import get_trip_catalog, on_catalog_reset
+
+                settings = Settings()
+                catalog = get_trip_catalog()
+                # Only trip_id and batches are read (no full trip loads on a store-backed catalog)
+                inventory = SeatInventory.from_trips(dict(catalog.snapshot.project(("trip_id", "batches"))))
+                catalog.subscribe(_on_catalog_change)
+                on_catalog_reset(_reset_inventory)
+                feeds = []
+                if settings.inventory_feed_path:
+                    feeds.append(JsonFileFeed(settings.inventory_feed_path))
+                if settings.inventory_feed_url:
+                    feeds.append(HttpFeed(settings.inventory_feed_url))
+                if feeds:
+                    _UPDATER = InventoryUpdater(inventory, feeds, settings.inventory_poll_s).start()
+                _INVENTORY = inventory
+    return _INVENTORY
+
+
+def set_seat_inventory(inventory: Optional[SeatInventory]) -> Optional[SeatInventory]:
+    """Replace the shared inventory (None rebuilds it on next use); returns the previous one."""
+    global _INVENTORY, _UPDATER
+    with _INVENTORY_LOCK:
+        previous = _INVENTORY
+        if _UPDATER is not None:
+            _UPDATER.stop()
+            _UPDATER = None
+        _INVENTORY = inventory
+    return previous
+
+
+def _on_catalog_change(snapshot: Any, changed: Iterable[str], removed: Iterable[str]) -> None:
+    inventory = _INVENTORY
+    if inventory is None:
+        return
+    for trip_id in removed:
+        inventory.remove_trip(trip_id)
+    for trip_id in changed:
+        trip_data = snapshot.get(trip_id) or {}
+        inventory.load_trip(trip_id, (trip_data.get("batches") or {}).get("available_batches") or [])
+
+
+def _reset_inventory() -> None:
+    set_seat_inventory(None)
@@ -1,7 +1,5 @@
-from .kashmir_7d import KASHMIR_7D_DATA
-from .south_india_7d import SOUTH_INDIA_7D_DATA
-from .andaman_7d import ANDAMAN_7D_DATA
-from .loader import get_trip_data, get_all_trips, TRIP_DATA_REGISTRY
+from .loader import get_trip_data, get_all_trips
+from .catalog import get_trip_catalog, set_trip_catalog
 
 __all__ = [
     "KASHMIR_7D_DATA",
@@ -9,9 +7,27 @@ __all__ = [
     "ANDAMAN_7D_DATA",
     "get_trip_data",
     "get_all_trips",
+    "get_trip_catalog",
+    "set_trip_catalog",
     "TRIP_DATA_REGISTRY"
 ]
 
-# Backward compatibility
-SPITI_7D_DATA = KASHMIR_7D_DATA  # Default to Kashmir for backward compat
+# Trip modules are imported on first access (see loader.py)
+_LAZY_ATTRS = {
+    "KASHMIR_7D_DATA": ".kashmir_7d",
+    "SOUTH_INDIA_7D_DATA": ".south_india_7d",
+    "ANDAMAN_7D_DATA": ".andaman_7d",
+    # Backward compatibility
+    "SPITI_7D_DATA": ".kashmir_7d",  # Default to Kashmir for backward compat
+}
 
+
+def __getattr__(name):
+    if name == "TRIP_DATA_REGISTRY":
+        from . import loader
+        return loader.TRIP_DATA_REGISTRY
+    if name in _LAZY_ATTRS:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, "KASHMIR_7D_DATA" if name == "SPITI_7D_DATA" else name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
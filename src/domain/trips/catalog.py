@@ -0,0 +1,355 @@
+"""Hot-reloadable trip catalog with versioned, immutable snapshots.
+
+Trips come from two sources: the built-in ``*_DATA`` modules in this package
+and, when ``Settings.trip_data_dir`` is set, ``*.json`` / ``*.yaml`` files in
+that directory (a file holds one trip or a list of trips; a file trip
+replaces a module trip with the same trip_id). Large catalogs can instead
+live in a SQLite store (``store.py``, ``Settings.trip_store_path``) whose
+trips are loaded lazily, one at a time. Each load produces a
+``CatalogSnapshot`` that is never mutated; a reload builds a new one,
+re-parsing only files whose mtime or size changed, and swaps it in with a
+single assignment.
+
+Derived indexes (the trip keyword index, the seat inventory) subscribe
+to the catalog and are told which trip_ids changed or were removed, so they
+rebuild only those entries. Snapshots also carry the trip_id <-> topic
+maps, so topic lookups are dict hits. Treat trip dicts from a snapshot as
+read-only.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import pkgutil
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+DATA_FILE_SUFFIXES = (".json", ".yaml", ".yml")
+TRIP_ID_TOPIC_SEPARATOR = "_zo_trip_"
+
+CatalogListener = Callable[["CatalogSnapshot", Set[str], Set[str]], None]
+
+
+def trip_checksum(trip_data: Dict[str, Any]) -> str:
+    """Content hash of a trip (key order independent)."""
+    payload = json.dumps(trip_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def trip_topic(trip_id: str) -> Optional[str]:
+    """Topic encoded in a trip_id (e.g. 'kashmir_zo_trip_TR-4Q7QMQQJ' -> 'kashmir')."""
+    if TRIP_ID_TOPIC_SEPARATOR in trip_id:
+        return trip_id.split(TRIP_ID_TOPIC_SEPARATOR)[0]
+    return None
+
+
+class CatalogSnapshot:
+    """One immutable version of the catalog: read-only trip mapping, per-trip checksums and topic maps."""
+
+    __slots__ = ("version", "trips", "checksums", "sources", "loaded_at", "topics", "_trip_by_topic")
+
+    def __init__(self, version: int, trips: Mapping[str, Dict[str, Any]], checksums: Dict[str, str], sources: Dict[str, str]):
+        self.version = version
+        # Store-backed catalogs pass an already read-only, lazily loading mapping
+        self.trips: Mapping[str, Dict[str, Any]] = MappingProxyType(trips) if isinstance(trips, dict) else trips
+        self.checksums: Mapping[str, str] = MappingProxyType(checksums)
+        self.sources: Mapping[str, str] = MappingProxyType(sources)
+        self.loaded_at = time.time()
+        topics = {}
+        trip_by_topic = {}
+        for trip_id in checksums:
+            topic = trip_topic(trip_id)
+            if topic:
+                topics[trip_id] = topic
+                # First trip wins when several share a topic
+                trip_by_topic.setdefault(topic.lower(), trip_id)
+        self.topics: Mapping[str, str] = MappingProxyType(topics)
+        self._trip_by_topic: Mapping[str, str] = MappingProxyType(trip_by_topic)
+
+    def get(self, trip_id: str) -> Optional[Dict[str, Any]]:
+        return self.trips.get(trip_id)
+
+    def project(self, fields: Sequence[str]) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        """(trip_id, trip data with at least ``fields``) for every trip.
+
+        Store-backed snapshots extract just those fields instead of loading
+        each trip; in-memory ones yield the trip dicts themselves.
+        """
+        project = getattr(self.trips, "project", None)
+        if project is not None:
+            return project(fields)
+        return iter(self.trips.items())
+
+    def topic_for(self, trip_id: str) -> Optional[str]:
+        """Topic of a trip_id (also for trip_ids not in this snapshot)."""
+        topic = self.topics.get(trip_id)
+        return topic if topic is not None else trip_topic(trip_id)
+
+    def trip_for_topic(self, topic: str) -> Optional[str]:
+        """trip_id for a topic name (case-insensitive)."""
+        return self._trip_by_topic.get(topic.lower())
+
+    def __contains__(self, trip_id: object) -> bool:
+        return trip_id in self.trips
+
+    def __len__(self) -> int:
+        return len(self.trips)
+
+    def diff(self, other: Optional["CatalogSnapshot"]) -> Tuple[Set[str], Set[str]]:
+        """(changed or added, removed) trip_ids going from ``other`` to this snapshot."""
+        previous = other.checksums if other is not None else {}
+        changed = {tid for tid, checksum in self.checksums.items() if previous.get(tid) != checksum}
+        removed = set(previous) - set(self.checksums)
+        return changed, removed
+
+
+def load_module_trips() -> Dict[str, Dict[str, Any]]:
+    """``*_DATA`` dicts (with a trip_id) from the Python modules in this package."""
+    trips = {}
+    package_path = Path(__file__).parent
+    package_name = __name__.rsplit('.', 1)[0]
+    for module_info in pkgutil.iter_modules([str(package_path)]):
+        module_name = module_info.name
+        if module_name in ('loader', 'catalog', 'store') or module_name.startswith('__'):
+            continue
+        try:
+            module = importlib.import_module(f'.{module_name}', package=package_name)
+        except Exception as e:
+            print(f"Trip catalog: skipping module {module_name}: {e}")
+            continue
+        for attr_name in dir(module):
+            if attr_name.endswith('_DATA') and not attr_name.startswith('_'):
+                trip_data = getattr(module, attr_name)
+                if isinstance(trip_data, dict) and 'trip_id' in trip_data:
+                    trips[trip_data['trip_id']] = trip_data
+    return trips
+
+
+def _parse_data_file(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            payload = json.load(f)
+        else:
+            import yaml  # optional dependency, only needed for YAML trip files
+            payload = yaml.safe_load(f)
+    entries = payload if isinstance(payload, list) else [payload]
+    return [entry for entry in entries if isinstance(entry, dict) and entry.get("trip_id")]
+
+
+class TripCatalog:
+    """Current catalog snapshot, reloads, change listeners and an optional watcher thread.
+
+    With a ``store`` (see ``store.SqliteTripStore``) the store is the only
+    source: ``data_dir`` and the built-in modules are ignored.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, include_modules: bool = True, store: Any = None):
+        self.data_dir = data_dir
+        self.include_modules = include_modules
+        self.store = store
+        self._store_version: Optional[int] = None
+        self._module_trips: Optional[Dict[str, Dict[str, Any]]] = None
+        # path -> ((mtime_ns, size), parsed trips), so unchanged files are not re-parsed
+        self._files: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._listeners: List[CatalogListener] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.reload_errors = 0
+        self._files_changed = False
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    def subscribe(self, listener: CatalogListener) -> None:
+        """Call ``listener(snapshot, changed_ids, removed_ids)`` after every swap that changes trips."""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def unsubscribe(self, listener: CatalogListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def reload(self) -> Tuple[Set[str], Set[str]]:
+        """Rebuild the snapshot from its sources; swap and notify only if any trip changed.
+
+        Returns (changed, removed) trip_ids.
+        """
+        with self._lock:
+            previous = self._snapshot
+            loaded = self._load_store(previous) if self.store is not None else self._load_sources(previous)
+            if loaded is None:
+                return set(), set()
+            trips, checksums, sources = loaded
+            if previous is not None and dict(previous.checksums) == checksums:
+                return set(), set()
+            version = previous.version + 1 if previous is not None else 1
+            snapshot = CatalogSnapshot(version, trips, checksums, sources)
+            changed, removed = snapshot.diff(previous)
+            self._snapshot = snapshot
+            listeners = list(self._listeners) if previous is not None else []
+        for listener in listeners:
+            try:
+                listener(snapshot, changed, removed)
+            except Exception as e:
+                print(f"Trip catalog listener error: {e}")
+        return changed, removed
+
+    def start_watcher(self, interval_s: float = 5.0) -> None:
+        """Poll the data directory (or the store's version) every ``interval_s`` seconds on a daemon thread."""
+        if self._watcher is None and (self.data_dir or self.store is not None):
+            self._watcher = threading.Thread(target=self._watch, args=(interval_s,), name="trip-catalog-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+
+    def _watch(self, interval_s: float) -> None:
+        while not self._stop.wait(interval_s):
+            try:
+                self.reload()
+            except Exception as e:
+                self.reload_errors += 1
+                print(f"Trip catalog reload error: {e}")
+
+    def _load_store(self, previous: Optional[CatalogSnapshot]):
+        """(lazy trips, checksums, sources) from the store, or None if its version is unchanged."""
+        from domain.trips.store import LazyTrips
+
+        version = self.store.version()
+        if previous is not None and version == self._store_version:
+            return None
+        self._store_version = version
+        checksums = self.store.checksums()
+        return LazyTrips(self.store, checksums), checksums, dict.fromkeys(checksums, "store")
+
+    def _load_sources(self, previous: Optional[CatalogSnapshot]):
+        """(trips, checksums, sources) from modules and data files, or None if no file changed."""
+        self._files_changed = False
+        trips, sources = self._load()
+        if previous is not None and not self._files_changed:
+            return None
+        # Only trips that were (re)parsed are hashed again
+        checksums = {
+            tid: previous.checksums[tid] if previous is not None and previous.trips.get(tid) is data else trip_checksum(data)
+            for tid, data in trips.items()
+        }
+        return trips, checksums, sources
+
+    def _load(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        trips: Dict[str, Dict[str, Any]] = {}
+        sources: Dict[str, str] = {}
+        if self.include_modules:
+            if self._module_trips is None:
+                self._module_trips = load_module_trips()
+            for trip_id, data in self._module_trips.items():
+                trips[trip_id] = data
+                sources[trip_id] = "module"
+        if self.data_dir:
+            for path, file_trips in self._load_data_files():
+                for data in file_trips:
+                    trips[data["trip_id"]] = data
+                    sources[data["trip_id"]] = path
+        return trips, sources
+
+    def _load_data_files(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Parsed trips per data file, re-reading only files whose mtime/size changed."""
+        try:
+            names = sorted(os.listdir(self.data_dir))
+        except FileNotFoundError:
+            print(f"Trip catalog: data directory not found: {self.data_dir}")
+            names = []
+        seen = set()
+        loaded = []
+        for name in names:
+            if not name.endswith(DATA_FILE_SUFFIXES):
+                continue
+            path = os.path.join(self.data_dir, name)
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+                cached = self._files.get(path)
+                if cached is None or cached[0] != signature:
+                    cached = (signature, _parse_data_file(path))
+                    self._files[path] = cached
+                    self._files_changed = True
+            except Exception as e:
+                # Keep serving the last good version of a file that fails to parse
+                self.reload_errors += 1
+                print(f"Trip catalog: cannot load {path}: {e}")
+                cached = self._files.get(path)
+                if cached is None:
+                    continue
+            loaded.append((path, cached[1]))
+        for path in set(self._files) - seen:
+            del self._files[path]
+            self._files_changed = True
+        return loaded
+
+
+_CATALOG: Optional[TripCatalog] = None
+_CATALOG_LOCK = threading.Lock()
+_RESET_HOOKS: List[Callable[[], None]] = []
+
+
+def get_trip_catalog() -> TripCatalog:
+    """Process-wide catalog (built-in trips plus ``trip_data_dir``, watched when set).
+
+    With ``trip_store_path`` set the catalog reads the SQLite store instead; an
+    empty store is seeded once from the built-in trips and ``trip_data_dir``.
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        with _CATALOG_LOCK:
+            if _CATALOG is None:
+                from app.settings import Settings
+                settings = Settings()
+                if settings.trip_store_path:
+                    from domain.trips.store import SqliteTripStore
+                    store = SqliteTripStore(settings.trip_store_path, settings.trip_store_cache_size)
+                    if store.count() == 0:
+                        store.upsert(TripCatalog(settings.trip_data_dir).snapshot.trips.values())
+                    catalog = TripCatalog(store=store)
+                else:
+                    catalog = TripCatalog(settings.trip_data_dir)
+                catalog.reload()
+                if (settings.trip_data_dir or settings.trip_store_path) and settings.trip_catalog_poll_s > 0:
+                    catalog.start_watcher(settings.trip_catalog_poll_s)
+                _CATALOG = catalog
+    return _CATALOG
+
+
+def set_trip_catalog(catalog: Optional[TripCatalog]) -> Optional[TripCatalog]:
+    """Replace the shared catalog (None rebuilds from Settings on next use); returns the previous one.
+
+    Derived indexes subscribe to the catalog they were built from, so they are
+    reset here and rebuilt from the new catalog on next use.
+    """
+    global _CATALOG
+    with _CATALOG_LOCK:
+        previous = _CATALOG
+        if previous is not None:
+            previous.stop_watcher()
+        _CATALOG = catalog
+    for reset in _RESET_HOOKS:
+        reset()
+    return previous
+
+
+def on_catalog_reset(reset: Callable[[], None]) -> None:
+    """Register a derived index's reset function (called by set_trip_catalog)."""
+    if reset not in _RESET_HOOKS:
+        _RESET_HOOKS.append(reset)
@@ -0,0 +1,170 @@
+"""SQLite-backed trip store for large catalogs.
+
+Each trip is one row (trip_id, checksum, JSON data). A catalog built on the
+store keeps only trip_ids and checksums in its snapshot; trip dicts are
+loaded on first access and held in a small LRU, so memory stays bounded no
+matter how many trips the table holds. Indexes over every trip (keywords,
+seats) read only the fields they need through ``project``, which SQLite
+extracts without going through the LRU. Writers go through ``upsert`` /
+``delete``, which bump a version row in the same transaction; the catalog
+watcher polls that version instead of re-reading the table.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+from domain.trips.catalog import trip_checksum
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trips (
+    trip_id TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class SqliteTripStore:
+    """Trip rows in a SQLite file, read one trip at a time through an LRU cache."""
+
+    def __init__(self, path: str, cache_size: int = 64):
+        self.path = path
+        self.cache_size = cache_size
+        self.loads = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # (trip_id, checksum) -> trip dict, most recently used last
+        self._cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+    def version(self) -> int:
+        """Incremented by every write that changes a trip."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM trips").fetchone()[0]
+
+    def checksums(self) -> Dict[str, str]:
+        """trip_id -> checksum for every stored trip (no trip data is read)."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT trip_id, checksum FROM trips ORDER BY trip_id"))
+
+    def upsert(self, trips: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace trips (dicts with a trip_id); returns how many rows changed."""
+        rows = [
+            (data["trip_id"], trip_checksum(data), json.dumps(data, separators=(",", ":"), default=str))
+            for data in trips if data.get("trip_id")
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT INTO trips (trip_id, checksum, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(trip_id) DO UPDATE SET checksum = excluded.checksum, data = excluded.data "
+                "WHERE trips.checksum != excluded.checksum",
+                rows,
+            )
+            changed = self._conn.total_changes - before
+            if changed:
+                self._bump()
+        return changed
+
+    def delete(self, trip_ids: Iterable[str]) -> int:
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM trips WHERE trip_id = ?", [(tid,) for tid in trip_ids])
+            changed = self._conn.total_changes - before
+            if changed:
+                self._bump()
+        return changed
+
+    def load(self, trip_id: str, checksum: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """One trip's data; served from the LRU when ``checksum`` matches a cached version."""
+        with self._lock:
+            if checksum is not None:
+                cached = self._cache.get((trip_id, checksum))
+                if cached is not None:
+                    self._cache.move_to_end((trip_id, checksum))
+                    return cached
+            row = self._conn.execute("SELECT checksum, data FROM trips WHERE trip_id = ?", (trip_id,)).fetchone()
+            if row is None:
+                return None
+            data = json.loads(row[1])
+            self.loads += 1
+            self._cache[(trip_id, row[0])] = data
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return data
+
+    def project(self, fields: Sequence[str], page_size: int = 500) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(trip_id, {field: value}) for every stored trip, in trip_id order.
+
+        Only the named top-level fields are extracted (by SQLite) and decoded;
+        missing fields are left out. Rows are read ``page_size`` at a time and
+        bypass the LRU, so ``loads`` and the cache are untouched.
+        """
+        # json_extract returns a JSON array of the values only for two or more paths
+        paths = [f"$.{field}" for field in fields] * (2 if len(fields) == 1 else 1)
+        query = (
+            f"SELECT trip_id, json_extract(data, {', '.join('?' * len(paths))}) FROM trips "
+            "WHERE trip_id > ? ORDER BY trip_id LIMIT ?"
+        )
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, (*paths, last, page_size)).fetchall()
+            for trip_id, values in rows:
+                yield trip_id, {field: value for field, value in zip(fields, json.loads(values)) if value is not None}
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _bump(self) -> None:
+        self._conn.execute(
+            "INSERT INTO catalog_meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+
+
+class LazyTrips(Mapping):
+    """Read-only trip_id -> trip mapping over a store; trips are loaded on access."""
+
+    def __init__(self, store: SqliteTripStore, checksums: Mapping[str, str]):
+        self._store = store
+        self._checksums = checksums
+
+    def __getitem__(self, trip_id: str) -> Dict[str, Any]:
+        checksum = self._checksums[trip_id]
+        data = self._store.load(trip_id, checksum)
+        if data is None:
+            # Deleted since this snapshot was taken; the next reload drops it
+            raise KeyError(trip_id)
+        return data
+
+    def __contains__(self, trip_id: object) -> bool:
+        return trip_id in self._checksums
+
+    def project(self, fields: Sequence[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(trip_id, {field: value}) for the trips in this mapping, without loading them."""
+        for trip_id, values in self._store.project(fields):
+            if trip_id in self._checksums:
+                yield trip_id, values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._checksums)
+
+    def __len__(self) -> int:
+        return len(self._checksums)
@@ -1,114 +1,131 @@
+import threading
+
 from langgraph.graph import StateGraph, END
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Callable, Optional
 from graph.state import ConversationWorkflowState
 
-# Entry
-from graph.nodes.entry.inbound_message import inbound_message
+from app.tracing import configure_tracing, trace_node
+from utils.lazy import load_attr
 
-# Pipeline
-from graph.nodes.pipeline.normalize_and_split import normalize_and_split
-from graph.nodes.pipeline.classify_each_question import classify_each_question
-from graph.nodes.pipeline.partition_questions import partition_questions
-from graph.nodes.pipeline.merge_outputs import merge_outputs
+# Node functions by graph node name. Node modules (and the LLM client they
+# pull in) are imported when the graph is built, not when this module is.
+NODE_SPECS = {
+    # Entry
+    "inbound_message": "graph.nodes.entry.inbound_message:inbound_message",
+    # Pipeline
+    "normalize_and_split": "graph.nodes.pipeline.normalize_and_split:normalize_and_split",
+    "classify_each_question": "graph.nodes.pipeline.classify_each_question:classify_each_question",
+    "partition_questions": "graph.nodes.pipeline.partition_questions:partition_questions",
+    "merge_outputs": "graph.nodes.pipeline.merge_outputs:merge_outputs",
+    # Non-skippable
+    "normalize_and_structure": "graph.nodes.non_skippable.normalize_and_structure:normalize_and_structure",
+    "resolve_trip_context": "graph.nodes.non_skippable.resolve_trip_context:resolve_trip_context",
+    "answer_planner": "graph.nodes.non_skippable.answer_planner:answer_planner",
+    "merge_handler_outputs": "graph.nodes.non_skippable.merge_handler_outputs:merge_handler_outputs",
+    "compose_answer": "graph.nodes.non_skippable.compose_answer:compose_answer",
+    "logistics_handler": "graph.nodes.non_skippable.handlers.logistics:logistics_handler",
+    "pricing_handler": "graph.nodes.non_skippable.handlers.pricing:pricing_handler",
+    "itinerary_handler": "graph.nodes.non_skippable.handlers.itinerary:itinerary_handler",
+    # Skippable
+    "malformed": "graph.nodes.skippable.malformed:malformed",
+    "forbidden": "graph.nodes.skippable.forbidden:forbidden",
+    "hostile": "graph.nodes.skippable.hostile:hostile",
+    # Post-processing
+    "update_interaction_state": "graph.nodes.post_processing.update_interaction_state:update_interaction_state",
+    "post_answer_action": "graph.nodes.post_processing.post_answer_action:post_answer_action",
+}
 
-# Non-skippable
-from graph.nodes.non_skippable.normalize_and_structure import normalize_and_structure
-from graph.nodes.non_skippable.resolve_trip_context import resolve_trip_context
-from graph.nodes.non_skippable.answer_planner import answer_planner
-from graph.nodes.non_skippable.merge_handler_outputs import merge_handler_outputs
-from graph.nodes.non_skippable.compose_answer import compose_answer
-from graph.nodes.non_skippable.handlers.logistics import logistics_handler
-from graph.nodes.non_skippable.handlers.pricing import pricing_handler
-from graph.nodes.non_skippable.handlers.itinerary import itinerary_handler
 
-# Skippable
-from graph.nodes.skippable.malformed import malformed
-from graph.nodes.skippable.forbidden import forbidden
-from graph.nodes.skippable.hostile import hostile
+def noop_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """No-op node for routing (writes nothing)."""
+    return {}
 
-# Post-processing
-from graph.nodes.post_processing.update_interaction_state import update_interaction_state
-from graph.nodes.post_processing.post_answer_action import post_answer_action
 
+_COMPILED_GRAPH = None
+_COMPILED_GRAPH_LOCK = threading.Lock()
 
-def noop_node(state: Dict[str, Any]) -> Dict[str, Any]:
-    """No-op node for routing."""
-    return state if isinstance(state, dict) else {}
+
+def get_compiled_graph():
+    """Process-wide compiled graph, built on first use (see app.warmup)."""
+    global _COMPILED_GRAPH
+    if _COMPILED_GRAPH is None:
+        with _COMPILED_GRAPH_LOCK:
+            if _COMPILED_GRAPH is None:
+                _COMPILED_GRAPH = build_graph()
+    return _COMPILED_GRAPH
 
 
-def build_graph() -> StateGraph:
-    """Build the LangGraph workflow with conditional handler routing and LangSmith tracing."""
-    
-    # Configure LangSmith tracing
-    import os
-    from app.settings import Settings
-    settings = Settings()
-    
-    if settings.langsmith_tracing:
-        langsmith_key = settings.effective_langsmith_api_key()
-        if langsmith_key:
-            os.environ["LANGCHAIN_TRACING_V2"] = "true"
-            os.environ["LANGCHAIN_API_KEY"] = langsmith_key
-            os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
-            os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
-        elif os.getenv("LANGCHAIN_API_KEY"):
-            # Use existing environment variable if set
-            os.environ["LANGCHAIN_TRACING_V2"] = "true"
-            os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
-            os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
+def reset_compiled_graph() -> None:
+    """Drop the cached graph so the next get_compiled_graph() rebuilds it."""
+    global _COMPILED_GRAPH
+    with _COMPILED_GRAPH_LOCK:
+        _COMPILED_GRAPH = None
+
+
+def build_graph(node_wrapper: Optional[Callable[[str, Callable], Callable]] = None) -> StateGraph:
+    """Build the LangGraph workflow with conditional handler routing and LangSmith tracing.
+    
+    Compiles a new graph on every call; entry points should use
+    ``get_compiled_graph()`` instead.
+    
+    Args:
+        node_wrapper: Optional ``(node_name, node_fn) -> node_fn`` hook applied to every
+            node, used by benchmarks to time nodes without touching node code.
+    """
+    
+    configure_tracing()
     
     workflow = StateGraph(ConversationWorkflowState)
     
+    def add_node(name: str, fn: Optional[Callable] = None) -> None:
+        fn = trace_node(name, fn or load_attr(NODE_SPECS[name]))
+        workflow.add_node(name, node_wrapper(name, fn) if node_wrapper else fn)
+    
     # Entry
-    workflow.add_node("inbound_message", inbound_message)
+    add_node("inbound_message")
     
     # Pipeline
-    workflow.add_node("normalize_and_split", normalize_and_split)
-    workflow.add_node("classify_each_question", classify_each_question)
-    workflow.add_node("partition_questions", partition_questions)
+    add_node("normalize_and_split")
+    add_node("classify_each_question")
+    add_node("partition_questions")
     
     # Non-skippable branch
-    workflow.add_node("normalize_and_structure", normalize_and_structure)
-    workflow.add_node("resolve_trip_context", resolve_trip_context)
-    workflow.add_node("answer_planner", answer_planner)
-    workflow.add_node("handlers_start", noop_node)  # PARALLEL: Fan-out point for handlers
-    workflow.add_node("logistics_handler", logistics_handler)
-    workflow.add_node("pricing_handler", pricing_handler)
-    workflow.add_node("itinerary_handler", itinerary_handler)
-    workflow.add_node("merge_handler_outputs", merge_handler_outputs)
-    workflow.add_node("compose_answer", compose_answer)
+    add_node("normalize_and_structure")
+    add_node("resolve_trip_context")
+    add_node("answer_planner")
+    add_node("handlers_start", noop_node)  # PARALLEL: Fan-out point for handlers
+    add_node("logistics_handler")
+    add_node("pricing_handler")
+    add_node("itinerary_handler")
+    add_node("merge_handler_outputs")
+    add_node("compose_answer")
     
     # Skippable branch
-    workflow.add_node("skippable_start", noop_node)
-    workflow.add_node("malformed", malformed)
-    workflow.add_node("forbidden", forbidden)
-    workflow.add_node("hostile", hostile)
+    add_node("skippable_start", noop_node)
+    add_node("malformed")
+    add_node("forbidden")
+    add_node("hostile")
     
     # Convergence
-    workflow.add_node("converge", noop_node)
+    add_node("converge", noop_node)
     
     # Post-processing
-    workflow.add_node("merge_outputs", merge_outputs)
-    workflow.add_node("update_interaction_state", update_interaction_state)
-    workflow.add_node("post_answer_action", post_answer_action)
+    add_node("merge_outputs")
+    add_node("update_interaction_state")
+    add_node("post_answer_action")
     
     # Define edges
-    workflow.set_entry_point("normalize_and_split")
+    workflow.set_entry_point("inbound_message")
     
-    # Pipeline flow (skip inbound_message since input is already set)
+    # Pipeline flow (inbound_message turns Pydantic entry values into dict records)
+    workflow.add_edge("inbound_message", "normalize_and_split")
     workflow.add_edge("normalize_and_split", "classify_each_question")
     workflow.add_edge("classify_each_question", "partition_questions")
     
     # After partition, route to non-skippable if needed, otherwise to skippable
     def route_after_partition(state: Dict[str, Any]) -> str:
-        questions = state.get("questions", {})
-        partitioned = questions.get("partitioned", {}) if isinstance(questions, dict) else getattr(questions, "partitioned", {})
-        if isinstance(partitioned, dict):
-            non_skippable = partitioned.get("non_skippable", [])
-            return "normalize_and_structure" if non_skippable else "skippable_start"
-        else:
-            non_skippable = getattr(partitioned, "non_skippable", [])
-            return "normalize_and_structure" if non_skippable else "skippable_start"
+        partitioned = (state.get("questions") or {}).get("partitioned") or {}
+        return "normalize_and_structure" if partitioned.get("non_skippable") else "skippable_start"
     
     workflow.add_conditional_edges(
         "partition_questions",
@@ -173,7 +190,7 @@ def build_graph() -> StateGraph:
     # - merge_handler_outputs waits for ALL handlers to complete (barrier pattern)
     # - Handlers with work process and update state
     # - Handlers without work return {} immediately (early exit)
-    # - LangGraph automatically merges state updates from parallel handlers
+    # - LangGraph merges their handler_outputs updates by block_id (graph.state reducer)
     workflow.add_edge("logistics_handler", "merge_handler_outputs")
     workflow.add_edge("pricing_handler", "merge_handler_outputs")
     workflow.add_edge("itinerary_handler", "merge_handler_outputs")
@@ -187,23 +204,14 @@ def build_graph() -> StateGraph:
     
     # Skippable branch - route to appropriate nodes
     def route_skippable(state: Dict[str, Any]) -> str:
-        questions = state.get("questions", {})
-        partitioned = questions.get("partitioned", {}) if isinstance(questions, dict) else getattr(questions, "partitioned", {})
-        skippable = partitioned.get("skippable", {}) if isinstance(partitioned, dict) else getattr(partitioned, "skippable", {})
-        if isinstance(skippable, dict):
-            if skippable.get("malformed"):
-                return "malformed"
-            elif skippable.get("forbidden"):
-                return "forbidden"
-            elif skippable.get("hostile"):
-                return "hostile"
-        else:
-            if getattr(skippable, "malformed", None):
-                return "malformed"
-            elif getattr(skippable, "forbidden", None):
-                return "forbidden"
-            elif getattr(skippable, "hostile", None):
-                return "hostile"
+        partitioned = (state.get("questions") or {}).get("partitioned") or {}
+        skippable = partitioned.get("skippable") or {}
+        if skippable.get("malformed"):
+            return "malformed"
+        elif skippable.get("forbidden"):
+            return "forbidden"
+        elif skippable.get("hostile"):
+            return "hostile"
         return "converge"
     
     workflow.add_conditional_edges(
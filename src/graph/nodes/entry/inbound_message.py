@@ -1,13 +1,17 @@
-from typing import TypedDict
-from graph.state import ConversationWorkflowState, InputPayload
+from typing import Dict, Any
+from utils.state_adapter import to_dict
 
 
-def inbound_message(state: ConversationWorkflowState) -> ConversationWorkflowState:
+def inbound_message(state: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Entry node: Receives raw input and initializes state.
-    Only modifies: input (but only if needed)
+    Entry node: the API boundary of the graph.
+    Only modifies: input, questions (only when a caller passed Pydantic models)
+    
+    Nodes work on plain dict records; a Pydantic InputPayload / Questions
+    from an older caller is dumped here once instead of in every node.
     """
-    # Input should already be set correctly, just pass through
-    # Don't modify if already correct to avoid LangGraph conflicts
-    return state
-
+    return {
+        key: to_dict(state[key])
+        for key in ("input", "questions")
+        if state.get(key) is not None and not isinstance(state[key], dict)
+    }
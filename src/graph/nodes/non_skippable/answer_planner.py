@@ -1,6 +1,4 @@
 from typing import TypedDict, Dict, Any, List
-from graph.state import AnswerPlan
-from utils.state_adapter import get_state_value, to_dict
 from utils.ids import generate_block_id
 
 
@@ -9,12 +7,11 @@ def answer_planner(state: Dict[str, Any]) -> Dict[str, Any]:
     Create answer plan grouping questions by handler.
     Only modifies: answerable_processing.answer_plan
     """
-    answerable_processing = get_state_value(state, "answerable_processing")
+    answerable_processing = state.get("answerable_processing")
     if not answerable_processing:
         return {}
     
-    answerable_dict = to_dict(answerable_processing)
-    structured_questions = answerable_dict.get("structured_questions", [])
+    structured_questions = answerable_processing.get("structured_questions", [])
     
     if not structured_questions:
         return {}
@@ -22,8 +19,8 @@ def answer_planner(state: Dict[str, Any]) -> Dict[str, Any]:
     category_groups: Dict[str, List[str]] = {}
     
     for q in structured_questions:
-        cat = q.get("category", "LOGISTICS") if isinstance(q, dict) else getattr(q, "category", "LOGISTICS")
-        q_id = q.get("id", "") if isinstance(q, dict) else getattr(q, "id", "")
+        cat = q.get("category", "LOGISTICS")
+        q_id = q.get("id", "")
         if cat not in category_groups:
             category_groups[cat] = []
         if q_id:
@@ -52,7 +49,4 @@ def answer_planner(state: Dict[str, Any]) -> Dict[str, Any]:
         "answer_blocks": blocks
     }
     
-    answerable_dict = answerable_dict.copy()
-    answerable_dict["answer_plan"] = answer_plan
-    
-    return {"answerable_processing": answerable_dict}
+    return {"answerable_processing": {"answer_plan": answer_plan}}
@@ -1,25 +1,28 @@
 from typing import TypedDict, Dict, Any
 from graph.state import ConversationWorkflowState
-from llm.client import LLMClient
+from llm.client import get_llm_client
 
 
 def compose_answer(state: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Compose final answer from handler outputs.
+    Compose final answer from the handler_outputs channel.
     Only modifies: answerable_processing.answer_text
     """
     answerable_processing = state.get("answerable_processing")
     if not answerable_processing:
         return {}
     
-    handler_outputs_list = answerable_processing.get("handler_outputs", [])
-    if not handler_outputs_list:
+    outputs_by_block = state.get("handler_outputs") or {}
+    if not outputs_by_block:
         return {}
     
-    llm = LLMClient()
+    llm = get_llm_client().for_turn(state.get("turn_deadline"))
     
-    # Handler outputs are already in dict format from merge_handler_outputs
-    handler_outputs = handler_outputs_list
+    # Handlers finish in any order; compose in answer plan order
+    answer_plan = answerable_processing.get("answer_plan") or {}
+    planned_ids = [block.get("block_id") for block in answer_plan.get("answer_blocks", [])]
+    handler_outputs = [outputs_by_block[block_id] for block_id in planned_ids if block_id in outputs_by_block]
+    handler_outputs.extend(output for block_id, output in outputs_by_block.items() if block_id not in planned_ids)
     
     # Compose answer
     normalized_text = answerable_processing.get("normalized_text", "")
@@ -28,14 +31,4 @@ def compose_answer(state: Dict[str, Any]) -> Dict[str, Any]:
         normalized_text
     )
     
-    # Update answerable_processing with composed answer
-    if isinstance(answerable_processing, dict):
-        answerable_processing = answerable_processing.copy()
-        answerable_processing["answer_text"] = answer_text
-    else:
-        # Pydantic model - convert to dict
-        answerable_processing_dict = answerable_processing.dict() if hasattr(answerable_processing, "dict") else dict(answerable_processing)
-        answerable_processing_dict["answer_text"] = answer_text
-        answerable_processing = answerable_processing_dict
-    
-    return {"answerable_processing": answerable_processing}
+    return {"answerable_processing": {"answer_text": answer_text}}
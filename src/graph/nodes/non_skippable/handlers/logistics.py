@@ -1,15 +1,16 @@
 from typing import TypedDict, Dict, Any
 from graph.state import HandlerOutput
 from domain.trips.loader import get_trip_data
-from llm.client import LLMClient
+from llm.client import get_llm_client
 from utils.behaviors import check_empathetic_response, check_seat_availability
+from utils.stream_events import facts_event_writer
 
 
 def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle logistics questions using LLM-based fact extraction.
     Returns facts only.
-    Updates answerable_processing.handler_outputs directly.
+    Writes its outputs to the handler_outputs channel (keyed by block_id).
     
     Note: Executes in parallel with other handlers. If no logistics blocks exist,
     returns {} immediately (early exit) for optimal performance.
@@ -30,7 +31,7 @@ def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
     
     # Get trip data based on trip_context
     trip_context = answerable_processing.get("trip_context", {})
-    trip_id = trip_context.get("trip_id", "") if isinstance(trip_context, dict) else getattr(trip_context, "trip_id", "")
+    trip_id = trip_context.get("trip_id", "")
     
     if not trip_id:
         trip_id = ""
@@ -40,7 +41,7 @@ def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
         trip_data = {}
     
     # Initialize LLM client for fact extraction
-    llm = LLMClient()
+    llm = get_llm_client().for_turn(state.get("turn_deadline"))
     
     # Process each logistics block
     new_handler_outputs = []
@@ -51,7 +52,7 @@ def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
         question_ids = block.get("question_ids", [])
         questions = [
             q for q in structured_questions
-            if isinstance(q, dict) and q.get("id") in question_ids
+            if q.get("id") in question_ids
         ]
         
         # Separate questions by processing type
@@ -59,7 +60,7 @@ def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
         llm_questions = []  # Questions that need LLM extraction
         
         for q in questions:
-            question_text = q.get("text", "") if isinstance(q, dict) else getattr(q, "text", "")
+            question_text = q.get("text", "")
             if not question_text:
                 continue
             
@@ -80,7 +81,9 @@ def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
         
         # BATCH: Extract facts for all LLM questions in a single call
         if llm_questions:
-            batch_results = llm.extract_facts_batch(llm_questions, trip_data)
+            # Stream each question's facts as it completes when the run asked for facts events (stream_facts_config)
+            on_facts = facts_event_writer("logistics_handler", block.get("block_id"))
+            batch_results = llm.extract_facts_batch(llm_questions, trip_data, on_facts=on_facts)
             
             # Map batch results back to questions
             for q_text, q_facts in batch_results.items():
@@ -91,7 +94,7 @@ def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
         # Combine all facts from all questions
         facts = []
         for q in questions:
-            question_text = q.get("text", "") if isinstance(q, dict) else getattr(q, "text", "")
+            question_text = q.get("text", "")
             if question_text and question_text in facts_map:
                 facts.extend(facts_map[question_text])
         
@@ -111,11 +114,5 @@ def logistics_handler(state: Dict[str, Any]) -> Dict[str, Any]:
         
         new_handler_outputs.append(output)
     
-    answerable_processing = answerable_processing.copy()
-    existing_outputs = answerable_processing.get("handler_outputs", [])
-    if not existing_outputs:
-        existing_outputs = []
-    existing_outputs.extend(new_handler_outputs)
-    answerable_processing["handler_outputs"] = existing_outputs
-    
-    return {"answerable_processing": answerable_processing}
+    # Publish to the handler_outputs channel; answerable_processing is not copied
+    return {"handler_outputs": {output["block_id"]: output for output in new_handler_outputs}}
@@ -5,9 +5,9 @@ from graph.state import HandlerOutput
 def merge_handler_outputs(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Pass-through node after conditional handler execution.
-    Handlers now update answerable_processing.handler_outputs directly,
-    so this node just ensures state consistency before compose_answer.
+    Handlers write to the handler_outputs channel (merged by block_id in
+    graph.state), so this node is only the fan-in barrier before compose_answer.
     """
-    # Handlers already updated answerable_processing.handler_outputs directly
+    # Handler results are already merged into the handler_outputs channel
     # This is now a pass-through node for compatibility with the graph structure
     return {}
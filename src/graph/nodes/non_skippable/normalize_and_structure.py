@@ -1,8 +1,6 @@
 from typing import TypedDict, Dict, Any
-from graph.state import AnswerableProcessing, StructuredQuestion, TripContext
-from llm.client import LLMClient
+from llm.client import get_llm_client
 from utils.text import normalize_text
-from utils.state_adapter import get_state_value, to_dict
 
 
 def normalize_and_structure(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -10,22 +8,20 @@ def normalize_and_structure(state: Dict[str, Any]) -> Dict[str, Any]:
     Normalize text and structure answerable questions.
     Only modifies: answerable_processing.structured_questions, answerable_processing.normalized_text
     """
-    questions = get_state_value(state, "questions", {})
-    questions_dict = to_dict(questions)
-    partitioned = questions_dict.get("partitioned", {})
+    questions = state.get("questions") or {}
+    partitioned = questions.get("partitioned") or {}
     
     if not partitioned or not partitioned.get("non_skippable"):
         return {}
     
-    llm = LLMClient()
+    llm = get_llm_client().for_turn(state.get("turn_deadline"))
     
     answerable_ids = partitioned.get("non_skippable", [])
     
-    atomic_questions = questions_dict.get("atomic", [])
-    atomic_map = {q.get("id") if isinstance(q, dict) else getattr(q, "id", ""): q for q in atomic_questions}
+    atomic_questions = questions.get("atomic", [])
+    atomic_map = {q.get("id"): q for q in atomic_questions}
     
-    input_obj = get_state_value(state, "input", {})
-    raw_text = input_obj.get("raw_text") if isinstance(input_obj, dict) else getattr(input_obj, "raw_text", "")
+    raw_text = (state.get("input") or {}).get("raw_text", "")
     normalized_text = normalize_text(raw_text)
     
     question_texts = []
@@ -34,7 +30,7 @@ def normalize_and_structure(state: Dict[str, Any]) -> Dict[str, Any]:
     for q_id in answerable_ids:
         atomic_q = atomic_map.get(q_id)
         if atomic_q:
-            q_text = atomic_q.get("text") if isinstance(atomic_q, dict) else getattr(atomic_q, "text", "")
+            q_text = atomic_q.get("text")
             if q_text:
                 question_texts.append(q_text)
                 question_map.append((q_id, q_text))
@@ -53,7 +49,7 @@ def normalize_and_structure(state: Dict[str, Any]) -> Dict[str, Any]:
             "text": q_text
         })
     
-    answerable_processing = get_state_value(state, "answerable_processing")
+    answerable_processing = state.get("answerable_processing")
     if not answerable_processing:
         answerable_processing = {
             "normalized_text": normalized_text,
@@ -64,12 +60,13 @@ def normalize_and_structure(state: Dict[str, Any]) -> Dict[str, Any]:
             "answer_plan": {
                 "answer_blocks": []
             },
-            "structured_questions": structured,
-            "handler_outputs": []
+            "structured_questions": structured
         }
     else:
-        answerable_processing = to_dict(answerable_processing).copy()
-        answerable_processing["structured_questions"] = structured
-        answerable_processing["normalized_text"] = normalized_text
+        # combine_answerable_processing merges the changed keys into the existing record
+        answerable_processing = {
+            "structured_questions": structured,
+            "normalized_text": normalized_text
+        }
     
     return {"answerable_processing": answerable_processing}
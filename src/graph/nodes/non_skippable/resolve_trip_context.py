@@ -1,7 +1,6 @@
-from typing import TypedDict, Dict, Any
-from graph.state import TripContext
-from utils.state_adapter import get_state_value, to_dict
-from domain.trips.loader import get_all_trips, get_trip_data
+import threading
+from typing import TypedDict, Dict, Any, Optional, Set
+from domain.trips.catalog import get_trip_catalog, on_catalog_reset
 from state.memory import topic_to_trip_id
 
 
@@ -68,22 +67,67 @@ def _generate_trip_keywords(trip_data: Dict) -> list:
     return list(set(keywords))  # Remove duplicates
 
 
+# Trip fields the keyword index reads (store-backed catalogs extract only these)
+_INDEX_FIELDS = ("destination", "name", "itinerary_highlights", "logistics")
+
+_TRIP_INDEX: Optional[Dict[str, Dict[str, Any]]] = None
+_TRIP_INDEX_LOCK = threading.Lock()
+
+
+def _index_entry(trip_data: Dict) -> Dict[str, Any]:
+    return {"keywords": _generate_trip_keywords(trip_data), "name": trip_data.get("name", "").lower()}
+
+
+def _on_catalog_change(snapshot, changed: Set[str], removed: Set[str]) -> None:
+    """Re-index only the changed trips and swap the index in (readers never see a partial one)."""
+    global _TRIP_INDEX
+    with _TRIP_INDEX_LOCK:
+        if _TRIP_INDEX is None:
+            return
+        index = dict(_TRIP_INDEX)
+        for tid in removed:
+            index.pop(tid, None)
+        for tid in changed:
+            index[tid] = _index_entry(snapshot.get(tid))
+        _TRIP_INDEX = index
+
+
+def _reset_trip_index() -> None:
+    global _TRIP_INDEX
+    with _TRIP_INDEX_LOCK:
+        _TRIP_INDEX = None
+
+
+on_catalog_reset(_reset_trip_index)
+
+
+def get_trip_keyword_index() -> Dict[str, Dict[str, Any]]:
+    """Keywords and lowercased name per trip_id, built once and updated per changed trip."""
+    global _TRIP_INDEX
+    if _TRIP_INDEX is None:
+        catalog = get_trip_catalog()
+        catalog.subscribe(_on_catalog_change)
+        with _TRIP_INDEX_LOCK:
+            if _TRIP_INDEX is None:
+                _TRIP_INDEX = {tid: _index_entry(trip_data) for tid, trip_data in catalog.snapshot.project(_INDEX_FIELDS)}
+    return _TRIP_INDEX
+
+
 def resolve_trip_context(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Resolve trip context from conversation using keyword matching.
     Only modifies: answerable_processing.trip_context
     """
-    answerable_processing = get_state_value(state, "answerable_processing")
+    answerable_processing = state.get("answerable_processing")
     if not answerable_processing:
         return {}
     
-    answerable_dict = to_dict(answerable_processing)
-    normalized_text = answerable_dict.get("normalized_text", "")
-    structured_questions = answerable_dict.get("structured_questions", [])
+    normalized_text = answerable_processing.get("normalized_text", "")
+    structured_questions = answerable_processing.get("structured_questions", [])
     
     # Combine text for analysis
     question_texts = [
-        q.get("text", "") if isinstance(q, dict) else getattr(q, "text", "")
+        q.get("text", "")
         for q in structured_questions
     ]
     combined_text = (normalized_text + " " + " ".join(question_texts)).lower()
@@ -95,7 +139,7 @@ def resolve_trip_context(state: Dict[str, Any]) -> Dict[str, Any]:
         previous_messages = [
             msg.get("content", "").lower() 
             for msg in conversation_history 
-            if isinstance(msg, dict) and msg.get("role") == "user"
+            if msg.get("role") == "user"
         ]
         # Add previous messages to combined text for context (most recent first)
         if previous_messages:
@@ -105,27 +149,21 @@ def resolve_trip_context(state: Dict[str, Any]) -> Dict[str, Any]:
     trip_id = None
     confidence = "LOW"
     
-    # Auto-generate trip keywords from trip data
-    all_trips = get_all_trips()
-    trip_keywords = {}
-    for tid, trip_data in all_trips.items():
-        trip_keywords[tid] = _generate_trip_keywords(trip_data)
+    # Trip keywords are auto-generated from trip data (cached per process)
+    trip_index = get_trip_keyword_index()
     
     # Score each trip
     trip_scores = {}
     
-    for tid, keywords in trip_keywords.items():
+    for tid, entry in trip_index.items():
         score = 0
-        for keyword in keywords:
+        for keyword in entry["keywords"]:
             if keyword in combined_text:
                 score += 2 if len(keyword.split()) > 1 else 1  # Multi-word keywords get higher score
         
         # Check trip name
-        trip_data = all_trips.get(tid)
-        if trip_data:
-            trip_name = trip_data.get("name", "").lower()
-            if trip_name in combined_text:
-                score += 5
+        if entry["name"] in combined_text:
+            score += 5
         
         if score > 0:
             trip_scores[tid] = score
@@ -180,8 +218,4 @@ def resolve_trip_context(state: Dict[str, Any]) -> Dict[str, Any]:
         "confidence": confidence
     }
     
-    # Update answerable_processing
-    answerable_processing = answerable_dict.copy()
-    answerable_processing["trip_context"] = trip_context
-    
-    return {"answerable_processing": answerable_processing}
+    return {"answerable_processing": {"trip_context": trip_context}}
@@ -1,7 +1,5 @@
 from typing import TypedDict, Dict, Any
-from graph.state import ConversationWorkflowState, Questions, ClassifiedQuestion
-from llm.client import LLMClient
-from utils.state_adapter import get_state_value, to_dict
+from llm.client import get_llm_client
 
 
 def classify_each_question(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -9,21 +7,19 @@ def classify_each_question(state: Dict[str, Any]) -> Dict[str, Any]:
     Classify each atomic question using LLM batch processing.
     Only modifies: questions.classified
     """
-    llm = LLMClient()
+    llm = get_llm_client().for_turn(state.get("turn_deadline"))
     
-    questions = get_state_value(state, "questions", {})
-    questions_dict = to_dict(questions)
-    atomic_questions = questions_dict.get("atomic", [])
+    questions = state.get("questions") or {}
+    atomic_questions = questions.get("atomic", [])
     
     if not atomic_questions:
-        questions_dict["classified"] = []
-        return {"questions": questions_dict}
+        return {"questions": {**questions, "classified": []}}
     
     question_texts = []
     question_ids = []
     for atomic_q in atomic_questions:
-        question_id = atomic_q.get("id") if isinstance(atomic_q, dict) else getattr(atomic_q, "id", "")
-        question_text = atomic_q.get("text") if isinstance(atomic_q, dict) else getattr(atomic_q, "text", "")
+        question_id = atomic_q.get("id")
+        question_text = atomic_q.get("text")
         if question_text:
             question_texts.append(question_text)
             question_ids.append(question_id)
@@ -42,6 +38,4 @@ def classify_each_question(state: Dict[str, Any]) -> Dict[str, Any]:
             "class": classification
         })
     
-    questions_dict["classified"] = classified
-    
-    return {"questions": questions_dict}
+    return {"questions": {**questions, "classified": classified}}
@@ -1,7 +1,5 @@
 from typing import TypedDict, Dict, Any
 import re
-from graph.state import MergedOutput
-from utils.state_adapter import get_state_value, to_dict
 from utils.behaviors import check_decision_confirmation, check_call_request
 
 
@@ -11,8 +9,7 @@ def merge_outputs(state: Dict[str, Any]) -> Dict[str, Any]:
     Only modifies: merged_output
     """
     # Check for booking confirmation first
-    input_obj = get_state_value(state, "input", {})
-    raw_text = input_obj.get("raw_text") if isinstance(input_obj, dict) else getattr(input_obj, "raw_text", "")
+    raw_text = (state.get("input") or {}).get("raw_text", "")
     
     if raw_text:
         text_lower = raw_text.lower()
@@ -95,26 +92,22 @@ def merge_outputs(state: Dict[str, Any]) -> Dict[str, Any]:
     parts = []
     
     # Add answerable answer if present
-    answerable_processing = get_state_value(state, "answerable_processing")
+    answerable_processing = state.get("answerable_processing")
     if answerable_processing:
-        answerable_dict = to_dict(answerable_processing)
-        answer_text = answerable_dict.get("answer_text")
+        answer_text = answerable_processing.get("answer_text")
         if answer_text:
             parts.append(answer_text)
     
     # Add skippable boundaries ONLY if there are forbidden questions in CURRENT batch
     # Check if there are forbidden questions in the current batch
-    questions = get_state_value(state, "questions", {})
-    questions_dict = to_dict(questions)
-    partitioned = questions_dict.get("partitioned", {})
+    partitioned = (state.get("questions") or {}).get("partitioned") or {}
     forbidden_in_current_batch = partitioned.get("skippable", {}).get("forbidden", [])
     
     # Only add boundaries if there are forbidden questions in current batch
     if forbidden_in_current_batch:
-        skippable_actions = get_state_value(state, "skippable_actions")
+        skippable_actions = state.get("skippable_actions")
         if skippable_actions:
-            skippable_dict = to_dict(skippable_actions)
-            boundaries = skippable_dict.get("boundaries", [])
+            boundaries = skippable_actions.get("boundaries", [])
             if boundaries:
                 parts.extend(boundaries)
     
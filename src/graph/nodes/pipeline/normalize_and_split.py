@@ -1,18 +1,16 @@
+import time
 from typing import TypedDict, Dict, Any
-from graph.state import ConversationWorkflowState, Questions, AtomicQuestion
+from app.settings import Settings
 from utils.text import normalize_text, split_into_questions
 from utils.ids import generate_question_id
-from utils.state_adapter import get_state_value, to_dict
 
 
 def normalize_and_split(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Normalize input text and split into atomic questions.
-    Only modifies: questions.atomic
+    Only modifies: questions.atomic, turn_deadline (if not already set)
     """
-    # Handle both dict and Pydantic
-    input_obj = get_state_value(state, "input", {})
-    raw_text = input_obj.get("raw_text") if isinstance(input_obj, dict) else getattr(input_obj, "raw_text", "")
+    raw_text = (state.get("input") or {}).get("raw_text", "")
     
     normalized = normalize_text(raw_text)
     
@@ -29,9 +27,14 @@ def normalize_and_split(state: Dict[str, Any]) -> Dict[str, Any]:
     ]
     
     # Update state
-    questions = get_state_value(state, "questions", {})
-    questions_dict = to_dict(questions)
-    questions_dict["atomic"] = atomic_questions
+    questions = state.get("questions") or {}
+    update = {"questions": {**questions, "atomic": atomic_questions}}
     
-    return {"questions": questions_dict}
+    # Start the turn's latency budget unless the caller already set a deadline
+    if not state.get("turn_deadline"):
+        budget_ms = Settings().turn_budget_ms
+        if budget_ms > 0:
+            update["turn_deadline"] = time.time() + budget_ms / 1000
+    
+    return update
 
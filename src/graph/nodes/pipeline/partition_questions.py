@@ -1,6 +1,4 @@
 from typing import TypedDict, Dict, Any
-from graph.state import ConversationWorkflowState, Questions, PartitionedQuestions
-from utils.state_adapter import get_state_value, to_dict
 
 
 def partition_questions(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -15,14 +13,12 @@ def partition_questions(state: Dict[str, Any]) -> Dict[str, Any]:
         "hostile": []
     }
     
-    questions = get_state_value(state, "questions", {})
-    questions_dict = to_dict(questions)
-    classified_questions = questions_dict.get("classified", [])
+    questions = state.get("questions") or {}
+    classified_questions = questions.get("classified", [])
     
     for classified_q in classified_questions:
-        # Handle both dict and Pydantic
-        q_class = classified_q.get("class") or classified_q.get("class_") if isinstance(classified_q, dict) else getattr(classified_q, "class_", None) or getattr(classified_q, "class", None)
-        q_id = classified_q.get("id") if isinstance(classified_q, dict) else getattr(classified_q, "id", "")
+        q_class = classified_q.get("class")
+        q_id = classified_q.get("id")
         
         if q_class == "ANSWERABLE":
             non_skippable.append(q_id)
@@ -33,10 +29,10 @@ def partition_questions(state: Dict[str, Any]) -> Dict[str, Any]:
         elif q_class == "HOSTILE":
             skippable["hostile"].append(q_id)
     
-    questions_dict["partitioned"] = {
+    partitioned = {
         "non_skippable": non_skippable,
         "skippable": skippable
     }
     
-    return {"questions": questions_dict}
+    return {"questions": {**questions, "partitioned": partitioned}}
 
@@ -1,6 +1,4 @@
 from typing import TypedDict, Dict, Any
-from graph.state import NextAction
-from utils.state_adapter import get_state_value
 
 
 def post_answer_action(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -9,7 +7,7 @@ def post_answer_action(state: Dict[str, Any]) -> Dict[str, Any]:
     Only modifies: next_action
     """
     # Default to END if we have a merged output
-    merged_output = get_state_value(state, "merged_output")
+    merged_output = state.get("merged_output")
     if merged_output:
         workflow = "END"
     else:
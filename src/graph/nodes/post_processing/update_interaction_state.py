@@ -1,6 +1,4 @@
 from typing import TypedDict, Dict, Any
-from graph.state import InteractionState
-from utils.state_adapter import get_state_value, to_dict
 
 
 def update_interaction_state(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -14,7 +12,7 @@ def update_interaction_state(state: Dict[str, Any]) -> Dict[str, Any]:
         return {"interaction_state": existing_interaction_state}
     
     # Determine decision stage
-    merged_output = get_state_value(state, "merged_output")
+    merged_output = state.get("merged_output")
     if merged_output:
         decision_stage = "ANSWERED"
     else:
@@ -22,10 +20,9 @@ def update_interaction_state(state: Dict[str, Any]) -> Dict[str, Any]:
     
     # Check for escalation (e.g., if skippable actions have boundaries)
     escalation_flag = False
-    skippable_actions = get_state_value(state, "skippable_actions")
+    skippable_actions = state.get("skippable_actions")
     if skippable_actions:
-        skippable_dict = to_dict(skippable_actions)
-        boundaries = skippable_dict.get("boundaries", [])
+        boundaries = skippable_actions.get("boundaries", [])
         if boundaries:
             escalation_flag = True
     
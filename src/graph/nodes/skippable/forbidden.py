@@ -1,7 +1,5 @@
 from typing import TypedDict, Dict, Any
-from graph.state import SkippableActions
 from domain.policies import REFUND_POLICY
-from utils.state_adapter import get_state_value, to_dict
 
 
 def forbidden(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -9,17 +7,15 @@ def forbidden(state: Dict[str, Any]) -> Dict[str, Any]:
     Handle forbidden questions (e.g., refunds, guarantees).
     Only modifies: skippable_actions.boundaries
     """
-    questions = get_state_value(state, "questions", {})
-    questions_dict = to_dict(questions)
-    partitioned = questions_dict.get("partitioned", {})
+    partitioned = (state.get("questions") or {}).get("partitioned") or {}
     
     if not partitioned or not partitioned.get("skippable", {}).get("forbidden"):
         return {}
     
     # Get or create skippable_actions
-    skippable_actions = get_state_value(state, "skippable_actions")
+    skippable_actions = state.get("skippable_actions")
     if skippable_actions:
-        skippable_dict = to_dict(skippable_actions).copy()
+        skippable_dict = dict(skippable_actions)
     else:
         skippable_dict = {
             "clarifications": [],
@@ -28,8 +24,8 @@ def forbidden(state: Dict[str, Any]) -> Dict[str, Any]:
         }
     
     # Add boundary message
-    skippable_dict["boundaries"].append(
+    skippable_dict["boundaries"] = skippable_dict.get("boundaries", []) + [
         REFUND_POLICY["boundary_message"]
-    )
+    ]
     
     return {"skippable_actions": skippable_dict}
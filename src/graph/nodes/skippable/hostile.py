@@ -1,6 +1,4 @@
 from typing import TypedDict, Dict, Any
-from graph.state import SkippableActions
-from utils.state_adapter import get_state_value, to_dict
 
 
 def hostile(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -8,17 +6,15 @@ def hostile(state: Dict[str, Any]) -> Dict[str, Any]:
     Handle hostile questions.
     Only modifies: skippable_actions.tone_safe_messages
     """
-    questions = get_state_value(state, "questions", {})
-    questions_dict = to_dict(questions)
-    partitioned = questions_dict.get("partitioned", {})
+    partitioned = (state.get("questions") or {}).get("partitioned") or {}
     
     if not partitioned or not partitioned.get("skippable", {}).get("hostile"):
         return {}
     
     # Get or create skippable_actions
-    skippable_actions = get_state_value(state, "skippable_actions")
+    skippable_actions = state.get("skippable_actions")
     if skippable_actions:
-        skippable_dict = to_dict(skippable_actions).copy()
+        skippable_dict = dict(skippable_actions)
     else:
         skippable_dict = {
             "clarifications": [],
@@ -27,8 +23,8 @@ def hostile(state: Dict[str, Any]) -> Dict[str, Any]:
         }
     
     # Add tone-safe message
-    skippable_dict["tone_safe_messages"].append(
+    skippable_dict["tone_safe_messages"] = skippable_dict.get("tone_safe_messages", []) + [
         "I'm here to help. Let's focus on how I can assist you with your travel plans."
-    )
+    ]
     
     return {"skippable_actions": skippable_dict}
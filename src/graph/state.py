@@ -167,6 +167,21 @@ class NextAction(BaseModel):
 # =========================
 # ROOT STATE (LangGraph)
 # =========================
+#
+# The models above describe the record shapes and validate at the API
+# boundary only. Inside the graph every channel holds plain dicts with the
+# same keys (ClassifiedQuestion is keyed by its alias, "class"); nodes read
+# them with .get() and return new records for the keys they change.
+
+def new_turn_state(raw_text: str, **fields: Any) -> Dict[str, Any]:
+    """Initial graph state for one message, validated once and stored as records."""
+    state: Dict[str, Any] = {
+        "input": InputPayload(raw_text=raw_text).model_dump(),
+        "questions": {"atomic": [], "classified": [], "partitioned": None},
+    }
+    state.update(fields)
+    return state
+
 
 def combine_handler_outputs(current: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Reducer function to combine handler outputs from parallel execution."""
@@ -179,77 +194,71 @@ def combine_handler_outputs(current: List[Dict[str, Any]], new: List[Dict[str, A
 
 
 def combine_answerable_processing(
-    current: Optional[AnswerableProcessing], 
-    new: Optional[AnswerableProcessing]
-) -> Optional[AnswerableProcessing]:
-    """Reducer to merge answerable_processing from parallel handler execution.
+    current: Optional[Dict[str, Any]], 
+    new: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Reducer for answerable_processing updates.
     
-    Handlers update the entire object, so we need to merge by:
-    1. Combining handler_outputs lists (avoiding duplicates by block_id)
-    2. Preferring new values for other fields (non-conflicting updates)
+    Only the sequential nodes write answerable_processing (handler results go
+    to the ``handler_outputs`` channel), so this is a shallow key merge with
+    the newer value winning, so nodes return only the keys they change.
     """
     if not current:
         return new
     if not new:
         return current
     
-    # Convert to dict if Pydantic models
-    current_dict = current.model_dump() if hasattr(current, 'model_dump') else (current if isinstance(current, dict) else {})
-    new_dict = new.model_dump() if hasattr(new, 'model_dump') else (new if isinstance(new, dict) else {})
-    
-    # Get handler_outputs from both
-    current_outputs = current_dict.get("handler_outputs", []) or []
-    new_outputs = new_dict.get("handler_outputs", []) or []
-    
-    # Combine outputs, avoiding duplicates by block_id
-    seen_block_ids = set()
-    combined_outputs = []
-    
-    # Add current outputs
-    for output in current_outputs:
-        block_id = output.get("block_id") if isinstance(output, dict) else getattr(output, "block_id", None)
-        if block_id and block_id not in seen_block_ids:
-            combined_outputs.append(output)
-            seen_block_ids.add(block_id)
-    
-    # Add new outputs (only if not already present)
-    for output in new_outputs:
-        block_id = output.get("block_id") if isinstance(output, dict) else getattr(output, "block_id", None)
-        if block_id and block_id not in seen_block_ids:
-            combined_outputs.append(output)
-            seen_block_ids.add(block_id)
-        elif not block_id:
-            # If no block_id, just add it (shouldn't happen but be safe)
-            combined_outputs.append(output)
-    
-    # Merge dictionaries - prefer new for non-list fields
-    merged_dict = current_dict.copy()
-    merged_dict.update(new_dict)
-    merged_dict["handler_outputs"] = combined_outputs
+    merged = dict(current)
+    merged.update(new)
+    return merged
+
+
+def merge_handler_outputs_by_block(
+    current: Optional[Dict[str, Dict[str, Any]]],
+    new: Optional[Dict[str, Dict[str, Any]]]
+) -> Dict[str, Dict[str, Any]]:
+    """Reducer for the handler_outputs channel: ``{block_id: handler output}``.
     
-    # Return as dict (handlers work with dicts, LangGraph will handle conversion if needed)
-    return merged_dict
+    Parallel handlers each add their own blocks; a repeated block_id keeps
+    the latest output. The channel value is never changed in place (a
+    checkpoint or ``get_state`` snapshot may hold it), so each merge builds a
+    new dict - a handful of blocks per turn.
+    """
+    if not current:
+        return dict(new) if new else {}
+    if not new:
+        return current
+    return {**current, **new}
 
 
 class ConversationWorkflowState(TypedDict, total=False):
     """LangGraph state - TypedDict for conditional handler execution."""
-    # Entry
-    input: InputPayload
+    # Entry (records shaped like the models named in the comments)
+    input: Dict[str, Any]  # InputPayload
+
+    # Absolute deadline for this turn (epoch seconds), set by normalize_and_split
+    turn_deadline: Optional[float]
+
+    # Correlation ids carried by this turn's trace (set by app.turn.process_turn)
+    session_id: Optional[str]
+    turn_id: Optional[str]
 
     # Question processing
-    questions: Questions
+    questions: Dict[str, Any]  # Questions
 
     # Answerable branch (optional for early exit)
-    # Annotated with reducer for parallel handler execution
-    answerable_processing: Annotated[Optional[AnswerableProcessing], combine_answerable_processing]
+    answerable_processing: Annotated[Optional[Dict[str, Any]], combine_answerable_processing]  # AnswerableProcessing
+    
+    # Handler results by block_id, written in parallel by the handlers
+    handler_outputs: Annotated[Dict[str, Dict[str, Any]], merge_handler_outputs_by_block]
 
     # Skippable branch
-    skippable_actions: Optional[SkippableActions]
+    skippable_actions: Optional[Dict[str, Any]]  # SkippableActions
 
     # Merge + post processing
-    merged_output: Optional[MergedOutput]
-    interaction_state: Optional[InteractionState]
-    next_action: Optional[NextAction]
+    merged_output: Optional[Dict[str, Any]]  # MergedOutput
+    interaction_state: Optional[Dict[str, Any]]  # InteractionState
+    next_action: Optional[Dict[str, Any]]  # NextAction
     
     # Conversation history for context maintenance
     conversation_history: Optional[List[Dict[str, str]]]  # List of {"role": "user"/"assistant", "content": "..."}
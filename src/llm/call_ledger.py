@@ -0,0 +1,154 @@
+"""Bounded in-memory ledger of LLM calls with optional JSONL spill-to-disk."""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Iterator, List, Optional
+
+# response_metadata key set by chat models that served a response without calling the API (cassette replay)
+CACHE_HIT_KEY = "cache_hit"
+
+
+@dataclass
+class CallRecord:
+    """Compact audit record for a single LLM call (no prompts or payloads)."""
+    method: str
+    model: str
+    latency_ms: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_hit: bool = False
+    error: Optional[str] = None
+    queue_ms: float = 0.0
+    route: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CallLedger:
+    """Fixed-size ring buffer of CallRecords.
+
+    Older records are evicted once ``max_records`` is reached, so memory stays
+    flat regardless of uptime. If ``ledger_path`` is set, every record is also
+    appended to a JSONL file which is rotated once it exceeds ``max_bytes``
+    (``ledger.jsonl`` -> ``ledger.jsonl.1`` -> ... -> ``ledger.jsonl.{backups}``).
+    """
+
+    def __init__(
+        self,
+        max_records: int = 500,
+        ledger_path: Optional[str] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 5
+    ):
+        self._records = deque(maxlen=max(1, max_records))
+        self._lock = threading.Lock()
+        self.ledger_path = ledger_path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.total_calls = 0
+        self.total_errors = 0
+
+    def record(
+        self,
+        method: str,
+        model: str,
+        latency_ms: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_hit: bool = False,
+        error: Optional[str] = None,
+        queue_ms: float = 0.0,
+        route: Optional[str] = None
+    ) -> CallRecord:
+        """Append a call record (and spill it to disk if a ledger file is configured)."""
+        entry = CallRecord(
+            method=method,
+            model=model,
+            latency_ms=round(latency_ms, 2),
+            input_tokens=input_tokens or 0,
+            output_tokens=output_tokens or 0,
+            cache_hit=cache_hit,
+            error=error,
+            queue_ms=round(queue_ms, 2),
+            route=route
+        )
+        with self._lock:
+            self._records.append(entry)
+            self.total_calls += 1
+            if error:
+                self.total_errors += 1
+            if self.ledger_path:
+                self._spill(entry)
+        return entry
+
+    def _spill(self, entry: CallRecord) -> None:
+        """Append one JSONL line, rotating the file first if it is too large."""
+        try:
+            if os.path.exists(self.ledger_path) and os.path.getsize(self.ledger_path) >= self.max_bytes:
+                self._rotate()
+            directory = os.path.dirname(self.ledger_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.ledger_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry.to_dict(), separators=(",", ":")) + "\n")
+        except OSError as e:
+            # Never let audit logging break an LLM call
+            print(f"LLM call ledger write error: {e}")
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.ledger_path)
+            return
+        oldest = f"{self.ledger_path}.{self.backups}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.ledger_path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.ledger_path}.{i + 1}")
+        os.replace(self.ledger_path, f"{self.ledger_path}.1")
+
+    def records(self, method: Optional[str] = None) -> List[CallRecord]:
+        """Snapshot of buffered records, optionally filtered by method."""
+        with self._lock:
+            items = list(self._records)
+        if method:
+            items = [r for r in items if r.method == method]
+        return items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[CallRecord]:
+        return iter(self.records())
+
+
+_DEFAULT_LEDGER: Optional[CallLedger] = None
+_DEFAULT_LEDGER_LOCK = threading.Lock()
+
+
+def get_call_ledger() -> CallLedger:
+    """Process-wide ledger shared by the LLM client, its per-turn views and any other LLMClient."""
+    global _DEFAULT_LEDGER
+    if _DEFAULT_LEDGER is None:
+        with _DEFAULT_LEDGER_LOCK:
+            if _DEFAULT_LEDGER is None:
+                from app.settings import Settings
+                settings = Settings()
+                _DEFAULT_LEDGER = CallLedger(
+                    max_records=settings.llm_call_history_size,
+                    ledger_path=settings.llm_call_ledger_path,
+                    max_bytes=settings.llm_call_ledger_max_bytes,
+                    backups=settings.llm_call_ledger_backups
+                )
+    return _DEFAULT_LEDGER
@@ -0,0 +1,170 @@
+"""Record/replay cassettes for LLM calls.
+
+In ``record`` mode every prompt/response pair that goes through a wrapped chat
+model is appended to a JSONL cassette. In ``replay`` mode responses are served
+from the cassette by prompt hash, optionally sleeping for the recorded latency
+(divided by ``speedup``), so captured traffic can be pushed through a new graph
+version with no network.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from llm.call_ledger import CACHE_HIT_KEY
+
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when a prompt was never recorded."""
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _render(messages: List[BaseMessage]) -> str:
+    return "\n".join(str(m.content) for m in messages)
+
+
+class Cassette:
+    """JSONL store of recorded LLM interactions keyed by prompt hash."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    def record(self, prompt: str, model: str, response: str, usage: Optional[Dict[str, Any]], latency_ms: float) -> None:
+        entry = {
+            "key": prompt_hash(prompt),
+            "model": model,
+            "prompt": prompt,
+            "response": response,
+            "usage": usage or {},
+            "latency_ms": round(latency_ms, 2),
+            "recorded_at": time.time()
+        }
+        with self._lock:
+            self._entries.setdefault(entry["key"], []).append(entry)
+            self.recorded += 1
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def lookup(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Return the next recorded entry for a prompt (cycling through repeats)."""
+        key = prompt_hash(prompt)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            self.hits += 1
+            return entries[index % len(entries)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "prompts": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded
+        }
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model that records through ``inner`` or replays from a cassette."""
+
+    model: str = "cassette"
+    mode: str = "replay"
+    inner: Any = None
+    cassette: Any = None
+    simulate_latency: bool = False
+    speedup: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette-chat-model"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        prompt = _render(messages)
+
+        if self.mode == "record":
+            start = time.perf_counter()
+            message = self.inner.invoke(messages, stop=stop, **kwargs)
+            latency_ms = (time.perf_counter() - start) * 1000
+            content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+            self.cassette.record(prompt, self.model, content, getattr(message, "usage_metadata", None), latency_ms)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        entry = self.cassette.lookup(prompt)
+        if entry is None:
+            raise CassetteMissError(f"No cassette entry for prompt {prompt_hash(prompt)[:12]}")
+        if self.simulate_latency and entry.get("latency_ms"):
+            time.sleep(entry["latency_ms"] / 1000 / max(self.speedup, 1e-6))
+        usage = entry.get("usage") or None
+        metadata = {CACHE_HIT_KEY: True}
+        if usage:
+            message = AIMessage(content=entry["response"], usage_metadata=usage, response_metadata=metadata)
+        else:
+            message = AIMessage(content=entry["response"], response_metadata=metadata)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+_CASSETTES: Dict[str, Cassette] = {}
+_CASSETTES_LOCK = threading.Lock()
+
+
+def get_cassette(path: str) -> Cassette:
+    """Shared Cassette per path (one file handle and cursor set for every client and replay run)."""
+    with _CASSETTES_LOCK:
+        if path not in _CASSETTES:
+            _CASSETTES[path] = Cassette(path)
+        return _CASSETTES[path]
+
+
+def wrap_with_cassette(llm: Any, model: str, settings: Any) -> CassetteChatModel:
+    """Wrap a chat model (or stand in for it in replay mode) per Settings."""
+    return CassetteChatModel(
+        model=model,
+        mode=settings.llm_cassette_mode,
+        inner=llm,
+        cassette=get_cassette(settings.llm_cassette_path),
+        simulate_latency=settings.llm_cassette_simulate_latency,
+        speedup=settings.llm_cassette_speedup
+    )
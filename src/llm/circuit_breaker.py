@@ -0,0 +1,131 @@
+"""Per-model circuit breakers for LLM calls.
+
+Each model's breaker tracks errors and slow calls over a rolling time window.
+Once enough calls have been seen and the error (or slow-call) rate crosses its
+threshold the breaker opens and callers fail over to another model without
+waiting on the broken one. After ``open_s`` a single half-open probe is let
+through; success closes the breaker, failure re-opens it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when every candidate model's breaker is open."""
+
+
+class CircuitBreaker:
+    """Rolling-window error/latency breaker for one model."""
+
+    def __init__(
+        self,
+        name: str,
+        window_s: float = 60.0,
+        min_calls: int = 10,
+        error_threshold: float = 0.5,
+        slow_call_ms: float = 0.0,
+        slow_threshold: float = 0.8,
+        open_s: float = 30.0
+    ):
+        self.name = name
+        self.window_s = window_s
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.slow_call_ms = slow_call_ms
+        self.slow_threshold = slow_threshold
+        self.open_s = open_s
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._calls = deque()  # (timestamp, failed, slow)
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to this model now (reserves the half-open probe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_s:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record(self, success: bool, latency_ms: float) -> None:
+        now = time.monotonic()
+        slow = bool(self.slow_call_ms) and latency_ms >= self.slow_call_ms
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if success and not slow:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+
+            self._calls.append((now, not success, slow))
+            while self._calls and now - self._calls[0][0] > self.window_s:
+                self._calls.popleft()
+
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                total = len(self._calls)
+                errors = sum(1 for _, failed, _ in self._calls if failed)
+                slow_calls = sum(1 for _, _, is_slow in self._calls if is_slow)
+                if errors / total >= self.error_threshold or (self.slow_call_ms and slow_calls / total >= self.slow_threshold):
+                    self._open(now)
+
+    def release(self) -> None:
+        """Give back a reserved probe when the call never reached the model."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self._calls.clear()
+        print(f"LLM circuit breaker opened for {self.name}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"model": self.name, "state": self.state, "calls": len(self._calls)}
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(model: str, settings: Any) -> Optional[CircuitBreaker]:
+    """Shared breaker for ``model`` (None when Settings.llm_circuit_breaker is off)."""
+    if not settings.llm_circuit_breaker:
+        return None
+    breaker = _BREAKERS.get(model)
+    if breaker is None:
+        with _BREAKERS_LOCK:
+            breaker = _BREAKERS.get(model)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    model,
+                    window_s=settings.llm_breaker_window_s,
+                    min_calls=settings.llm_breaker_min_calls,
+                    error_threshold=settings.llm_breaker_error_threshold,
+                    slow_call_ms=settings.llm_breaker_slow_call_ms,
+                    open_s=settings.llm_breaker_open_s
+                )
+                _BREAKERS[model] = breaker
+    return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breaker state (tests / backend switches)."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
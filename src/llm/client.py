@@ -1,6 +1,8 @@
 import os
-import json
-from typing import List, Dict, Any, Optional
+import copy
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 # Prevent torch from loading if possible (for Windows paging file issues)
 # Set environment variables before importing langchain
@@ -9,20 +11,26 @@ os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
 from langsmith import traceable
 
 from app.settings import Settings
-from llm.prompts import CLASSIFIER_PROMPT, PLANNER_PROMPT, COMPOSER_PROMPT, CATEGORIZER_PROMPT, EXTRACTOR_PROMPT, INTENT_DETECTOR_PROMPT
+from app.tracing import add_span
+from llm.call_ledger import CACHE_HIT_KEY, get_call_ledger
+from llm.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from llm.coalescer import get_request_coalescer
+from llm.rate_limiter import get_llm_scheduler
+from llm.resilience import LLMDeadlineExceeded, RetryPolicy, bounded_call, hedged_call, remaining_s
+from llm.router import get_model_router, model_name as _model_name
+from llm.prompt_builder import compact_json, get_prompt_builder
+from llm.schemas import CategoryBatch, ClassificationBatch, FactsBatch, FactsItem, SchemaParser, by_index, message_text, numbered
+from llm.streaming_json import ResultsStreamParser
+from utils.lazy import lazy_attr
 
 # Lazy imports to avoid loading torch/transformers if not needed
 # Catch all exceptions including OSError from torch DLL loading on Windows
 LANGCHAIN_AVAILABLE = False
-ChatGoogleGenerativeAI = None
-ChatPromptTemplate = None
 StrOutputParser = None
 JsonOutputParser = None
 _import_error = None
 
 try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain_core.prompts import ChatPromptTemplate
     from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
     LANGCHAIN_AVAILABLE = True
 except Exception as e:
@@ -30,6 +38,9 @@ except Exception as e:
     _import_error = e
     LANGCHAIN_AVAILABLE = False
 
+# The Gemini client (google-genai) is the slowest import in the app; load it on first use
+_chat_google_genai = lazy_attr("langchain_google_genai:ChatGoogleGenerativeAI")
+
 
 DATE_TERMS = [
     "date", "dates", "start", "end", "departure", "return", "schedule",
@@ -57,11 +68,117 @@ CATEGORY_TERMS = [
 ]
 
 
+def _gemini_backend(settings: Settings) -> Tuple[Any, Any]:
+    """Default backend: (Pro, Flash) Gemini chat models."""
+    # Initialize Gemini 2.5 Pro (or fallback to available model)
+    model_name = settings.gemini_model or settings.gemini_video_model or "gemini-2.0-flash-exp"
+
+    # Check if API key is available (try multiple sources)
+    api_key = settings.effective_gemini_api_key()
+
+    if not api_key:
+        raise ValueError(
+            "Gemini API key not found. Please set GEMINI_API_KEY or GOOGLE_API_KEY "
+            "in .env file or environment variables."
+        )
+
+    ChatGoogleGenerativeAI = _chat_google_genai()
+    try:
+        llm = ChatGoogleGenerativeAI(
+            model=model_name,
+            google_api_key=api_key,
+            temperature=0.0,  # Deterministic for classification
+        )
+
+        # Initialize Flash model for faster classification/categorization tasks
+        flash_llm = ChatGoogleGenerativeAI(
+            model="gemini-2.0-flash-exp",
+            google_api_key=api_key,
+            temperature=0.0,
+        )
+    except Exception as e:
+        raise RuntimeError(
+            f"Failed to initialize Gemini LLM: {e}. "
+            "Please check your API key and model name."
+        )
+
+    return llm, flash_llm
+
+
+_FAKE_FACTORIES: Dict[Tuple[float, float, int], Callable[[Settings], Tuple[Any, Any]]] = {}
+
+
+def _fake_backend(settings: Settings) -> Tuple[Any, Any]:
+    """Offline backend returning canned responses (see llm.fake_backend)."""
+    from llm.fake_backend import fake_backend_factory
+    key = (settings.fake_llm_latency_ms, settings.fake_llm_error_rate, settings.fake_llm_seed)
+    if key not in _FAKE_FACTORIES:
+        _FAKE_FACTORIES[key] = fake_backend_factory(
+            latency_ms=settings.fake_llm_latency_ms,
+            error_rate=settings.fake_llm_error_rate,
+            seed=settings.fake_llm_seed
+        )
+    return _FAKE_FACTORIES[key](settings)
+
+
+_LLM_BACKENDS: Dict[str, Callable[[Settings], Tuple[Any, Any]]] = {
+    "gemini": _gemini_backend,
+    "fake": _fake_backend,
+}
+_BACKEND_OVERRIDE: Optional[Callable[[Settings], Tuple[Any, Any]]] = None
+
+
+def register_llm_backend(name: str, factory: Callable[[Settings], Tuple[Any, Any]]) -> None:
+    """Register a backend factory returning (pro_llm, flash_llm) for Settings.llm_backend."""
+    _LLM_BACKENDS[name] = factory
+
+
+def set_llm_backend(factory: Optional[Callable[[Settings], Tuple[Any, Any]]]):
+    """Force every new LLMClient onto ``factory`` (None restores Settings.llm_backend).
+
+    Returns the previous override so callers can restore it.
+    """
+    global _BACKEND_OVERRIDE
+    previous = _BACKEND_OVERRIDE
+    _BACKEND_OVERRIDE = factory
+    reset_llm_client()
+    return previous
+
+
+_SHARED_CLIENT: Optional["LLMClient"] = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def get_llm_client() -> "LLMClient":
+    """Process-wide LLMClient built on first use.
+
+    Graph nodes take a per-turn view with ``get_llm_client().for_turn(deadline)``
+    so models, prompts and parsers are created once per worker, not per node call.
+    """
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _SHARED_CLIENT_LOCK:
+            if _SHARED_CLIENT is None:
+                _SHARED_CLIENT = LLMClient()
+    return _SHARED_CLIENT
+
+
+def reset_llm_client() -> None:
+    """Drop the shared client (e.g. after changing the backend or Settings)."""
+    global _SHARED_CLIENT
+    with _SHARED_CLIENT_LOCK:
+        _SHARED_CLIENT = None
+
 
 class LLMClient:
     """Gemini 2.5 Pro LLM client with LangSmith tracing for classification, planning, and composition."""
     
-    def __init__(self):
+    def __init__(self, deadline: Optional[float] = None):
+        """
+        Args:
+            deadline: Absolute turn deadline (epoch seconds, ``turn_deadline`` in graph state).
+                Retries and hedges only run while budget remains; None means no deadline.
+        """
         if not LANGCHAIN_AVAILABLE:
             error_msg = "LangChain dependencies not available."
             if _import_error:
@@ -76,50 +193,266 @@ class LLMClient:
         
         settings = Settings()
         
-        # Initialize Gemini 2.5 Pro (or fallback to available model)
-        model_name = settings.gemini_model or settings.gemini_video_model or "gemini-2.0-flash-exp"
+        cassette_mode = settings.llm_cassette_mode
+        if cassette_mode not in (None, "record", "replay"):
+            raise ValueError(f"Unknown LLM cassette mode '{cassette_mode}'. Use 'record' or 'replay'.")
         
-        # Check if API key is available (try multiple sources)
-        api_key = settings.effective_gemini_api_key()
+        if cassette_mode == "replay":
+            # Replay needs no backend (and no API key) - responses come from the cassette
+            self.llm, self.flash_llm = None, None
+        else:
+            # Chat models come from the configured backend (Gemini unless overridden)
+            factory = _BACKEND_OVERRIDE or _LLM_BACKENDS.get(settings.llm_backend)
+            if factory is None:
+                raise ValueError(
+                    f"Unknown LLM backend '{settings.llm_backend}'. "
+                    f"Available backends: {', '.join(sorted(_LLM_BACKENDS))}"
+                )
+            self.llm, self.flash_llm = factory(settings)
+        
+        if cassette_mode:
+            from llm.cassette import wrap_with_cassette
+            self.llm = wrap_with_cassette(self.llm, _model_name(self.llm) if self.llm else settings.gemini_model, settings)
+            self.flash_llm = wrap_with_cassette(self.flash_llm, _model_name(self.flash_llm) if self.flash_llm else "gemini-2.0-flash-exp", settings)
+        
+        # Where Pro tasks go while the Pro breaker is open: a configured secondary model, else Flash
+        self.settings = settings
+        self.failover_llm = self.flash_llm
+        if settings.llm_failover_model:
+            secondary = None
+            if cassette_mode != "replay" and _BACKEND_OVERRIDE is None and settings.llm_backend == "gemini":
+                secondary = _chat_google_genai()(
+                    model=settings.llm_failover_model,
+                    google_api_key=settings.effective_gemini_api_key(),
+                    temperature=0.0,
+                )
+            # Replay stands in for the model; recording needs a real one to wrap
+            if cassette_mode == "replay" or (cassette_mode and secondary is not None):
+                from llm.cassette import wrap_with_cassette
+                secondary = wrap_with_cassette(secondary, settings.llm_failover_model, settings)
+            if secondary is not None:
+                self.failover_llm = secondary
+        
+        # Model tiers addressable from Settings.llm_routes
+        self.tiers = {"pro": self.llm, "flash": self.flash_llm, "secondary": self.failover_llm}
+        
+        # Bounded, process-wide ring buffer of compact call records
+        self.call_history = get_call_ledger()
+        
+        # Shared per-task routing table (records every routing decision)
+        self.router = get_model_router(settings, self.call_history)
+        
+        # Shared cross-session batcher for classify/categorize (None when disabled)
+        self.coalescer = get_request_coalescer(settings)
+        
+        # Shared per-model token buckets + priority queue (None when no limits are configured)
+        self.scheduler = get_llm_scheduler(settings)
+        
+        # Retries with jittered backoff and optional hedging, bounded by the turn deadline
+        self.deadline = deadline
+        self.retry_policy = RetryPolicy(
+            max_retries=settings.llm_max_retries,
+            base_ms=settings.llm_retry_base_ms,
+            max_ms=settings.llm_retry_max_ms
+        )
+        self.hedge_methods = set(settings.llm_hedge_methods) if settings.llm_hedging else set()
+        self.hedge_min_samples = settings.llm_hedge_min_samples
+        
+        # Prompt templates are compiled once per process (shared PromptBuilder)
+        self.prompts = get_prompt_builder(settings)
+        self.classifier_prompt = self.prompts.get("classifier")
+        self.planner_prompt = self.prompts.get("planner")
+        self.composer_prompt = self.prompts.get("composer")
+        self.categorizer_prompt = self.prompts.get("categorizer")
+        self.extractor_prompt = self.prompts.get("extractor")
+        self.intent_detector_prompt = self.prompts.get("intent_detector")
+        self.batch_classifier_prompt = self.prompts.get("batch_classifier")
+        self.batch_categorizer_prompt = self.prompts.get("batch_categorizer")
+        self.batch_extractor_prompt = self.prompts.get("batch_extractor")
         
-        if not api_key:
-            raise ValueError(
-                "Gemini API key not found. Please set GEMINI_API_KEY or GOOGLE_API_KEY "
-                "in .env file or environment variables."
-            )
+        # Initialize parsers
+        self.str_parser = StrOutputParser()
+        self.json_parser = JsonOutputParser()
         
+        # Index-keyed, schema-constrained output for batch calls (one validated parse)
+        self.classification_parser = SchemaParser(ClassificationBatch)
+        self.category_parser = SchemaParser(CategoryBatch)
+        self.facts_parser = SchemaParser(FactsBatch)
+    
+    def for_turn(self, deadline: Optional[float] = None) -> "LLMClient":
+        """Shallow copy bound to one turn's deadline (models and shared state are reused)."""
+        client = copy.copy(self)
+        client.deadline = deadline
+        return client
+    
+    def warmup_models(self) -> Dict[str, float]:
+        """Send a tiny request to each configured model to open connections.
+
+        Returns the latency in ms per model; failures are printed and skipped.
+        """
+        timings = {}
+        for llm in {id(m): m for m in self.tiers.values() if m is not None}.values():
+            name = _model_name(llm)
+            start = time.perf_counter()
+            try:
+                llm.invoke("Reply with OK.")
+                timings[name] = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                print(f"LLM warmup error for {name}: {e}")
+        return timings
+    
+    def _invoke(
+        self,
+        method: str,
+        prompt,
+        parser,
+        inputs: Dict[str, Any],
+        on_chunk: Optional[Callable[[str, bool], None]] = None
+    ) -> Any:
+        """Run prompt -> model -> parser, retrying transient errors within the turn deadline.
+
+        The model comes from the routing table (Settings.llm_routes). Each
+        attempt goes to it unless its circuit breaker is open, in which case it
+        goes to the route's failover model (if any and healthy). Hedged methods send one duplicate request once the primary is slower
+        than the method's recent p95. Exceptions that survive the retries are
+        re-raised so each method keeps its own fallback.
+
+        With ``on_chunk`` the model output is streamed and each text chunk is
+        passed to it as it arrives, with a flag marking the first chunk of each
+        attempt (streamed calls are never hedged).
+
+        Every attempt is bounded by the turn deadline: once it passes the
+        attempt is abandoned (it finishes in the background, its chunks are
+        dropped) and LLMDeadlineExceeded is raised.
+        """
+        prompt_value = prompt.invoke(inputs)
+        llm, failover, decision = self.router.route(method, self.tiers)
+        route = f"{decision.tier}/{decision.reason}"
+        attempt = 0
+        while True:
+            left = remaining_s(self.deadline)
+            if left is not None and left <= 0:
+                raise LLMDeadlineExceeded(f"Turn deadline passed before {method}")
+            try:
+                model, breaker = self._pick_healthy(method, llm, failover)
+                hedge_after = self._hedge_after_s(method) if on_chunk is None else None
+                if hedge_after is not None:
+                    return hedged_call(lambda: self._attempt(method, prompt_value, model, parser, breaker, route), hedge_after, self.deadline)
+                if on_chunk is None:
+                    return bounded_call(lambda: self._attempt(method, prompt_value, model, parser, breaker, route), self.deadline)
+                abandoned = threading.Event()
+                relay = lambda text, first: None if abandoned.is_set() else on_chunk(text, first)
+                try:
+                    return bounded_call(lambda: self._attempt(method, prompt_value, model, parser, breaker, route, relay), self.deadline)
+                except LLMDeadlineExceeded:
+                    abandoned.set()
+                    raise
+            except Exception as e:
+                delay = self.retry_policy.backoff(attempt, e, self.deadline)
+                if delay is None:
+                    raise
+                print(f"LLM {method} transient error: {e}, retrying in {delay * 1000:.0f}ms")
+                time.sleep(delay)
+                attempt += 1
+    
+    def _pick_healthy(self, method: str, llm: Any, failover: Any = None) -> Tuple[Any, Any]:
+        """Pick the model for one attempt: (model, its breaker or None).
+
+        Raises CircuitOpenError when no candidate is healthy, so the calling
+        method goes straight to its fallback instead of waiting on a broken model.
+        """
+        candidates = [llm] if failover is None or failover is llm else [llm, failover]
+        for candidate in candidates:
+            breaker = get_circuit_breaker(_model_name(candidate), self.settings)
+            if breaker is None or breaker.allow():
+                return candidate, breaker
+        raise CircuitOpenError(f"Circuit open for {', '.join(_model_name(c) for c in candidates)} ({method})")
+    
+    def _hedge_after_s(self, method: str) -> Optional[float]:
+        """Recent successful p95 latency for ``method`` (None = do not hedge)."""
+        if method not in self.hedge_methods:
+            return None
+        latencies = sorted(r.latency_ms for r in self.call_history.records(method) if not r.error)
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        return latencies[int(0.95 * (len(latencies) - 1))] / 1000
+    
+    def _attempt(
+        self,
+        method: str,
+        prompt_value,
+        llm,
+        parser,
+        breaker: Any = None,
+        route: Optional[str] = None,
+        on_chunk: Optional[Callable[[str, bool], None]] = None
+    ) -> Any:
+        """One model call: wait for rate-limit budget, invoke, parse, record in the ledger.
+
+        The model's breaker (if any) sees the outcome of the model call itself;
+        parser errors do not count against the model.
+
+        When rate limits are configured the call first waits for its model's
+        token buckets (in priority order); that wait is recorded as queue_ms.
+        """
+        model = _model_name(llm)
+        queue_ms = 0.0
+        est_tokens = 0
+        message = None
+        error = None
+        called = False
+        start = time.perf_counter()
         try:
-            self.llm = ChatGoogleGenerativeAI(
-                model=model_name,
-                google_api_key=api_key,
-                temperature=0.0,  # Deterministic for classification
-            )
-            
-            # Initialize Flash model for faster classification/categorization tasks
-            self.flash_llm = ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash-exp",
-                google_api_key=api_key,
-                temperature=0.0,
-            )
+            if self.scheduler is not None:
+                est_tokens = self.prompts.estimate(prompt_value)
+                queue_ms = self.scheduler.acquire(model, method, est_tokens, timeout=remaining_s(self.deadline))
+                start = time.perf_counter()
+            called = True
+            # Schema parsers ask the model for constrained JSON output
+            model_kwargs = getattr(parser, "model_kwargs", {})
+            if on_chunk is None:
+                message = llm.invoke(prompt_value, **model_kwargs)
+            else:
+                # Only a fully received stream counts as a model success
+                streamed = None
+                for chunk in llm.stream(prompt_value, **model_kwargs):
+                    on_chunk(message_text(chunk), streamed is None)
+                    streamed = chunk if streamed is None else streamed + chunk
+                message = streamed
+            return parser.invoke(message)
         except Exception as e:
-            raise RuntimeError(
-                f"Failed to initialize Gemini LLM: {e}. "
-                "Please check your API key and model name."
+            error = type(e).__name__
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            usage = getattr(message, "usage_metadata", None) or {}
+            cache_hit = bool((getattr(message, "response_metadata", None) or {}).get(CACHE_HIT_KEY))
+            if self.scheduler is not None and est_tokens:
+                self.scheduler.settle(model, est_tokens, usage.get("total_tokens", 0))
+            if breaker is not None:
+                if called:
+                    breaker.record(message is not None, latency_ms)
+                else:
+                    breaker.release()
+            self.call_history.record(
+                method=method,
+                model=model,
+                latency_ms=latency_ms,
+                input_tokens=usage.get("input_tokens", 0),
+                output_tokens=usage.get("output_tokens", 0),
+                cache_hit=cache_hit,
+                error=error,
+                queue_ms=queue_ms,
+                route=route
+            )
+            add_span(
+                "llm", method, latency_ms, error,
+                model=model,
+                route=route,
+                input_tokens=usage.get("input_tokens", 0),
+                output_tokens=usage.get("output_tokens", 0),
+                queue_ms=round(queue_ms, 2)
             )
-        
-        self.call_history = []
-        
-        # Initialize prompt templates
-        self.classifier_prompt = ChatPromptTemplate.from_template(CLASSIFIER_PROMPT)
-        self.planner_prompt = ChatPromptTemplate.from_template(PLANNER_PROMPT)
-        self.composer_prompt = ChatPromptTemplate.from_template(COMPOSER_PROMPT)
-        self.categorizer_prompt = ChatPromptTemplate.from_template(CATEGORIZER_PROMPT)
-        self.extractor_prompt = ChatPromptTemplate.from_template(EXTRACTOR_PROMPT)
-        self.intent_detector_prompt = ChatPromptTemplate.from_template(INTENT_DETECTOR_PROMPT)
-        
-        # Initialize parsers
-        self.str_parser = StrOutputParser()
-        self.json_parser = JsonOutputParser()
     
     def _filter_trip_data(self, question_text: str, trip_data: Dict[str, Any]) -> Dict[str, Any]:
         if not trip_data or not isinstance(trip_data, dict):
@@ -182,12 +515,10 @@ class LLMClient:
     @traceable(name="classify_question")
     def classify_question(self, question_text: str) -> str:
         """Classify a question into ANSWERABLE, FORBIDDEN, MALFORMED, or HOSTILE."""
-        self.call_history.append(("classify", question_text))
-        
+
         try:
-            # Use Flash model for faster classification
-            chain = self.classifier_prompt | self.flash_llm | self.str_parser
-            result = chain.invoke({"question_text": question_text})
+            # Routed to Flash by default (Settings.llm_routes)
+            result = self._invoke("classify_question", self.classifier_prompt, self.str_parser, {"question_text": question_text})
             
             # Parse and validate result
             classification = result.strip().upper()
@@ -230,89 +561,44 @@ class LLMClient:
         if not questions:
             return {}
         
+        if self.coalescer is not None:
+            return self._coalesced("classify", questions, self._classify_flush, self._classify_fallback)
+        
+        return self._classify_flush(questions)
+    
+    def _classify_flush(self, questions: List[str]) -> Dict[str, str]:
+        """One classify call for ``questions`` (single prompt for one question, batch prompt otherwise)."""
         # For single question, use existing method
         if len(questions) == 1:
             classification = self.classify_question(questions[0])
             return {questions[0]: classification}
+
+        try:
+            # Routed to Flash by default (Settings.llm_routes)
+            result = self._invoke("classify_questions_batch", self.batch_classifier_prompt, self.classification_parser, {"questions_text": numbered(questions)})
+            classifications = by_index(questions, result.results, "label")
+        except Exception as e:
+            # Fallback on error - keyword rules, no per-question re-calls
+            print(f"LLM batch classification error: {e}, using fallback logic")
+            classifications = {}
         
-        self.call_history.append(("classify_batch", questions))
-        
+        # Questions the model skipped get the keyword fallback
+        return {q: classifications.get(q) or self._classify_fallback(q) for q in questions}
+    
+    def _coalesced(
+        self,
+        kind: str,
+        questions: List[str],
+        flush: Callable[[List[str]], Dict[str, str]],
+        fallback: Callable[[str], str]
+    ) -> Dict[str, str]:
+        """Route a batch through the shared coalescer; keyword fallback for anything missing."""
         try:
-            # Create batch prompt
-            questions_text = "\n".join([f"{i+1}. {q}" for i, q in enumerate(questions)])
-            
-            batch_prompt_template = """Classify each question into EXACTLY ONE of these categories: ANSWERABLE, FORBIDDEN, MALFORMED, HOSTILE.
-
-Rules:
-- ANSWERABLE: Questions we can answer with our trip information (e.g., pickup details, itinerary, pricing for trips, weather conditions, snowfall expectations)
-- FORBIDDEN: Questions about refunds, guarantees about policies/terms, or promises we cannot make (must redirect). Note: Questions about weather/conditions are ANSWERABLE even if they use words like "definitely" - we can answer with available information.
-- MALFORMED: Questions that are too short, unclear, or nonsensical (less than 5 characters or no clear meaning)
-- HOSTILE: Questions with hostile, offensive, or inappropriate language
-
-Questions:
-{questions_text}
-
-Return ONLY a JSON object mapping each question to its classification.
-Format: {{"question1": "ANSWERABLE", "question2": "FORBIDDEN"}}
-Return ONLY the JSON object, no explanations."""
-            
-            batch_prompt = ChatPromptTemplate.from_template(batch_prompt_template)
-            # Use Flash model for faster batch classification
-            chain = batch_prompt | self.flash_llm | self.json_parser
-            
-            result = chain.invoke({"questions_text": questions_text})
-            
-            # Parse result - should be a dict mapping questions to classifications
-            valid_classes = ["ANSWERABLE", "FORBIDDEN", "MALFORMED", "HOSTILE"]
-            question_to_classification = {}
-            
-            if isinstance(result, dict):
-                for q in questions:
-                    classification = None
-                    
-                    # Try exact match first
-                    if q in result:
-                        classification = result[q]
-                    else:
-                        # Try partial match (question in key or key in question)
-                        for key, value in result.items():
-                            if q == key or q in key or key in q:
-                                classification = value
-                                break
-                    
-                    # Validate and normalize classification
-                    if classification:
-                        classification = str(classification).strip().upper()
-                        # Extract valid class if it's part of a longer response
-                        if classification in valid_classes:
-                            question_to_classification[q] = classification
-                        else:
-                            for valid_class in valid_classes:
-                                if valid_class in classification:
-                                    question_to_classification[q] = valid_class
-                                    break
-                            else:
-                                # Fallback: use fallback logic for this question
-                                question_to_classification[q] = self._classify_fallback(q)
-                    else:
-                        # Fallback: use fallback logic for this question
-                        question_to_classification[q] = self._classify_fallback(q)
-                
-                return question_to_classification
-            
-            # Fallback: return classifications using fallback logic
-            return {q: self._classify_fallback(q) for q in questions}
-                    
+            results = self.coalescer.submit(kind, questions, flush, self.deadline)
         except Exception as e:
-            # Fallback on error - try individual calls
-            print(f"LLM batch classification error: {e}, falling back to individual calls")
-            result = {}
-            for q in questions:
-                try:
-                    result[q] = self.classify_question(q)
-                except:
-                    result[q] = "ANSWERABLE"
-            return result
+            print(f"LLM coalesced {kind} error: {e}, using fallback logic")
+            results = {}
+        return {q: results.get(q) or fallback(q) for q in questions}
     
     def _classify_fallback(self, question_text: str) -> str:
         """Fallback classification logic (same as in classify_question)."""
@@ -329,12 +615,10 @@ Return ONLY the JSON object, no explanations."""
     @traceable(name="categorize_question")
     def categorize_question(self, question_text: str) -> str:
         """Categorize an answerable question into LOGISTICS, COST, ITINERARY, or POLICY using LLM."""
-        self.call_history.append(("categorize", question_text))
-        
+
         try:
-            # Use Flash model for faster categorization
-            chain = self.categorizer_prompt | self.flash_llm | self.str_parser
-            result = chain.invoke({"question_text": question_text})
+            # Routed to Flash by default (Settings.llm_routes)
+            result = self._invoke("categorize_question", self.categorizer_prompt, self.str_parser, {"question_text": question_text})
             
             # Parse and validate result
             category = result.strip().upper()
@@ -380,91 +664,37 @@ Return ONLY the JSON object, no explanations."""
         if not questions:
             return {}
         
+        if self.coalescer is not None:
+            return self._coalesced("categorize", questions, self._categorize_flush, self._categorize_fallback)
+        
         # For small batches (<=3), individual calls are faster due to less overhead
         if len(questions) <= 3:
             result = {}
             for q in questions:
                 result[q] = self.categorize_question(q)
             return result
-        
-        self.call_history.append(("categorize_batch", questions))
-        
-        try:
-            # Create batch prompt
-            questions_text = "\n".join([f"{i+1}. {q}" for i, q in enumerate(questions)])
-            
-            batch_prompt_template = """Categorize each question into EXACTLY ONE of these categories: LOGISTICS, COST, ITINERARY, POLICY.
 
-Rules:
-- LOGISTICS: Questions about pickup points, transportation, accommodation, hotels, travel arrangements, meeting points, departure/arrival details
-- COST: Questions about pricing, costs, fees, payment, budget, expenses, total price, per person cost
-- ITINERARY: Questions about schedule, daily activities, what to do each day, places to visit, sightseeing, day-by-day plan, duration
-- POLICY: Questions about refund policies, cancellation policies, terms and conditions (though these may be classified as FORBIDDEN earlier)
-
-Questions:
-{questions_text}
-
-Return ONLY a JSON object mapping each question to its category.
-Format: {{"question1": "LOGISTICS", "question2": "COST"}}
-Return ONLY the JSON object, no explanations."""
-            
-            batch_prompt = ChatPromptTemplate.from_template(batch_prompt_template)
-            # Use Flash model for faster batch categorization
-            chain = batch_prompt | self.flash_llm | self.json_parser
-            
-            result = chain.invoke({"questions_text": questions_text})
-            
-            # Parse result - should be a dict mapping questions to categories
-            valid_categories = ["LOGISTICS", "COST", "ITINERARY", "POLICY"]
-            question_to_category = {}
-            
-            if isinstance(result, dict):
-                for q in questions:
-                    category = None
-                    
-                    # Try exact match first
-                    if q in result:
-                        category = result[q]
-                    else:
-                        # Try partial match (question in key or key in question)
-                        for key, value in result.items():
-                            if q == key or q in key or key in q:
-                                category = value
-                                break
-                    
-                    # Validate and normalize category
-                    if category:
-                        category = str(category).strip().upper()
-                        # Extract valid category if it's part of a longer response
-                        if category in valid_categories:
-                            question_to_category[q] = category
-                        else:
-                            for valid_category in valid_categories:
-                                if valid_category in category:
-                                    question_to_category[q] = valid_category
-                                    break
-                            else:
-                                # Fallback: use fallback logic for this question
-                                question_to_category[q] = self._categorize_fallback(q)
-                    else:
-                        # Fallback: use fallback logic for this question
-                        question_to_category[q] = self._categorize_fallback(q)
-                
-                return question_to_category
-            
-            # Fallback: return categories using fallback logic
-            return {q: self._categorize_fallback(q) for q in questions}
-                    
+        return self._categorize_batch_llm(questions)
+    
+    def _categorize_flush(self, questions: List[str]) -> Dict[str, str]:
+        """One categorize call for a coalesced batch (no per-question calls for small batches)."""
+        if len(questions) == 1:
+            return {questions[0]: self.categorize_question(questions[0])}
+        return self._categorize_batch_llm(questions)
+    
+    def _categorize_batch_llm(self, questions: List[str]) -> Dict[str, str]:
+        """Categorize ``questions`` with one structured batch call (keyword fallback on error)."""
+        try:
+            # Routed to Flash by default (Settings.llm_routes)
+            result = self._invoke("categorize_questions_batch", self.batch_categorizer_prompt, self.category_parser, {"questions_text": numbered(questions)})
+            categories = by_index(questions, result.results, "category")
         except Exception as e:
-            # Fallback on error - try individual calls
-            print(f"LLM batch categorization error: {e}, falling back to individual calls")
-            result = {}
-            for q in questions:
-                try:
-                    result[q] = self.categorize_question(q)
-                except:
-                    result[q] = "LOGISTICS"
-            return result
+            # Fallback on error - keyword rules, no per-question re-calls
+            print(f"LLM batch categorization error: {e}, using fallback logic")
+            categories = {}
+        
+        # Questions the model skipped get the keyword fallback
+        return {q: categories.get(q) or self._categorize_fallback(q) for q in questions}
     
     def _categorize_fallback(self, question_text: str) -> str:
         """Fallback categorization logic (same as in categorize_question)."""
@@ -484,15 +714,13 @@ Return ONLY the JSON object, no explanations."""
     @traceable(name="plan_answer")
     def plan_answer(self, structured_questions: List[Dict[str, Any]], trip_context: Dict[str, Any]) -> Dict[str, Any]:
         """Generate an answer plan using Gemini."""
-        self.call_history.append(("plan", structured_questions))
-        
+
         try:
             # Use Gemini for planning
-            chain = self.planner_prompt | self.llm | self.json_parser
-            
-            result = chain.invoke({
-                "structured_questions": json.dumps(structured_questions, indent=2),
-                "trip_context": json.dumps(trip_context, indent=2)
+            questions_json = compact_json(structured_questions)
+            result = self._invoke("plan_answer", self.planner_prompt, self.json_parser, {
+                "structured_questions": questions_json,
+                "trip_context": self.prompts.trip_data("plan_answer", "planner", trip_context, questions_json)
             })
             
             # Validate and ensure proper structure
@@ -574,8 +802,7 @@ Return ONLY the JSON object, no explanations."""
     @traceable(name="extract_facts")
     def extract_facts(self, question_text: str, trip_data: Dict[str, Any]) -> List[str]:
         """Extract relevant facts from trip data using LLM."""
-        self.call_history.append(("extract_facts", question_text))
-        
+
         if not trip_data or not isinstance(trip_data, dict):
             return []
         
@@ -584,11 +811,9 @@ Return ONLY the JSON object, no explanations."""
         
         try:
             # Use Gemini for fact extraction
-            chain = self.extractor_prompt | self.llm | self.json_parser
-            
-            result = chain.invoke({
+            result = self._invoke("extract_facts", self.extractor_prompt, self.json_parser, {
                 "question_text": question_text,
-                "trip_data": json.dumps(filtered_trip_data, indent=2)
+                "trip_data": self.prompts.trip_data("extract_facts", "extractor", filtered_trip_data, question_text)
             })
             
             # Parse result - should be a list of strings
@@ -608,12 +833,21 @@ Return ONLY the JSON object, no explanations."""
             return []
     
     @traceable(name="extract_facts_batch")
-    def extract_facts_batch(self, questions: List[str], trip_data: Dict[str, Any]) -> Dict[str, List[str]]:
+    def extract_facts_batch(
+        self,
+        questions: List[str],
+        trip_data: Dict[str, Any],
+        on_facts: Optional[Callable[[str, List[str]], None]] = None
+    ) -> Dict[str, List[str]]:
         """Extract relevant facts for multiple questions in a single LLM call.
         
         Args:
             questions: List of question texts to process
             trip_data: Trip data dictionary
+            on_facts: Optional callback ``(question, facts)``. When given, the
+                response is streamed and each question's facts are delivered
+                as soon as its entry in the JSON array closes; every question
+                is delivered exactly once, including fallbacks.
             
         Returns:
             Dictionary mapping each question to its list of facts
@@ -622,113 +856,86 @@ Return ONLY the JSON object, no explanations."""
             return {}
         
         if not trip_data or not isinstance(trip_data, dict):
-            return {q: [] for q in questions}
+            results = {q: [] for q in questions}
+            return self._deliver_facts(results, on_facts)
         
         # For single question, use existing method
         if len(questions) == 1:
             facts = self.extract_facts(questions[0], trip_data)
-            return {questions[0]: facts}
-        
-        self.call_history.append(("extract_facts_batch", questions))
-        
+            return self._deliver_facts({questions[0]: facts}, on_facts)
+
         # Determine what fields are needed based on all questions
         # For batch, include fields needed by any question
         combined_question = " ".join(questions).lower()
         filtered_trip_data = self._filter_trip_data(combined_question, trip_data)
         
+        delivered = set()
+        on_chunk = None
+        if on_facts is not None:
+            on_chunk = self._facts_stream_handler(questions, on_facts, delivered)
+        
+        questions_text = numbered(questions)
         try:
-            # Create batch prompt
-            questions_text = "\n".join([f"{i+1}. {q}" for i, q in enumerate(questions)])
-            
-            batch_prompt_template = """You are a fact extraction system for a travel booking assistant.
-
-Questions:
-{questions_text}
-
-Trip Data (JSON):
-{trip_data}
-
-Instructions:
-- Extract relevant facts from the trip data for EACH question
-- Return a JSON object mapping each question to its facts
-- Format: {{"question1": ["fact1", "fact2"], "question2": ["fact1"]}}
-- Each fact should be a complete, standalone statement
-- If a question asks about something not in trip data, return an empty array for that question
-- Do not make up information not present in trip data
-- Be specific and accurate
-- Use natural language for facts (not just raw data values)
-
-Common fields to look for:
-- Duration: Check "duration" object (days/nights)
-- Accommodation: Check "accommodation" object (stays, room_sharing, type)
-- Pickup/Meeting point: Check "logistics" object (meeting_point, pickup)
-- Itinerary: Check "itinerary" array
-- Pricing: Check "pricing" object
-- Meals/Food: Check "inclusions" and "exclusions" arrays, and "itinerary" activities for meal mentions
-
-Return ONLY a JSON object mapping questions to their facts, no explanations."""
-            
-            batch_prompt = ChatPromptTemplate.from_template(batch_prompt_template)
-            chain = batch_prompt | self.llm | self.json_parser
-            
-            result = chain.invoke({
+            result = self._invoke("extract_facts_batch", self.batch_extractor_prompt, self.facts_parser, {
                 "questions_text": questions_text,
-                "trip_data": json.dumps(filtered_trip_data, indent=2)
-            })
-            
-            # Parse result - should be a dict mapping questions to facts
-            if isinstance(result, dict):
-                # Ensure all questions are in the result
-                question_to_facts = {}
-                result_items = list(result.items())
-                
-                for idx, q in enumerate(questions):
-                    facts = None
-                    
-                    # Try exact match first
-                    if q in result:
-                        facts = result[q]
-                    else:
-                        # Try partial match (question in key or key in question)
-                        for key, value in result_items:
-                            if q == key or q in key or key in q:
-                                facts = value
-                                break
-                        
-                        # If still not found, try by position (index)
-                        if facts is None and idx < len(result_items):
-                            facts = result_items[idx][1]
-                    
-                    # Ensure facts is a list of strings
-                    if facts is None:
-                        facts = []
-                    
-                    if isinstance(facts, list):
-                        question_to_facts[q] = [str(fact) for fact in facts if fact]
-                    else:
-                        question_to_facts[q] = [str(facts)] if facts else []
-                
-                return question_to_facts
-            
-            # Fallback: return empty for all questions
-            return {q: [] for q in questions}
-                    
+                "trip_data": self.prompts.trip_data("extract_facts_batch", "batch_extractor", filtered_trip_data, questions_text)
+            }, on_chunk=on_chunk)
+            facts_by_question = by_index(questions, result.results, "facts")
         except Exception as e:
-            # Fallback on error - try individual calls
-            print(f"LLM batch fact extraction error: {e}, falling back to individual calls")
-            result = {}
-            for q in questions:
+            # Fallback on error - no facts rather than one extra call per question
+            print(f"LLM batch fact extraction error: {e}, using fallback logic")
+            facts_by_question = {}
+        
+        results = {q: [str(fact) for fact in facts_by_question.get(q, []) if fact] for q in questions}
+        return self._deliver_facts(results, on_facts, delivered)
+    
+    def _facts_stream_handler(
+        self,
+        questions: List[str],
+        on_facts: Callable[[str, List[str]], None],
+        delivered: set
+    ) -> Callable[[str, bool], None]:
+        """Chunk callback that parses streamed FactsBatch JSON and delivers each closed entry.
+
+        A retry restarts the stream, so the parser is reset whenever a new
+        response begins; questions already delivered are not delivered again.
+        """
+        state = {"parser": None}
+        
+        def on_chunk(text: str, new_response: bool) -> None:
+            if new_response or state["parser"] is None:
+                state["parser"] = ResultsStreamParser("results")
+            for item in state["parser"].feed(text):
                 try:
-                    result[q] = self.extract_facts(q, trip_data)
-                except:
-                    result[q] = []
-            return result
+                    entry = FactsItem.model_validate(item)
+                except Exception:
+                    continue
+                if not 1 <= entry.index <= len(questions):
+                    continue
+                question = questions[entry.index - 1]
+                if question in delivered:
+                    continue
+                delivered.add(question)
+                on_facts(question, [str(fact) for fact in entry.facts if fact])
+        return on_chunk
+    
+    def _deliver_facts(
+        self,
+        results: Dict[str, List[str]],
+        on_facts: Optional[Callable[[str, List[str]], None]],
+        delivered: Optional[set] = None
+    ) -> Dict[str, List[str]]:
+        """Deliver facts not yet streamed to ``on_facts``; return ``results`` unchanged."""
+        if on_facts is not None:
+            for question, facts in results.items():
+                if delivered is None or question not in delivered:
+                    on_facts(question, facts)
+        return results
     
     @traceable(name="compose_answer")
     def compose_answer(self, handler_outputs: List[Dict[str, Any]], normalized_text: str) -> str:
         """Compose final answer from handler outputs using Gemini."""
-        self.call_history.append(("compose", handler_outputs))
-        
+
         try:
             # Extract only facts to reduce payload size
             facts_list = []
@@ -741,10 +948,8 @@ Return ONLY a JSON object mapping questions to their facts, no explanations."""
             
             # Use simplified payload - just facts array
             simplified_output = {"facts": facts_list}
-            chain = self.composer_prompt | self.flash_llm | self.str_parser
-            
-            result = chain.invoke({
-                "handler_outputs": json.dumps(simplified_output, indent=2),
+            result = self._invoke("compose_answer", self.composer_prompt, self.str_parser, {
+                "handler_outputs": compact_json(simplified_output),
                 "normalized_text": normalized_text
             })
             
@@ -768,14 +973,15 @@ Return ONLY a JSON object mapping questions to their facts, no explanations."""
         return " ".join(answer_parts) if answer_parts else "I'm here to help. Could you provide more details about your question?"
     
     @traceable(name="detect_intent")
-    def detect_intent(self, question_text: str) -> str:
-        """Detect if question is about SEAT_AVAILABILITY, DATES, or OTHER using LLM."""
-        self.call_history.append(("detect_intent", question_text))
-        
+    def detect_intent(self, question_text: str, fallback: Optional[str] = "OTHER") -> Optional[str]:
+        """Detect if question is about SEAT_AVAILABILITY, DATES, or OTHER using LLM.
+
+        Returns ``fallback`` when the call fails or the reply is not a known label.
+        """
+
         try:
-            # Use Gemini for intent detection
-            chain = self.intent_detector_prompt | self.llm | self.str_parser
-            result = chain.invoke({"question_text": question_text})
+            # Three-way label task: routed to Flash by default (Settings.llm_routes)
+            result = self._invoke("detect_intent", self.intent_detector_prompt, self.str_parser, {"question_text": question_text})
             
             # Parse and validate result
             intent = result.strip().upper()
@@ -795,4 +1001,4 @@ Return ONLY a JSON object mapping questions to their facts, no explanations."""
             print(f"LLM intent detection error: {e}, using fallback logic")
         
         # Fallback: return OTHER if LLM fails
-        return "OTHER"
+        return fallback
@@ -0,0 +1,148 @@
+"""Cross-session micro-batching of small LLM requests.
+
+Under load many concurrent turns each send their own one- or two-question
+classify/categorize call. The coalescer holds the first request of a kind open
+for a short window (or until ``max_batch`` questions are pending, or no other
+request joined for a quarter of the window), issues a single batched call for
+everything collected, and hands each waiting caller the results for its own
+questions. Callers never wait past their own turn deadline.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from llm.resilience import LLMDeadlineExceeded, remaining_s
+
+
+class _Batch:
+    """Questions collected for one flush; followers wait on ``done``."""
+
+    def __init__(self):
+        self.questions: List[str] = []
+        self.seen = set()
+        self.full = threading.Event()
+        self.joined = threading.Event()
+        self.done = threading.Event()
+        self.results: Dict[str, str] = {}
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """Coalesce requests of the same kind from concurrent callers into one call.
+
+    The first caller of a window becomes the leader: it waits up to
+    ``window_ms`` (less if the batch fills or stops growing), runs ``flush`` on
+    the de-duplicated questions in its own thread (under its own deadline) and
+    publishes the results to the followers.
+    """
+
+    def __init__(self, window_ms: float = 5.0, max_batch: int = 16):
+        self.window_s = max(window_ms, 0.0) / 1000
+        self.max_batch = max(1, max_batch)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _Batch] = {}
+        self.flushes = 0
+        self.requests = 0
+
+    def submit(
+        self,
+        kind: str,
+        questions: List[str],
+        flush: Callable[[List[str]], Dict[str, str]],
+        deadline: Optional[float] = None
+    ) -> Dict[str, str]:
+        """Queue ``questions`` and block until their batch has been flushed.
+
+        Returns a mapping for the submitted questions only. Errors raised by
+        ``flush`` are re-raised in every caller of that batch. A follower whose
+        ``deadline`` passes before the flush finishes gets LLMDeadlineExceeded.
+        """
+        with self._lock:
+            self.requests += 1
+            batch = self._pending.get(kind)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._pending[kind] = batch
+            else:
+                batch.joined.set()
+            for q in questions:
+                if q not in batch.seen:
+                    batch.seen.add(q)
+                    batch.questions.append(q)
+            if len(batch.questions) >= self.max_batch:
+                # Close the batch now so later callers start a new one
+                if self._pending.get(kind) is batch:
+                    del self._pending[kind]
+                batch.full.set()
+                batch.joined.set()
+
+        if leader:
+            self._collect(batch, deadline)
+            with self._lock:
+                if self._pending.get(kind) is batch:
+                    del self._pending[kind]
+                self.flushes += 1
+            try:
+                batch.results = flush(list(batch.questions)) or {}
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        elif not batch.done.wait(remaining_s(deadline)):
+            raise LLMDeadlineExceeded(f"Turn deadline passed waiting for a coalesced {kind} call")
+
+        if batch.error is not None:
+            raise batch.error
+        return {q: batch.results[q] for q in questions if q in batch.results}
+
+    def _collect(self, batch: _Batch, deadline: Optional[float]) -> None:
+        """Hold the window open while it fills; stop early once nothing new joins for a quarter of it."""
+        end = time.monotonic() + self.window_s
+        left = remaining_s(deadline)
+        if left is not None:
+            end = min(end, time.monotonic() + max(left, 0.0))
+        quiet_s = self.window_s / 4
+        while not batch.full.is_set():
+            window_left = end - time.monotonic()
+            if window_left <= 0:
+                return
+            with self._lock:
+                batch.joined.clear()
+            if not batch.joined.wait(min(quiet_s, window_left)):
+                return
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "flushes": self.flushes}
+
+
+_COALESCER: Optional[RequestCoalescer] = None
+_COALESCER_LOCK = threading.Lock()
+
+
+def get_request_coalescer(settings: Any) -> Optional[RequestCoalescer]:
+    """Process-wide coalescer, or None when coalescing is off (window of 0 ms).
+
+    Shared by the process-wide LLMClient and its per-turn views.
+    """
+    global _COALESCER
+    if _COALESCER is None:
+        if settings.llm_coalesce_window_ms <= 0:
+            return None
+        with _COALESCER_LOCK:
+            if _COALESCER is None:
+                _COALESCER = RequestCoalescer(
+                    window_ms=settings.llm_coalesce_window_ms,
+                    max_batch=settings.llm_coalesce_max_batch
+                )
+    return _COALESCER
+
+
+def set_request_coalescer(coalescer: Optional[RequestCoalescer]) -> Optional[RequestCoalescer]:
+    """Install (or with None, reset) the shared coalescer. Returns the previous one."""
+    global _COALESCER
+    with _COALESCER_LOCK:
+        previous = _COALESCER
+        _COALESCER = coalescer
+    return previous
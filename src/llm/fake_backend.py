@@ -0,0 +1,222 @@
+"""Deterministic fake chat model for offline benchmarks and tests.
+
+The fake inspects the rendered prompt to work out which LLMClient task it is
+serving and returns canned output in the same shape Gemini would (labels for
+classify/categorize/intent, JSON for batch and extraction calls, plain text for
+composition). Latency and error rate are configurable and seeded, so a run is
+repeatable.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+
+class FakeLLMError(RuntimeError):
+    """Injected failure raised by FakeChatModel (stands in for a 5xx/429)."""
+
+
+def _label_question(question: str) -> str:
+    text = question.lower()
+    if "refund" in text or "guarantee" in text:
+        return "FORBIDDEN"
+    if len(question.strip()) < 5:
+        return "MALFORMED"
+    if any(word in text for word in ["stupid", "hate", "terrible", "useless"]):
+        return "HOSTILE"
+    return "ANSWERABLE"
+
+
+def _categorize_question(question: str) -> str:
+    text = question.lower()
+    if any(t in text for t in ["cost", "price", "pricing", "payment", "budget", "discount", "offer", "refund", "cancellation"]):
+        return "COST"
+    if any(t in text for t in ["itinerary", "day ", "schedule", "activities", "places", "weather", "snow", "about", "seat", "available", "book"]):
+        return "ITINERARY"
+    return "LOGISTICS"
+
+
+def _detect_intent(question: str) -> str:
+    text = question.lower()
+    if any(t in text for t in ["date", "when", "schedule"]):
+        return "DATES"
+    if any(t in text for t in ["seat", "book", "available", "spots"]):
+        return "SEAT_AVAILABILITY"
+    return "OTHER"
+
+
+def _numbered_questions(prompt: str) -> List[str]:
+    """Pull the '1. question' lines out of a batch prompt."""
+    match = re.search(r"Questions:\n(.*?)(?:\n\s*\n|$)", prompt, re.DOTALL)
+    if not match:
+        return []
+    questions = []
+    for line in match.group(1).splitlines():
+        item = re.match(r"\s*\d+\.\s+(.*)", line)
+        if item:
+            questions.append(item.group(1).strip())
+    return questions
+
+
+def _single_question(prompt: str) -> str:
+    match = re.search(r"Question:\s*(.*)", prompt)
+    return match.group(1).strip() if match else ""
+
+
+def _facts_for(question: str) -> List[str]:
+    return [f"Here is what our trip information says about: {question}"]
+
+
+def _indexed(questions: List[str], field: str, answer) -> str:
+    """Index-keyed batch output matching llm.schemas ({"results": [{"index": 1, field: ...}]})."""
+    return json.dumps({"results": [{"index": i + 1, field: answer(q)} for i, q in enumerate(questions)]})
+
+
+def _compose(prompt: str) -> str:
+    start = prompt.find("{", prompt.find("Handler Outputs"))
+    if start >= 0:
+        try:
+            payload, _ = json.JSONDecoder().raw_decode(prompt[start:])
+            facts = payload.get("facts", []) if isinstance(payload, dict) else []
+            if facts:
+                return " ".join(str(f) for f in facts)
+        except ValueError:
+            pass
+    return "I'm here to help. Could you provide more details about your question?"
+
+
+def canned_response(prompt: str) -> str:
+    """Return the canned completion for a rendered LLMClient prompt."""
+    if prompt.startswith("Classify each question"):
+        return _indexed(_numbered_questions(prompt), "label", _label_question)
+    if prompt.startswith("Classify the following question"):
+        return _label_question(_single_question(prompt))
+    if prompt.startswith("Categorize each question"):
+        return _indexed(_numbered_questions(prompt), "category", _categorize_question)
+    if prompt.startswith("Categorize the following question"):
+        return _categorize_question(_single_question(prompt))
+    if prompt.startswith("Determine the intent"):
+        return _detect_intent(_single_question(prompt))
+    if prompt.startswith("You are a fact extraction system"):
+        batch = _numbered_questions(prompt)
+        if batch:
+            return _indexed(batch, "facts", _facts_for)
+        return json.dumps(_facts_for(_single_question(prompt)))
+    if prompt.startswith("You are an answer planning system"):
+        return json.dumps({"answer_blocks": []})
+    if "Compose" in prompt.split("\n", 1)[0]:
+        return _compose(prompt)
+    return "OK"
+
+
+def _usage(prompt: str, text: str) -> Dict[str, int]:
+    return {
+        "input_tokens": len(prompt) // 4,
+        "output_tokens": len(text) // 4,
+        "total_tokens": len(prompt) // 4 + len(text) // 4
+    }
+
+
+class FakeChatModel(BaseChatModel):
+    """LangChain chat model returning canned output with injected latency/errors."""
+
+    model: str = "fake-model"
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    stream_chunk_chars: int = 16
+
+    _rng: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default=None)
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.latency_jitter_ms) if self.latency_jitter_ms else 0.0
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return self.latency_ms + jitter, failed
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        delay_ms, failed = self._draw()
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        if failed:
+            raise FakeLLMError(f"Injected failure from {self.model}")
+
+        text = canned_response(prompt)
+        message = AIMessage(content=text, usage_metadata=_usage(prompt, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        """Yield the canned output in small chunks, spreading the latency across them."""
+        prompt = "\n".join(str(m.content) for m in messages)
+        delay_ms, failed = self._draw()
+        if failed:
+            if delay_ms > 0:
+                time.sleep(delay_ms / 1000)
+            raise FakeLLMError(f"Injected failure from {self.model}")
+
+        text = canned_response(prompt)
+        pieces = [text[i:i + self.stream_chunk_chars] for i in range(0, len(text), self.stream_chunk_chars)] or [""]
+        for n, piece in enumerate(pieces):
+            if delay_ms > 0:
+                time.sleep(delay_ms / 1000 / len(pieces))
+            usage = _usage(prompt, text) if n == len(pieces) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+
+
+def fake_backend_factory(
+    latency_ms: float = 0.0,
+    latency_jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0
+):
+    """Build an LLMClient backend factory returning (pro, flash) fake models.
+
+    The models are built once, so the seeded latency/error sequence runs
+    across the whole benchmark, including when the shared client is rebuilt
+    after ``set_llm_backend``.
+    """
+    common = {
+        "latency_ms": latency_ms,
+        "latency_jitter_ms": latency_jitter_ms,
+        "error_rate": error_rate
+    }
+    models = (
+        FakeChatModel(model="fake-pro", seed=seed, **common),
+        FakeChatModel(model="fake-flash", seed=seed + 1, **common)
+    )
+
+    def factory(settings: Any) -> Tuple[FakeChatModel, FakeChatModel]:
+        return models
+    return factory
@@ -0,0 +1,114 @@
+"""Precompiled prompt templates, compact payloads and per-task token budgets.
+
+Templates are compiled once per process here and shared by the process-wide
+LLMClient (``get_llm_client``), its per-turn views and any client built
+directly. Payloads are serialized without
+indentation, and trip data is trimmed (extra itinerary days first, then
+highlights) until the rendered prompt fits the task's token budget
+(``Settings.prompt_token_budgets``).
+"""
+
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from llm.rate_limiter import estimate_tokens
+from llm.router import TASK_BY_METHOD
+
+# Low-priority trip data lists, trimmed from the end in this order
+TRIM_ORDER = (("itinerary", 1), ("itinerary_highlights", 0))
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or padding (non-ASCII kept as-is)."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class PromptBuilder:
+    """Compiled templates plus budget-aware rendering of trip data."""
+
+    def __init__(self, templates: Dict[str, str], budgets: Optional[Dict[str, int]] = None):
+        from langchain_core.prompts import ChatPromptTemplate
+
+        self.templates = {name: ChatPromptTemplate.from_template(text) for name, text in templates.items()}
+        # Template text without its variables, counted against every budget
+        self._overhead = {name: estimate_tokens(text) for name, text in templates.items()}
+        self.budgets = dict(budgets or {})
+
+    def get(self, name: str):
+        return self.templates[name]
+
+    def budget(self, method: str) -> Optional[int]:
+        """Input token budget for ``method`` (looked up by task, then method name)."""
+        return self.budgets.get(TASK_BY_METHOD.get(method, method), self.budgets.get(method))
+
+    def trip_data(self, method: str, template: str, trip_data: Dict[str, Any], other_text: str = "") -> str:
+        """Compact JSON for ``trip_data``, trimmed to fit the method's budget.
+
+        ``other_text`` is the rest of the variable input (e.g. the questions),
+        counted against the budget alongside the template itself.
+        """
+        text = compact_json(trip_data)
+        budget = self.budget(method)
+        if not budget:
+            return text
+        available = budget - self._overhead.get(template, 0) - (estimate_tokens(other_text) if other_text else 0)
+        if estimate_tokens(text) <= available:
+            return text
+
+        trimmed = dict(trip_data)
+        for key, keep in TRIM_ORDER:
+            items = trimmed.get(key)
+            if not isinstance(items, list) or len(items) <= keep:
+                continue
+            # Drop whole entries from the end until the payload fits
+            items = list(items)
+            while len(items) > keep:
+                items.pop()
+                trimmed[key] = items
+                text = compact_json(trimmed)
+                if estimate_tokens(text) <= available:
+                    return text
+        return text
+
+    def estimate(self, prompt_value: Any) -> int:
+        """Estimated input tokens of a rendered prompt."""
+        return estimate_tokens(prompt_value.to_string())
+
+
+_BUILDER: Optional[PromptBuilder] = None
+_BUILDER_LOCK = threading.Lock()
+
+
+def get_prompt_builder(settings: Any = None) -> PromptBuilder:
+    """Process-wide PromptBuilder over the llm.prompts templates."""
+    global _BUILDER
+    if _BUILDER is None:
+        with _BUILDER_LOCK:
+            if _BUILDER is None:
+                from llm import prompts
+
+                if settings is None:
+                    from app.settings import Settings
+                    settings = Settings()
+                templates = {
+                    "classifier": prompts.CLASSIFIER_PROMPT,
+                    "planner": prompts.PLANNER_PROMPT,
+                    "composer": prompts.COMPOSER_PROMPT,
+                    "categorizer": prompts.CATEGORIZER_PROMPT,
+                    "extractor": prompts.EXTRACTOR_PROMPT,
+                    "intent_detector": prompts.INTENT_DETECTOR_PROMPT,
+                    "batch_classifier": prompts.BATCH_CLASSIFIER_PROMPT,
+                    "batch_categorizer": prompts.BATCH_CATEGORIZER_PROMPT,
+                    "batch_extractor": prompts.BATCH_EXTRACTOR_PROMPT,
+                }
+                _BUILDER = PromptBuilder(templates, settings.prompt_token_budgets)
+    return _BUILDER
+
+
+def set_prompt_builder(builder: Optional[PromptBuilder]) -> Optional[PromptBuilder]:
+    """Replace the shared builder (None rebuilds from Settings on next use); returns the previous one."""
+    global _BUILDER
+    previous = _BUILDER
+    _BUILDER = builder
+    return previous
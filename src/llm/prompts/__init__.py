@@ -85,4 +85,61 @@ Intent Categories:
 
 Return ONLY the intent category (one of: SEAT_AVAILABILITY, DATES, OTHER). No explanation, just the word."""
 
-__all__ = ["CLASSIFIER_PROMPT", "PLANNER_PROMPT", "COMPOSER_PROMPT", "CATEGORIZER_PROMPT", "EXTRACTOR_PROMPT", "INTENT_DETECTOR_PROMPT"]
+BATCH_CLASSIFIER_PROMPT = _load_prompt("batch_classifier.txt") or """Classify each question into EXACTLY ONE of these categories: ANSWERABLE, FORBIDDEN, MALFORMED, HOSTILE.
+
+Rules:
+- ANSWERABLE: Questions we can answer with our trip information (e.g., pickup details, itinerary, pricing for trips, weather conditions, snowfall expectations)
+- FORBIDDEN: Questions about refunds, guarantees about policies/terms, or promises we cannot make (must redirect). Note: Questions about weather/conditions are ANSWERABLE even if they use words like "definitely" - we can answer with available information.
+- MALFORMED: Questions that are too short, unclear, or nonsensical (less than 5 characters or no clear meaning)
+- HOSTILE: Questions with hostile, offensive, or inappropriate language
+
+Questions:
+{questions_text}
+
+Return ONLY a JSON object with one result per question number.
+Format: {{"results": [{{"index": 1, "label": "ANSWERABLE"}}, {{"index": 2, "label": "FORBIDDEN"}}]}}"""
+
+BATCH_CATEGORIZER_PROMPT = _load_prompt("batch_categorizer.txt") or """Categorize each question into EXACTLY ONE of these categories: LOGISTICS, COST, ITINERARY, POLICY.
+
+Rules:
+- LOGISTICS: Questions about pickup points, transportation, accommodation, hotels, travel arrangements, meeting points, departure/arrival details
+- COST: Questions about pricing, costs, fees, payment, budget, expenses, total price, per person cost
+- ITINERARY: Questions about schedule, daily activities, what to do each day, places to visit, sightseeing, day-by-day plan, duration
+- POLICY: Questions about refund policies, cancellation policies, terms and conditions (though these may be classified as FORBIDDEN earlier)
+
+Questions:
+{questions_text}
+
+Return ONLY a JSON object with one result per question number.
+Format: {{"results": [{{"index": 1, "category": "LOGISTICS"}}, {{"index": 2, "category": "COST"}}]}}"""
+
+BATCH_EXTRACTOR_PROMPT = _load_prompt("batch_extractor.txt") or """You are a fact extraction system for a travel booking assistant.
+
+Questions:
+{questions_text}
+
+Trip Data (JSON):
+{trip_data}
+
+Instructions:
+- Extract relevant facts from the trip data for EACH question
+- Return one result per question number with that question's facts
+- Each fact should be a complete, standalone statement
+- If a question asks about something not in trip data, return an empty array for that question
+- Do not make up information not present in trip data
+- Be specific and accurate
+- Use natural language for facts (not just raw data values)
+
+Common fields to look for:
+- Duration: Check "duration" object (days/nights)
+- Accommodation: Check "accommodation" object (stays, room_sharing, type)
+- Pickup/Meeting point: Check "logistics" object (meeting_point, pickup)
+- Itinerary: Check "itinerary" array
+- Pricing: Check "pricing" object
+- Meals/Food: Check "inclusions" and "exclusions" arrays, and "itinerary" activities for meal mentions
+
+Return ONLY a JSON object, no explanations.
+Format: {{"results": [{{"index": 1, "facts": ["fact1", "fact2"]}}, {{"index": 2, "facts": []}}]}}"""
+
+__all__ = ["CLASSIFIER_PROMPT", "PLANNER_PROMPT", "COMPOSER_PROMPT", "CATEGORIZER_PROMPT", "EXTRACTOR_PROMPT", "INTENT_DETECTOR_PROMPT",
+           "BATCH_CLASSIFIER_PROMPT", "BATCH_CATEGORIZER_PROMPT", "BATCH_EXTRACTOR_PROMPT"]
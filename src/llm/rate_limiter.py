@@ -0,0 +1,176 @@
+"""Client-side rate limiting and priority scheduling for LLM calls.
+
+Every conversation shares one Gemini quota. Each configured model gets a
+requests/min and a tokens/min token bucket; callers queue per model and are
+served in priority order (classification before extraction before
+composition, shorter prompts first within a class) as soon as both buckets
+can cover the request. The time spent queued is returned so it can be
+recorded in the call ledger.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Lower runs first. Cheap routing calls gate the whole turn, composition runs last.
+TASK_PRIORITY = {
+    "classify_question": 0,
+    "classify_questions_batch": 0,
+    "categorize_question": 0,
+    "categorize_questions_batch": 0,
+    "detect_intent": 0,
+    "extract_facts": 1,
+    "extract_facts_batch": 1,
+    "plan_answer": 1,
+    "compose_answer": 2,
+}
+DEFAULT_PRIORITY = 1
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when a call cannot be scheduled within its timeout."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Continuously refilling bucket. Not thread-safe; LLMScheduler holds the lock."""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)."""
+        self._refill(now)
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Correct an earlier estimate; the bucket may go into debt."""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class ModelRateLimit:
+    """Requests/min and (optional) tokens/min budget for one model."""
+
+    def __init__(self, rpm: int, tpm: int = 0):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        waits = [0.0]
+        if self.requests:
+            waits.append(self.requests.wait_time(1, now))
+        if self.tokens:
+            waits.append(self.tokens.wait_time(tokens, now))
+        return max(waits)
+
+    def take(self, tokens: int) -> None:
+        if self.requests:
+            self.requests.take(1)
+        if self.tokens:
+            self.tokens.take(tokens)
+
+
+class LLMScheduler:
+    """Per-model priority queues in front of the token buckets.
+
+    ``limits`` maps a model name to ``{"rpm": ..., "tpm": ...}``; models without
+    an entry are not limited.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, int]]):
+        self._limits = {
+            model: ModelRateLimit(int(cfg.get("rpm", 0)), int(cfg.get("tpm", 0)))
+            for model, cfg in (limits or {}).items()
+        }
+        self._cond = threading.Condition()
+        self._queues: Dict[str, List[Any]] = {}
+        self._seq = itertools.count()
+
+    def acquire(self, model: str, method: str, est_tokens: int, timeout: Optional[float] = None) -> float:
+        """Block until ``model`` has budget for this call; returns the queue wait in ms."""
+        limit = self._limits.get(model)
+        if limit is None:
+            return 0.0
+
+        start = time.monotonic()
+        entry = (TASK_PRIORITY.get(method, DEFAULT_PRIORITY), est_tokens, next(self._seq))
+        with self._cond:
+            queue = self._queues.setdefault(model, [])
+            heapq.heappush(queue, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if queue[0] == entry:
+                        wait = limit.wait_time(est_tokens, now)
+                        if wait <= 0:
+                            limit.take(est_tokens)
+                            return (now - start) * 1000
+                    if timeout is not None:
+                        remaining = start + timeout - now
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"No {model} capacity for {method} within {timeout:.2f}s")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                queue.remove(entry)
+                heapq.heapify(queue)
+                self._cond.notify_all()
+
+    def settle(self, model: str, est_tokens: int, actual_tokens: int) -> None:
+        """Charge the difference between the estimate and the reported usage."""
+        limit = self._limits.get(model)
+        if limit is None or not limit.tokens or not actual_tokens:
+            return
+        with self._cond:
+            limit.tokens.adjust(actual_tokens - est_tokens)
+            self._cond.notify_all()
+
+    def queue_depth(self, model: str) -> int:
+        with self._cond:
+            return len(self._queues.get(model, []))
+
+
+_SCHEDULER: Optional[LLMScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_llm_scheduler(settings: Any) -> Optional[LLMScheduler]:
+    """Process-wide scheduler built from Settings.llm_rate_limits (None when empty)."""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        if not settings.llm_rate_limits:
+            return None
+        with _SCHEDULER_LOCK:
+            if _SCHEDULER is None:
+                _SCHEDULER = LLMScheduler(settings.llm_rate_limits)
+    return _SCHEDULER
+
+
+def set_llm_scheduler(scheduler: Optional[LLMScheduler]) -> Optional[LLMScheduler]:
+    """Install (or with None, reset) the shared scheduler. Returns the previous one."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        previous = _SCHEDULER
+        _SCHEDULER = scheduler
+    return previous
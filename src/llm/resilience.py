@@ -0,0 +1,177 @@
+"""Retries, per-turn deadlines and hedged requests for LLM calls.
+
+A turn gets an absolute deadline (``turn_deadline`` in graph state, epoch
+seconds). LLM calls retry transient errors (429/5xx/timeouts) with full-jitter
+exponential backoff only while that budget remains, each attempt is abandoned
+once the deadline passes, and latency-critical calls can send one duplicate
+request once the primary is slower than the method's recent p95.
+"""
+
+import contextvars
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+# Error class names / message fragments that indicate a retryable failure
+TRANSIENT_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "TimeoutError", "ConnectionError",
+    "RemoteDisconnected", "FakeLLMError",
+}
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Status codes / gRPC status names as error messages spell them ("429 Resource has been exhausted",
+# "status code: 503", "RESOURCE_EXHAUSTED"), not any digits or words that happen to appear
+TRANSIENT_MESSAGE_PATTERN = re.compile(
+    r"^\s*(408|429|500|502|503|504)\b"
+    r"|\b(status|code|http|error)[\s_:=]*(code[\s:=]*)?(408|429|500|502|503|504)\b"
+    r"|\b(RESOURCE_EXHAUSTED|UNAVAILABLE|DEADLINE_EXCEEDED)\b"
+    r"|\b(timed out|read timeout|connect timeout)\b",
+    re.IGNORECASE
+)
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The turn's latency budget ran out before the LLM call could complete."""
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of an API error (``status_code`` / ``code`` as on google.api_core errors)."""
+    for attr in ("status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for rate-limit, server-side and network errors worth retrying.
+
+    Decided by exception type, then status code, then a status spelled out in
+    the message; the error it was raised from (``__cause__``) is checked too.
+    """
+    if isinstance(error, LLMDeadlineExceeded):
+        return False
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if type(error).__name__ in TRANSIENT_ERROR_NAMES:
+            return True
+        status = _status_code(error)
+        if status is not None:
+            return status in TRANSIENT_STATUS_CODES
+        if TRANSIENT_MESSAGE_PATTERN.search(str(error)):
+            return True
+        error = error.__cause__
+    return False
+
+
+def remaining_s(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until ``deadline`` (epoch seconds), or None for no deadline."""
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+class RetryPolicy:
+    """Full-jitter exponential backoff bounded by attempts and the turn deadline."""
+
+    def __init__(self, max_retries: int = 2, base_ms: float = 200.0, max_ms: float = 2000.0, rng: Optional[random.Random] = None):
+        self.max_retries = max_retries
+        self.base_ms = base_ms
+        self.max_ms = max_ms
+        self.rng = rng or random.Random()
+
+    def backoff(self, attempt: int, error: BaseException, deadline: Optional[float] = None) -> Optional[float]:
+        """Seconds to sleep before retry ``attempt + 1``, or None to give up."""
+        if attempt >= self.max_retries or not is_transient(error):
+            return None
+        delay = self.rng.uniform(0, min(self.max_ms, self.base_ms * (2 ** attempt))) / 1000
+        left = remaining_s(deadline)
+        if left is not None and delay >= left:
+            return None
+        return delay
+
+
+_CALL_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_CALL_EXECUTOR_LOCK = threading.Lock()
+
+
+def _call_executor() -> ThreadPoolExecutor:
+    """Pool for deadline-bounded and hedged calls (``Settings.llm_call_threads`` threads).
+
+    Each in-flight call holds a thread, so the pool is sized for every
+    concurrent turn's calls plus their duplicates; idle threads cost nothing.
+    """
+    global _CALL_EXECUTOR
+    if _CALL_EXECUTOR is None:
+        with _CALL_EXECUTOR_LOCK:
+            if _CALL_EXECUTOR is None:
+                from app.settings import Settings
+                _CALL_EXECUTOR = ThreadPoolExecutor(max_workers=Settings().llm_call_threads, thread_name_prefix="llm-call")
+    return _CALL_EXECUTOR
+
+
+def bounded_call(fn: Callable[[], Any], deadline: Optional[float] = None) -> Any:
+    """Run ``fn``, raising LLMDeadlineExceeded if it has not returned by ``deadline``.
+
+    Without a deadline ``fn`` runs on the calling thread. Otherwise it runs on
+    the shared pool in a copy of the caller's context; an abandoned call
+    finishes in the background.
+    """
+    left = remaining_s(deadline)
+    if left is None:
+        return fn()
+    if left <= 0:
+        raise LLMDeadlineExceeded("Turn deadline passed before the LLM call")
+    future = _call_executor().submit(contextvars.copy_context().run, fn)
+    done, _ = wait({future}, timeout=left)
+    if not done:
+        raise LLMDeadlineExceeded("Turn deadline passed while waiting for LLM response")
+    return future.result()
+
+
+def hedged_call(fn: Callable[[], Any], hedge_after_s: float, deadline: Optional[float] = None) -> Any:
+    """Run ``fn``; if it has not finished after ``hedge_after_s`` start one duplicate.
+
+    Returns the first successful result. If both fail the last error is raised;
+    if the deadline passes first LLMDeadlineExceeded is raised (the abandoned
+    calls finish in the background). Each call runs in a copy of the caller's
+    context, so its spans land on the current turn's trace. The hedge delay
+    counts from when the primary starts running, not from when it was queued.
+    """
+    executor = _call_executor()
+    started = threading.Event()
+
+    def primary() -> Any:
+        started.set()
+        return fn()
+
+    pending = {executor.submit(contextvars.copy_context().run, primary)}
+    if not started.wait(remaining_s(deadline)):
+        raise LLMDeadlineExceeded("Turn deadline passed before the LLM call started")
+    hedged = False
+    error = None
+    while pending:
+        left = remaining_s(deadline)
+        if left is not None and left <= 0:
+            raise LLMDeadlineExceeded("Turn deadline passed while waiting for LLM response")
+        timeout = left
+        if not hedged:
+            timeout = hedge_after_s if left is None else min(hedge_after_s, left)
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+        if error is not None and not pending:
+            # Failures are left to the retry policy, not hedged
+            raise error
+        if not hedged:
+            # Primary is slower than the threshold: fire the duplicate once
+            pending.add(executor.submit(contextvars.copy_context().run, fn))
+            hedged = True
+    raise error
@@ -0,0 +1,217 @@
+"""Declarative per-task model routing for LLMClient.
+
+``Settings.llm_routes`` maps a task (classify, categorize, intent, extract,
+plan, compose) to weighted model tiers, an optional failover tier and an
+optional latency ceiling, e.g.::
+
+    {"extract": {"models": {"pro": 0.9, "flash": 0.1}, "failover": "secondary", "max_p95_ms": 4000}}
+
+Weights give A/B splits between tiers. Each tier's recent p95 and error rate
+for the task come from the call ledger; failed calls count as infinitely slow,
+so a tier that fails fast never looks fast. When the picked tier's error rate
+is above ``max_error_rate`` (per route, else the router default) or its p95 is
+above ``max_p95_ms``, the fastest other tier within the error ceiling is used
+instead. Every decision is kept in a bounded log and tagged onto the call's
+ledger record.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+TASK_BY_METHOD = {
+    "classify_question": "classify",
+    "classify_questions_batch": "classify",
+    "categorize_question": "categorize",
+    "categorize_questions_batch": "categorize",
+    "detect_intent": "intent",
+    "extract_facts": "extract",
+    "extract_facts_batch": "extract",
+    "plan_answer": "plan",
+    "compose_answer": "compose",
+}
+
+
+@dataclass
+class RouteDecision:
+    """Why one call went to the model it did."""
+    task: str
+    method: str
+    tier: str
+    reason: str
+    failover: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class TierStats(NamedTuple):
+    """Recent ledger view of one model on one task."""
+    p95_ms: float
+    error_rate: float
+    samples: int
+
+
+def model_name(llm: Any) -> str:
+    """Best-effort model name for a LangChain chat model."""
+    name = getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__
+    return str(name).replace("models/", "")
+
+
+class ModelRouter:
+    """Picks a model tier per call from the routing table."""
+
+    def __init__(
+        self,
+        routes: Dict[str, Dict[str, Any]],
+        ledger: Any = None,
+        min_samples: int = 20,
+        max_decisions: int = 500,
+        seed: Optional[int] = None,
+        max_error_rate: Optional[float] = 0.25,
+        stats_ttl_s: float = 1.0
+    ):
+        self.routes = routes or {}
+        self.ledger = ledger
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.stats_ttl_s = stats_ttl_s
+        # (task, model) -> (computed_at, stats); the ledger is scanned at most once per TTL
+        self._stats: Dict[Tuple[str, str], Tuple[float, Optional[TierStats]]] = {}
+        self._decisions = deque(maxlen=max(1, max_decisions))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def route(self, method: str, tiers: Dict[str, Any]) -> Tuple[Any, Any, RouteDecision]:
+        """Return (model, failover model or None, decision) for one call.
+
+        ``tiers`` maps tier names ("pro", "flash", "secondary") to chat models.
+        """
+        task = TASK_BY_METHOD.get(method, method)
+        route = self.routes.get(task) or {}
+        weights = {
+            tier: float(weight)
+            for tier, weight in (route.get("models") or {}).items()
+            if tiers.get(tier) is not None and float(weight) > 0
+        }
+
+        if not weights:
+            tier, reason = "pro", "default"
+        elif len(weights) == 1:
+            tier, reason = next(iter(weights)), "static"
+        else:
+            tier, reason = self._weighted_pick(weights), "split"
+
+        max_p95 = route.get("max_p95_ms")
+        max_errors = route.get("max_error_rate", self.max_error_rate)
+        stats = self._tier_stats(task, tiers[tier]) if len(weights) > 1 else None
+        if stats is not None:
+            unhealthy = None
+            if max_errors is not None and stats.error_rate > max_errors:
+                unhealthy = f"errors ({stats.error_rate:.0%} > {max_errors:.0%})"
+            elif max_p95 and stats.p95_ms > max_p95:
+                unhealthy = f"latency ({stats.p95_ms:.0f}ms > {max_p95:.0f}ms)"
+            if unhealthy:
+                alternatives = []
+                for t in weights:
+                    if t == tier:
+                        continue
+                    alt = self._tier_stats(task, tiers[t])
+                    if alt is None:
+                        # Untried tiers count as fast so they get sampled
+                        alternatives.append((0.0, t))
+                    elif max_errors is None or alt.error_rate <= max_errors:
+                        alternatives.append((alt.p95_ms, t))
+                alternatives.sort()
+                if alternatives and alternatives[0][0] < stats.p95_ms:
+                    tier = alternatives[0][1]
+                    reason = unhealthy
+
+        failover_tier = route.get("failover")
+        failover = tiers.get(failover_tier) if failover_tier else None
+        if failover is tiers[tier]:
+            failover = None
+
+        decision = RouteDecision(task=task, method=method, tier=tier, reason=reason,
+                                 failover=failover_tier if failover is not None else None)
+        with self._lock:
+            self._decisions.append(decision)
+        return tiers[tier], failover, decision
+
+    def _weighted_pick(self, weights: Dict[str, float]) -> str:
+        with self._lock:
+            point = self._rng.uniform(0, sum(weights.values()))
+        for tier, weight in weights.items():
+            point -= weight
+            if point <= 0:
+                return tier
+        return tier
+
+    def _tier_stats(self, task: str, llm: Any) -> Optional[TierStats]:
+        """Recent p95 (errors count as infinitely slow) and error rate of ``llm`` on ``task``.
+
+        None until ``min_samples`` calls are in the ledger. Cached for ``stats_ttl_s``.
+        """
+        if self.ledger is None:
+            return None
+        key = (task, model_name(llm))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._stats.get(key)
+        if cached is not None and now - cached[0] < self.stats_ttl_s:
+            return cached[1]
+        latencies = []
+        errors = 0
+        for r in self.ledger.records():
+            if r.model == key[1] and TASK_BY_METHOD.get(r.method) == task:
+                if r.error:
+                    errors += 1
+                else:
+                    latencies.append(r.latency_ms)
+        samples = len(latencies) + errors
+        stats = None
+        if samples >= self.min_samples:
+            ordered = sorted(latencies) + [float("inf")] * errors
+            stats = TierStats(ordered[int(0.95 * (samples - 1))], errors / samples, samples)
+        with self._lock:
+            self._stats[key] = (now, stats)
+        return stats
+
+    def decisions(self, task: Optional[str] = None) -> List[RouteDecision]:
+        with self._lock:
+            items = list(self._decisions)
+        if task:
+            items = [d for d in items if d.task == task]
+        return items
+
+
+_ROUTER: Optional[ModelRouter] = None
+_ROUTER_LOCK = threading.Lock()
+
+
+def get_model_router(settings: Any, ledger: Any = None) -> ModelRouter:
+    """Process-wide router built from Settings.llm_routes."""
+    global _ROUTER
+    if _ROUTER is None:
+        with _ROUTER_LOCK:
+            if _ROUTER is None:
+                _ROUTER = ModelRouter(
+                    settings.llm_routes,
+                    ledger=ledger,
+                    min_samples=settings.llm_routing_min_samples,
+                    max_error_rate=settings.llm_routing_max_error_rate
+                )
+    return _ROUTER
+
+
+def set_model_router(router: Optional[ModelRouter]) -> Optional[ModelRouter]:
+    """Install (or with None, reset) the shared router. Returns the previous one."""
+    global _ROUTER
+    with _ROUTER_LOCK:
+        previous = _ROUTER
+        _ROUTER = router
+    return previous
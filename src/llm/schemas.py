@@ -0,0 +1,96 @@
+"""Structured-output schemas for batched LLM calls.
+
+Batch prompts number their questions and the model answers with one entry per
+question index, so results map back by position instead of by fuzzy matching
+question text. The same pydantic models supply the JSON schema passed to the
+model (schema-constrained generation) and validate the response in one parse.
+"""
+
+from typing import Any, Dict, List, Literal, Type
+
+from pydantic import BaseModel, ValidationError
+
+QuestionLabel = Literal["ANSWERABLE", "FORBIDDEN", "MALFORMED", "HOSTILE"]
+QuestionCategoryLabel = Literal["LOGISTICS", "COST", "ITINERARY", "POLICY"]
+
+
+class ClassificationItem(BaseModel):
+    index: int
+    label: QuestionLabel
+
+
+class ClassificationBatch(BaseModel):
+    results: List[ClassificationItem]
+
+
+class CategoryItem(BaseModel):
+    index: int
+    category: QuestionCategoryLabel
+
+
+class CategoryBatch(BaseModel):
+    results: List[CategoryItem]
+
+
+class FactsItem(BaseModel):
+    index: int
+    facts: List[str]
+
+
+class FactsBatch(BaseModel):
+    results: List[FactsItem]
+
+
+class StructuredOutputError(ValueError):
+    """The model response did not match the requested schema."""
+
+
+def message_text(message: Any) -> str:
+    """Plain text of a chat message (Gemini may return a list of content parts)."""
+    content = getattr(message, "content", message)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+class SchemaParser:
+    """Output parser that requests and validates a pydantic schema.
+
+    ``model_kwargs`` are passed to the chat model call so Gemini constrains
+    generation to the schema; ``invoke`` validates the response in one pass.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self.model_kwargs = {
+            "response_mime_type": "application/json",
+            "response_schema": schema.model_json_schema(),
+        }
+
+    def invoke(self, message: Any) -> BaseModel:
+        text = message_text(message).strip()
+        # Tolerate a fenced block from models that ignore the mime type
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("\n") + 1:] if "\n" in text else text
+        try:
+            return self.schema.model_validate_json(text)
+        except ValidationError as e:
+            raise StructuredOutputError(f"{self.schema.__name__} validation failed: {e.error_count()} errors") from e
+
+
+def by_index(questions: List[str], items: List[Any], field: str) -> Dict[str, Any]:
+    """Map 1-based ``index`` entries back to their questions (out-of-range indexes are ignored)."""
+    results = {}
+    for item in items:
+        if 1 <= item.index <= len(questions):
+            results[questions[item.index - 1]] = getattr(item, field)
+    return results
+
+
+def numbered(questions: List[str]) -> str:
+    """'1. question' lines used by every batch prompt."""
+    return "\n".join(f"{i + 1}. {q}" for i, q in enumerate(questions))
+
@@ -0,0 +1,89 @@
+"""Incremental JSON parsing of streamed batch results.
+
+Batch extraction answers ``{"results": [{"index": 1, "facts": [...]}, ...]}``.
+Rather than waiting for the whole object, ``ResultsStreamParser`` is fed the
+model's text chunks and returns each ``results`` element as soon as its
+closing brace arrives, so callers can act on early questions while later ones
+are still being generated.
+"""
+
+import json
+import re
+from typing import Any, List
+
+
+class ResultsStreamParser:
+    """Yield complete elements of the top-level ``key`` array from streamed JSON text.
+
+    Only object/array elements are emitted (the batch schemas never put bare
+    scalars in ``results``). Malformed elements are skipped; the full response
+    is still validated once the stream ends.
+    """
+
+    def __init__(self, key: str = "results"):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._text = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk of text; return the elements completed by it."""
+        if self._done or not chunk:
+            return []
+        self._text += chunk
+        if not self._in_array:
+            match = self._key_pattern.search(self._text)
+            if not match:
+                return []
+            self._in_array = True
+            self._pos = match.end()
+
+        items = []
+        text = self._text
+        i = self._pos
+        while i < len(text):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c in "{[":
+                if self._depth == 0:
+                    self._item_start = i
+                self._depth += 1
+            elif c in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the results array itself
+                    self._done = True
+                    i += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0 and self._item_start is not None:
+                    try:
+                        items.append(json.loads(text[self._item_start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+            i += 1
+
+        # Drop consumed text so long streams stay linear
+        keep_from = self._item_start if self._item_start is not None else i
+        self._text = text[keep_from:]
+        if self._item_start is not None:
+            self._item_start = 0
+        self._pos = i - keep_from
+        return items
+
+    @property
+    def done(self) -> bool:
+        return self._done
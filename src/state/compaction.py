@@ -0,0 +1,193 @@
+"""Conversation history compaction: cap raw messages, fold older ones into a rolling summary.
+
+``history:{session_id}`` keeps at most ``history_max_messages`` raw messages.
+Once a session passes that, the oldest messages (all but the last
+``history_keep_messages``) are folded into ``summary:{session_id}``:
+
+    {
+        "messages_folded": 42,
+        "first_timestamp": "...", "last_timestamp": "...",
+        "topics": {"kashmir": 5, "spiti": 1},        # user messages per topic
+        "trips": ["kashmir_zo_trip_TR-4Q7QMQQJ"],     # in order first mentioned
+        "open_questions": ["..."],                     # last few deferred user questions
+        "updated_at": "..."
+    }
+
+Folding runs on a background thread, so a turn only pays for an enqueue.
+"""
+
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_OPEN_QUESTIONS = 5
+
+# Assistant replies that leave the user's question open (handed to the team, not answered)
+DEFERRAL_MARKERS = (
+    "get back to you",
+    "our team will",
+    "team will reach out",
+    "let me check",
+    "will confirm",
+    "don't have that information",
+    "do not have that information",
+)
+
+
+def empty_summary() -> Dict[str, Any]:
+    return {
+        "messages_folded": 0,
+        "first_timestamp": None,
+        "last_timestamp": None,
+        "topics": {},
+        "trips": [],
+        "open_questions": [],
+        "updated_at": None,
+    }
+
+
+def _mentioned_trip(text: str, trip_index: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Best keyword match for one message (same scoring as resolve_trip_context); None on a tie."""
+    scores = {}
+    for trip_id, entry in trip_index.items():
+        score = sum(2 if len(keyword.split()) > 1 else 1 for keyword in entry["keywords"] if keyword in text)
+        if score:
+            scores[trip_id] = score
+    if not scores:
+        return None
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if len(ranked) > 1 and ranked[0][1] == ranked[1][1]:
+        return None
+    return ranked[0][0]
+
+
+def fold_messages(summary: Dict[str, Any], messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """New summary with ``messages`` (oldest first) folded into ``summary``."""
+    from graph.nodes.non_skippable.resolve_trip_context import get_trip_keyword_index
+    from state.memory import trip_id_to_topic
+
+    trip_index = get_trip_keyword_index()
+    folded = {
+        **summary,
+        "topics": dict(summary.get("topics") or {}),
+        "trips": list(summary.get("trips") or []),
+        "open_questions": list(summary.get("open_questions") or []),
+    }
+    for position, message in enumerate(messages):
+        content = message.get("content") or ""
+        if message.get("timestamp"):
+            folded["first_timestamp"] = folded.get("first_timestamp") or message["timestamp"]
+            folded["last_timestamp"] = message["timestamp"]
+        if message.get("role") != "user" or not content:
+            continue
+        trip_id = _mentioned_trip(content.lower(), trip_index)
+        if trip_id:
+            topic = trip_id_to_topic(trip_id) or trip_id
+            folded["topics"][topic] = folded["topics"].get(topic, 0) + 1
+            if trip_id not in folded["trips"]:
+                folded["trips"].append(trip_id)
+        if "?" in content:
+            reply = next((m for m in messages[position + 1:] if m.get("role") == "assistant"), None)
+            reply_text = (reply.get("content") or "").lower() if reply else ""
+            if reply is None or any(marker in reply_text for marker in DEFERRAL_MARKERS):
+                folded["open_questions"] = (folded["open_questions"] + [content])[-MAX_OPEN_QUESTIONS:]
+    folded["messages_folded"] = (summary.get("messages_folded") or 0) + len(messages)
+    folded["updated_at"] = datetime.utcnow().isoformat() + "Z"
+    return folded
+
+
+class HistoryCompactor:
+    """Folds sessions whose history passed ``max_messages``, keeping the last ``keep_messages`` raw.
+
+    ``schedule`` enqueues a session for the worker thread; with
+    ``background=False`` it compacts inline (tests, scripts).
+    """
+
+    def __init__(self, max_messages: int = 40, keep_messages: int = 20, background: bool = True):
+        self.max_messages = max_messages
+        self.keep_messages = max(0, min(keep_messages, max_messages))
+        self.background = background
+        self.compactions = 0
+        self.errors = 0
+        self._queue: "queue.Queue[Tuple[Any, str]]" = queue.Queue()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def needs_compaction(self, message_count: int) -> bool:
+        return self.max_messages > 0 and message_count > self.max_messages
+
+    def schedule(self, memory: Any, session_id: str) -> None:
+        if not self.background:
+            self.compact(memory, session_id)
+            return
+        with self._lock:
+            if session_id in self._queued:
+                return
+            self._queued.add(session_id)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="history-compactor", daemon=True)
+                self._worker.start()
+        self._queue.put((memory, session_id))
+
+    def compact(self, memory: Any, session_id: str) -> int:
+        """Fold the session's overflow into its summary; returns the number of messages folded."""
+        history = memory.get_history(session_id)
+        if not self.needs_compaction(len(history)):
+            return 0
+        overflow = len(history) - self.keep_messages
+        # Never fold a user message without the reply that follows it
+        while overflow > 0 and history[overflow - 1].get("role") == "user":
+            overflow -= 1
+        if overflow <= 0:
+            return 0
+        folded = history[:overflow]
+        summary = fold_messages(memory.get_history_summary(session_id) or empty_summary(), folded)
+        if not memory.replace_history_head(session_id, folded, summary):
+            # History was rewritten meanwhile (e.g. cleared); try again on the next append
+            return 0
+        self.compactions += 1
+        return len(folded)
+
+    def join(self) -> None:
+        """Wait until every scheduled session has been compacted."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            memory, session_id = self._queue.get()
+            with self._lock:
+                self._queued.discard(session_id)
+            try:
+                self.compact(memory, session_id)
+            except Exception as e:
+                self.errors += 1
+                print(f"History compaction error ({session_id}): {e}")
+            finally:
+                self._queue.task_done()
+
+
+_COMPACTOR: Optional[HistoryCompactor] = None
+_COMPACTOR_LOCK = threading.Lock()
+
+
+def get_history_compactor() -> HistoryCompactor:
+    """Process-wide compactor (``Settings.history_max_messages`` / ``history_keep_messages``)."""
+    global _COMPACTOR
+    if _COMPACTOR is None:
+        with _COMPACTOR_LOCK:
+            if _COMPACTOR is None:
+                from app.settings import Settings
+                settings = Settings()
+                _COMPACTOR = HistoryCompactor(settings.history_max_messages, settings.history_keep_messages)
+    return _COMPACTOR
+
+
+def set_history_compactor(compactor: Optional[HistoryCompactor]) -> Optional[HistoryCompactor]:
+    """Replace the shared compactor (None rebuilds it on next use); returns the previous one."""
+    global _COMPACTOR
+    with _COMPACTOR_LOCK:
+        previous = _COMPACTOR
+        _COMPACTOR = compactor
+    return previous
@@ -1,43 +1,62 @@
 # Conversation memory helpers
+import threading
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, Any, Optional, List
-from domain.trips.loader import get_all_trips
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Tuple
+from domain.trips.catalog import get_trip_catalog, trip_topic
+from state.compaction import get_history_compactor
+
+# A lead is booking_ready once its questions kept being answered on the same trip
+# for this many turns after the one that first focused it
+BOOKING_READY_TURNS = 2
 
 
 def _extract_topic_from_trip_id(trip_id: str) -> Optional[str]:
     """Extract topic name from trip_id (e.g., 'kashmir_zo_trip_TR-4Q7QMQQJ' -> 'kashmir')."""
-    # Pattern: {topic}_zo_trip_TR-{code}
-    if '_zo_trip_' in trip_id:
-        topic = trip_id.split('_zo_trip_')[0]
-        return topic
-    return None
+    return trip_topic(trip_id)
+
+
+def _message_ts(message: Dict[str, Any]) -> float:
+    """Epoch seconds of a message; parsed once from ``timestamp`` for messages stored without ``ts``.
+
+    Messages without a usable timestamp sort before everything (-inf).
+    """
+    ts = message.get("ts")
+    if ts is None:
+        try:
+            parsed = datetime.fromisoformat(message["timestamp"].replace("Z", "+00:00"))
+            # Explicit offsets are honoured; only naive timestamps are taken as UTC
+            ts = (parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp()
+        except (KeyError, ValueError, AttributeError):
+            ts = float("-inf")
+        message["ts"] = ts
+    return ts
 
 
 def trip_id_to_topic(trip_id: str) -> Optional[str]:
-    """Map trip_id to topic name - auto-generated from all trips."""
-    # Auto-generate mapping from trip_id pattern
-    return _extract_topic_from_trip_id(trip_id)
+    """Map trip_id to topic name (precomputed per catalog snapshot)."""
+    return get_trip_catalog().snapshot.topic_for(trip_id)
 
 
 def topic_to_trip_id(topic: str) -> Optional[str]:
-    """Map topic name to trip_id - auto-generated from all trips."""
-    # Auto-generate mapping from all discovered trips
-    all_trips = get_all_trips()
-    topic_lower = topic.lower()
-    
-    for trip_id in all_trips.keys():
-        extracted_topic = _extract_topic_from_trip_id(trip_id)
-        if extracted_topic and extracted_topic.lower() == topic_lower:
-            return trip_id
-    return None
+    """Map topic name to trip_id (precomputed per catalog snapshot)."""
+    return get_trip_catalog().snapshot.trip_for_topic(topic)
 
 
 class ConversationMemory:
     """Helper for managing conversation memory and authoritative state."""
     
-    def __init__(self, store):
+    def __init__(self, store, compactor=None):
         self.store = store
+        # None = the shared compactor from Settings (state.compaction)
+        self._compactor = compactor
+        self._history_lock = threading.Lock()
+
+    @property
+    def compactor(self):
+        return self._compactor if self._compactor is not None else get_history_compactor()
     
     # ============================================================
     # MESSAGE HISTORY (for context/display)
@@ -48,13 +67,42 @@ class ConversationMemory:
         return self.store.get(f"history:{session_id}") or []
 
     def add_message(self, session_id: str, message: dict):
-        """Add a message to conversation history with timestamp."""
-        history = self.get_history(session_id)
-        # Add timestamp if not present
+        """Add a message to conversation history with timestamp.
+
+        Once the history passes the compactor's cap, folding older messages
+        into the session summary is scheduled off the calling thread.
+        """
+        # Add timestamp if not present; "ts" (epoch seconds) is what the time-window reads use
         if "timestamp" not in message:
-            message["timestamp"] = datetime.utcnow().isoformat() + "Z"
-        history.append(message)
-        self.store.set(f"history:{session_id}", history)
+            now = time.time()
+            message["timestamp"] = datetime.utcfromtimestamp(now).isoformat() + "Z"
+            message["ts"] = now
+        else:
+            _message_ts(message)
+        with self._history_lock:
+            history = self.get_history(session_id)
+            history.append(message)
+            self.store.set(f"history:{session_id}", history)
+        compactor = self.compactor
+        if compactor.needs_compaction(len(history)):
+            compactor.schedule(self, session_id)
+
+    def get_history_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Rolling summary of messages folded out of the raw history (see state.compaction)."""
+        return self.store.get(f"summary:{session_id}")
+
+    def replace_history_head(self, session_id: str, folded: List[Dict[str, Any]], summary: Dict[str, Any]) -> bool:
+        """Drop ``folded`` from the start of the history and store ``summary``.
+
+        Returns False (and changes nothing) if the history no longer starts with ``folded``.
+        """
+        with self._history_lock:
+            history = self.get_history(session_id)
+            if history[:len(folded)] != folded:
+                return False
+            self.store.set(f"summary:{session_id}", summary)
+            self.store.set(f"history:{session_id}", history[len(folded):])
+        return True
     
     def get_recent_history(
         self, 
@@ -75,42 +123,29 @@ class ConversationMemory:
         Returns:
             List of recent messages with timestamps, filtered by time window
         """
-        history = self.get_history(session_id)
-        if not history:
-            return []
-        
-        # Get most recent messages (last max_messages)
-        recent_messages = history[-max_messages:] if len(history) > max_messages else history
-        
-        # Check time gaps - if gap > max_gap_hours, start fresh
-        now = datetime.utcnow()
-        filtered_messages = []
-        
-        for msg in reversed(recent_messages):  # Start from most recent
-            msg_timestamp_str = msg.get("timestamp")
-            if not msg_timestamp_str:
-                # Old messages without timestamp - skip them (start fresh)
-                break
-            
-            try:
-                # Parse timestamp (handle both with and without timezone)
-                msg_timestamp_str_clean = msg_timestamp_str.replace("Z", "")
-                msg_timestamp = datetime.fromisoformat(msg_timestamp_str_clean)
-                
-                # Calculate time difference in hours
-                time_diff = (now - msg_timestamp).total_seconds() / 3600
-                
-                # If gap is too large, stop here (start fresh from this point)
-                if time_diff > max_gap_hours:
-                    break
-                
-                filtered_messages.insert(0, msg)  # Insert at beginning to maintain order
-                
-            except (ValueError, AttributeError) as e:
-                # Invalid timestamp format - skip this message
-                continue
-        
-        return filtered_messages
+        return self._recent_window(self.get_history(session_id), max_messages, max_gap_hours)
+
+    def load_turn_context(
+        self,
+        session_id: str,
+        max_messages: int = 6,
+        max_gap_hours: float = 36.0
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """(recent history, conversation state) for a turn, read in one store round trip."""
+        values = self.store.get_many([f"history:{session_id}", f"state:{session_id}"])
+        recent_history = self._recent_window(values.get(f"history:{session_id}") or [], max_messages, max_gap_hours)
+        state = values.get(f"state:{session_id}") or self.get_or_create_conversation_state(session_id)
+        return recent_history, state
+
+    def _recent_window(self, history: List[Dict[str, Any]], max_messages: int, max_gap_hours: float) -> List[Dict[str, Any]]:
+        """Last ``max_messages`` messages newer than ``max_gap_hours``.
+
+        Messages are appended in time order, so the cutoff is a bisect on the
+        cached epoch ``ts`` instead of parsing every timestamp string.
+        """
+        recent_messages = history[-max_messages:]
+        cutoff = time.time() - max_gap_hours * 3600
+        return recent_messages[bisect_left(recent_messages, cutoff, key=_message_ts):]
     
     # ============================================================
     # AUTHORITATIVE CONVERSATION STATE
@@ -249,7 +284,18 @@ class ConversationMemory:
             escalation_flag = interaction_state.get("escalation_flag", False)
             
             # Update intent_level based on decision_stage
-            if decision_stage == "ANSWERED":
+            focus = state.get("focus", {})
+            anchor = state.get("anchor", {})
+            if (
+                decision_stage == "ANSWERED"
+                and not escalation_flag
+                and focus.get("primary_topic")
+                and anchor.get("topic") == focus.get("primary_topic")
+                and state["version"] - anchor.get("since_version", state["version"]) >= BOOKING_READY_TURNS
+            ):
+                # Answered questions on one trip, turn after turn: ready to book
+                state["intent_level"] = "booking_ready"
+            elif decision_stage == "ANSWERED":
                 # If we're answering questions, user is evaluating
                 state["intent_level"] = "evaluating"
             elif decision_stage == "ESCALATED":
@@ -1,18 +1,66 @@
 # State store adapter (Redis/DB)
 # For now, using in-memory storage
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+
+# Cursor = scan id * _SCAN_STRIDE + position in that scan's key snapshot
+_SCAN_STRIDE = 1 << 40
+# Scans abandoned before reaching cursor 0 are dropped beyond this many open ones
+_MAX_OPEN_SCANS = 32
 
 class StateStore:
     """In-memory state store for development."""
     
     def __init__(self):
         self._store = {}
+        self._scans = OrderedDict()
+        self._next_scan = 1
+        self._scan_lock = threading.Lock()
     
     def get(self, key: str):
         return self._store.get(key)
     
+    def get_many(self, keys):
+        """Values for several keys in one call (missing keys map to None)."""
+        return {key: self._store.get(key) for key in keys}
+
     def set(self, key: str, value: any):
         self._store[key] = value
     
+    def scan(self, cursor: int = 0, match: str = "*", count: int = 100):
+        """Redis SCAN-style iteration: (next_cursor, keys matching ``match``); next_cursor 0 = done.
+
+        Cursor 0 snapshots the key list; each call then looks at the next
+        ``count`` keys of that snapshot, so fewer (or no) keys may come back
+        before the scan is done and a full scan is linear. Keys added after the
+        scan started are not returned; keys deleted since may be (their values
+        read back as None).
+        """
+        with self._scan_lock:
+            if cursor == 0:
+                scan_id = self._next_scan
+                self._next_scan += 1
+                # list(dict) of str keys runs without releasing the GIL, so writers cannot resize it mid-copy
+                keys = self._scans[scan_id] = list(self._store)
+                while len(self._scans) > _MAX_OPEN_SCANS:
+                    self._scans.popitem(last=False)
+                position = 0
+            else:
+                scan_id, position = divmod(cursor, _SCAN_STRIDE)
+                keys = self._scans.get(scan_id)
+                if keys is None:
+                    raise ValueError(f"Unknown or expired scan cursor {cursor}")
+        window = keys[position:position + count]
+        position += len(window)
+        if position >= len(keys):
+            with self._scan_lock:
+                self._scans.pop(scan_id, None)
+            next_cursor = 0
+        else:
+            next_cursor = scan_id * _SCAN_STRIDE + position
+        return next_cursor, [key for key in window if fnmatchcase(key, match)]
+
     def delete(self, key: str):
         if key in self._store:
             del self._store[key]
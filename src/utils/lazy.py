@@ -0,0 +1,34 @@
+"""Deferred imports for heavy optional dependencies.
+
+Worker cold start is dominated by import time (``google.genai`` alone takes
+about a second), so modules that only need a dependency on first use resolve
+it through these helpers instead of importing it at module level. See
+``benchmarks/startup_profile.py``.
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict
+
+_CACHE: Dict[str, Any] = {}
+_LOCK = threading.Lock()
+
+
+def load_attr(spec: str) -> Any:
+    """Import and return ``"package.module:attr"`` (cached after the first call)."""
+    value = _CACHE.get(spec)
+    if value is None:
+        with _LOCK:
+            value = _CACHE.get(spec)
+            if value is None:
+                module_name, _, attr = spec.partition(":")
+                value = importlib.import_module(module_name)
+                if attr:
+                    value = getattr(value, attr)
+                _CACHE[spec] = value
+    return value
+
+
+def lazy_attr(spec: str) -> Callable[[], Any]:
+    """Loader function for ``spec``; nothing is imported until it is called."""
+    return lambda: load_attr(spec)
@@ -1,4 +1,9 @@
-"""Adapter functions to handle state as both dict and Pydantic models."""
+"""Adapter functions for graph state records.
+
+Inside the graph every channel holds plain dicts (see ``graph.state``); the
+Pydantic models only validate at the API boundary. ``to_dict`` is the one
+place a model is turned into a record.
+"""
 
 from typing import Any, Dict, Optional
 
@@ -50,11 +55,15 @@ def update_nested_dict(obj: Dict[str, Any], path: str, value: Any) -> Dict[str,
 
 
 def to_dict(obj: Any) -> Dict[str, Any]:
-    """Convert object to dict (Pydantic model or already dict)."""
+    """Record for ``obj``: dicts are returned as-is (not copied), models are dumped once.
+
+    Models dump by alias, so ClassifiedQuestion.class_ becomes ``"class"``
+    like the records the nodes write.
+    """
     if isinstance(obj, dict):
         return obj
-    if hasattr(obj, "dict"):
-        return obj.dict()
+    if obj is None:
+        return {}
     if hasattr(obj, "model_dump"):
-        return obj.model_dump()
+        return obj.model_dump(by_alias=True)
     return dict(obj)
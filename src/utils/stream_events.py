@@ -0,0 +1,45 @@
+"""Custom LangGraph stream events emitted by graph nodes."""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# Set in the run's ``configurable`` by callers that consume facts events
+STREAM_FACTS = "stream_facts"
+
+
+def stream_facts_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """``config`` with facts streaming switched on, for ``graph.stream(..., stream_mode="custom")``.
+
+    LangGraph hands nodes a callable stream writer in every run, so nodes
+    cannot tell whether anyone reads custom events; extraction only streams
+    (and gives up hedging) when the caller asks for it here.
+    """
+    config = dict(config or {})
+    config["configurable"] = {**(config.get("configurable") or {}), STREAM_FACTS: True}
+    return config
+
+
+def facts_event_writer(handler: str, block_id: Optional[str]) -> Optional[Callable[[str, List[str]], None]]:
+    """Return an ``on_facts`` callback publishing each question's facts as a custom stream event.
+
+    Consumers of ``graph.stream(..., stream_mode="custom", config=stream_facts_config())``
+    receive ``{"event": "facts", "handler", "block_id", "question", "facts"}``
+    as soon as extraction for that question finishes. Returns None outside a
+    graph run or when the run did not ask for facts events.
+    """
+    try:
+        from langgraph.config import get_config, get_stream_writer
+        if not (get_config().get("configurable") or {}).get(STREAM_FACTS):
+            return None
+        writer = get_stream_writer()
+    except Exception:
+        return None
+
+    def on_facts(question: str, facts: List[str]) -> None:
+        writer({
+            "event": "facts",
+            "handler": handler,
+            "block_id": block_id,
+            "question": question,
+            "facts": facts
+        })
+    return on_facts
@@ -15,32 +15,13 @@ if _src_dir not in sys.path:
 os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
 
 # Configure LangSmith BEFORE importing graph modules
-from app.settings import Settings
-settings = Settings()
-
-if settings.langsmith_tracing:
-    langsmith_key = settings.effective_langsmith_api_key()
-    if langsmith_key:
-        os.environ["LANGCHAIN_TRACING_V2"] = "true"
-        os.environ["LANGCHAIN_API_KEY"] = langsmith_key
-        os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
-        os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
-        workspace_id = (
-            os.getenv("LANGSMITH_WORKSPACE_ID") or 
-            settings.langsmith_workspace_id or
-            os.getenv("LANGCHAIN_WORKSPACE_ID")
-        )
-        if workspace_id:
-            os.environ["LANGSMITH_WORKSPACE_ID"] = workspace_id
-            os.environ["LANGCHAIN_WORKSPACE_ID"] = workspace_id
-    elif os.getenv("LANGCHAIN_API_KEY"):
-        os.environ["LANGCHAIN_TRACING_V2"] = "true"
-        os.environ["LANGCHAIN_PROJECT"] = settings.effective_langsmith_project()
-        os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
+from app.tracing import configure_tracing
+configure_tracing()
 
 # NOW import graph modules
-from graph.build_graph import build_graph
-from graph.state import InputPayload, Questions
+from app.warmup import warmup
+from graph.build_graph import get_compiled_graph
+from graph.state import new_turn_state
 from state.store import StateStore
 from state.memory import ConversationMemory
 
@@ -66,8 +47,9 @@ if "session_id" not in st.session_state:
 # Initialize components
 @st.cache_resource
 def initialize_graph():
-    """Initialize the graph once and cache it."""
-    return build_graph()
+    """Compile the graph and pre-warm the worker once."""
+    warmup()
+    return get_compiled_graph()
 
 @st.cache_resource
 def initialize_memory():
@@ -96,6 +78,7 @@ with st.sidebar:
         if st.session_state.memory:
             # Reset conversation state
             st.session_state.memory.store.set(f"history:{session_id}", [])
+            st.session_state.memory.store.delete(f"summary:{session_id}")
             st.session_state.memory.store.set(f"conversation_state:{session_id}", None)
         st.rerun()
     
@@ -151,18 +134,16 @@ if prompt := st.chat_input("Type your message here..."):
         with st.spinner("Processing..."):
             try:
                 # Load conversation state
-                recent_history = st.session_state.memory.get_recent_history(
+                recent_history, conversation_state = st.session_state.memory.load_turn_context(
                     session_id, max_messages=6, max_gap_hours=36.0
                 )
-                conversation_state = st.session_state.memory.get_or_create_conversation_state(session_id)
                 
                 # Initialize state
-                initial_state = {
-                    "input": InputPayload(raw_text=prompt),
-                    "questions": Questions(),
-                    "conversation_history": recent_history if recent_history else None,
-                    "conversation_state": conversation_state
-                }
+                initial_state = new_turn_state(
+                    prompt,
+                    conversation_history=recent_history if recent_history else None,
+                    conversation_state=conversation_state
+                )
                 
                 # Run graph
                 final_state = st.session_state.graph.invoke(initial_state)
@@ -0,0 +1,83 @@
+"""Tests for the bounded LLM call ledger (no API key required)."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from llm.call_ledger import CallLedger
+
+
+class TestCallLedger(unittest.TestCase):
+    """Ring buffer and JSONL spill behaviour."""
+
+    def test_ring_buffer_is_bounded(self):
+        ledger = CallLedger(max_records=3)
+        for i in range(10):
+            ledger.record(method="classify_question", model="flash", latency_ms=i)
+
+        records = ledger.records()
+        self.assertEqual(len(records), 3)
+        self.assertEqual([r.latency_ms for r in records], [7, 8, 9])
+        self.assertEqual(ledger.total_calls, 10)
+
+    def test_records_errors_and_filters_by_method(self):
+        ledger = CallLedger(max_records=10)
+        ledger.record(method="compose_answer", model="flash", latency_ms=5.0, input_tokens=120, output_tokens=40)
+        ledger.record(method="detect_intent", model="pro", latency_ms=9.0, error="ResourceExhausted")
+
+        self.assertEqual(ledger.total_errors, 1)
+        intent_records = ledger.records(method="detect_intent")
+        self.assertEqual(len(intent_records), 1)
+        self.assertEqual(intent_records[0].error, "ResourceExhausted")
+        self.assertEqual(ledger.records(method="compose_answer")[0].input_tokens, 120)
+
+    def test_cassette_replay_is_recorded_as_cache_hit(self):
+        from langchain_core.output_parsers import StrOutputParser
+        from llm.cassette import Cassette, CassetteChatModel
+        from llm.client import LLMClient, set_llm_backend
+        from llm.fake_backend import fake_backend_factory
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cassette = Cassette(os.path.join(tmp, "cassette.jsonl"))
+            cassette.record("Is pickup included?", "flash", "LOGISTICS", None, 12.0)
+            replay = CassetteChatModel(model="flash", mode="replay", cassette=cassette)
+            previous = set_llm_backend(fake_backend_factory(seed=1))
+            try:
+                client = LLMClient()
+            finally:
+                set_llm_backend(previous)
+            client.call_history = CallLedger(max_records=10)
+            self.assertEqual(client._attempt("classify_question", "Is pickup included?", replay, StrOutputParser()), "LOGISTICS")
+            self.assertTrue(client.call_history.records()[0].cache_hit)
+
+    def test_spill_to_disk_with_rotation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger", "calls.jsonl")
+            ledger = CallLedger(max_records=2, ledger_path=path, max_bytes=200, backups=2)
+            for i in range(20):
+                ledger.record(method="extract_facts_batch", model="pro", latency_ms=i)
+
+            self.assertTrue(os.path.exists(path))
+            self.assertTrue(os.path.exists(path + ".1"))
+            self.assertTrue(os.path.exists(path + ".2"))
+            self.assertFalse(os.path.exists(path + ".3"))
+
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            self.assertEqual(lines[-1]["latency_ms"], 19)
+            self.assertEqual(lines[-1]["method"], "extract_facts_batch")
+            # Memory copy stays bounded even though everything hit disk
+            self.assertEqual(len(ledger), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
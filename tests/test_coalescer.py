@@ -0,0 +1,99 @@
+"""Tests for cross-session request coalescing (no API key required)."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from llm.coalescer import RequestCoalescer
+from llm.resilience import LLMDeadlineExceeded
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    """Concurrent submits within one window share a single flush."""
+
+    def _run_concurrently(self, coalescer, batches, flush):
+        results = [None] * len(batches)
+
+        def worker(i):
+            results[i] = coalescer.submit("classify", batches[i], flush)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(batches))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_requests_share_one_call(self):
+        calls = []
+
+        def flush(questions):
+            calls.append(list(questions))
+            return {q: q.upper() for q in questions}
+
+        coalescer = RequestCoalescer(window_ms=200, max_batch=100)
+        batches = [[f"q{i}", "shared"] for i in range(8)]
+        results = self._run_concurrently(coalescer, batches, flush)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(calls[0]), 9)  # duplicates de-duplicated
+        for i, result in enumerate(results):
+            self.assertEqual(result, {f"q{i}": f"Q{i}", "shared": "SHARED"})
+
+    def test_max_batch_closes_window_early(self):
+        calls = []
+
+        def flush(questions):
+            calls.append(list(questions))
+            return {q: "ANSWERABLE" for q in questions}
+
+        coalescer = RequestCoalescer(window_ms=5000, max_batch=2)
+        result = coalescer.submit("classify", ["a", "b"], flush)
+        self.assertEqual(result, {"a": "ANSWERABLE", "b": "ANSWERABLE"})
+        self.assertEqual(len(calls), 1)
+
+    def test_flush_error_reaches_every_caller(self):
+        def flush(questions):
+            raise RuntimeError("quota")
+
+        coalescer = RequestCoalescer(window_ms=1, max_batch=4)
+        with self.assertRaises(RuntimeError):
+            coalescer.submit("categorize", ["x"], flush)
+
+
+    def test_lone_request_does_not_wait_out_the_window(self):
+        coalescer = RequestCoalescer(window_ms=2000, max_batch=16)
+        start = time.perf_counter()
+        self.assertEqual(coalescer.submit("classify", ["a"], lambda qs: {q: "OK" for q in qs}), {"a": "OK"})
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_follower_gives_up_at_its_own_deadline(self):
+        coalescer = RequestCoalescer(window_ms=100, max_batch=16)
+        release = threading.Event()
+
+        def slow_flush(questions):
+            release.wait(2.0)
+            return {q: "OK" for q in questions}
+
+        leader = threading.Thread(target=coalescer.submit, args=("classify", ["a"], slow_flush))
+        leader.start()
+        time.sleep(0.01)
+        start = time.perf_counter()
+        with self.assertRaises(LLMDeadlineExceeded):
+            coalescer.submit("classify", ["b"], slow_flush, deadline=time.time() + 0.2)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        release.set()
+        leader.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
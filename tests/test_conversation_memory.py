@@ -0,0 +1,86 @@
+"""Tests for ConversationMemory reads (no API key required)."""
+
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from state.compaction import HistoryCompactor
+from state.memory import ConversationMemory, _message_ts
+from state.store import StateStore
+
+
+class CountingStore(StateStore):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return super().get(key)
+
+    def get_many(self, keys):
+        self.reads += 1
+        return super().get_many(keys)
+
+
+def _iso(hours_ago):
+    return datetime.utcfromtimestamp(time.time() - hours_ago * 3600).isoformat() + "Z"
+
+
+class TestConversationMemory(unittest.TestCase):
+    """Time-window reads use cached epoch timestamps; a turn's context is one store read."""
+
+    def setUp(self):
+        self.store = CountingStore()
+        self.memory = ConversationMemory(self.store, compactor=HistoryCompactor(max_messages=0))
+
+    def test_recent_history_drops_messages_past_the_gap(self):
+        self.store.set("history:s1", [
+            {"role": "user", "content": "old", "timestamp": _iso(48)},
+            {"role": "assistant", "content": "old reply", "timestamp": _iso(47.9)},
+            {"role": "user", "content": "new", "timestamp": _iso(1)},
+        ])
+        self.memory.add_message("s1", {"role": "assistant", "content": "new reply"})
+        recent = self.memory.get_recent_history("s1", max_messages=6, max_gap_hours=36.0)
+        self.assertEqual([m["content"] for m in recent], ["new", "new reply"])
+        self.assertIsInstance(recent[0]["ts"], float)
+        self.assertEqual(len(self.memory.get_recent_history("s1", max_messages=1)), 1)
+
+    def test_timestamp_offsets_are_honoured(self):
+        two_hours_ago = datetime.now(timezone(timedelta(hours=5, minutes=30))) - timedelta(hours=2)
+        message = {"role": "user", "content": "hi", "timestamp": two_hours_ago.isoformat()}
+        self.assertAlmostEqual(_message_ts(message), time.time() - 7200, delta=5)
+        self.assertAlmostEqual(_message_ts({"timestamp": _iso(1)}), time.time() - 3600, delta=5)
+
+    def test_turn_context_is_one_round_trip(self):
+        self.memory.get_or_create_conversation_state("s2")
+        self.memory.add_message("s2", {"role": "user", "content": "hi"})
+        reads = self.store.reads
+        recent, state = self.memory.load_turn_context("s2")
+        self.assertEqual(self.store.reads - reads, 1)
+        self.assertEqual(([m["content"] for m in recent], state["version"]), (["hi"], 0))
+
+
+    def test_answered_turns_on_one_trip_become_booking_ready(self):
+        trip = {"trip_id": "kashmir_zo_trip_TR-4Q7QMQQJ", "confidence": "LOW"}
+        answered = {"decision_stage": "ANSWERED", "escalation_flag": False}
+        levels = [
+            self.memory.update_conversation_state("s3", trip, answered)["intent_level"]
+            for _ in range(3)
+        ]
+        self.assertEqual(levels, ["evaluating", "evaluating", "booking_ready"])
+        escalated = {"decision_stage": "ESCALATED", "escalation_flag": True}
+        self.assertEqual(self.memory.update_conversation_state("s3", trip, escalated)["intent_level"], "browsing")
+
+
+if __name__ == "__main__":
+    unittest.main()
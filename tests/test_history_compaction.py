@@ -0,0 +1,55 @@
+"""Tests for conversation history compaction (no API key required)."""
+
+import os
+import sys
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from state.compaction import HistoryCompactor
+from state.memory import ConversationMemory
+from state.store import StateStore
+
+
+class TestHistoryCompaction(unittest.TestCase):
+    """Raw history stays capped; older turns land in the rolling summary."""
+
+    def _chat(self, memory, session_id, turns):
+        for user_text, reply in turns:
+            memory.add_message(session_id, {"role": "user", "content": user_text})
+            memory.add_message(session_id, {"role": "assistant", "content": reply})
+
+    def test_history_is_capped_and_summarized(self):
+        memory = ConversationMemory(StateStore(), compactor=HistoryCompactor(max_messages=6, keep_messages=2, background=False))
+        self._chat(memory, "s1", [
+            ("Tell me about the Kashmir trip", "It is a 7 day trip."),
+            ("Is there snow in Srinagar in March?", "Our team will get back to you on that."),
+            ("What about Spiti?", "Spiti is a 4x4 expedition."),
+            ("Is pickup included?", "Yes, from the airport."),
+        ])
+        history = memory.get_history("s1")
+        self.assertLessEqual(len(history), 6)
+        self.assertEqual(history[-1]["content"], "Yes, from the airport.")
+        summary = memory.get_history_summary("s1")
+        self.assertEqual(summary["messages_folded"] + len(history), 8)
+        self.assertEqual(summary["topics"]["kashmir"], 2)
+        self.assertEqual(summary["trips"][0], "kashmir_zo_trip_TR-4Q7QMQQJ")
+        self.assertEqual(summary["open_questions"], ["Is there snow in Srinagar in March?"])
+
+    def test_background_compaction_keeps_concurrent_appends(self):
+        compactor = HistoryCompactor(max_messages=4, keep_messages=2)
+        memory = ConversationMemory(StateStore(), compactor=compactor)
+        self._chat(memory, "s2", [(f"question {i}?", f"answer {i}") for i in range(10)])
+        compactor.join()
+        history = memory.get_history("s2")
+        self.assertEqual(memory.get_history_summary("s2")["messages_folded"] + len(history), 20)
+        self.assertEqual(history[-1]["content"], "answer 9")
+
+
+if __name__ == "__main__":
+    unittest.main()
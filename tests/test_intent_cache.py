@@ -0,0 +1,78 @@
+"""Tests for the seat-availability intent rules and cache (no API key required)."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from domain.behaviors.intent import IntentCache, detect_question_intent, lexical_intent, normalize_question, set_intent_cache
+
+
+class TestIntentCache(unittest.TestCase):
+    """Common phrasings resolve lexically; the rest call the detector once per normalized question."""
+
+    def setUp(self):
+        self.cache = IntentCache(max_entries=4)
+        self._previous = set_intent_cache(self.cache)
+        self.calls = []
+
+    def tearDown(self):
+        set_intent_cache(self._previous)
+
+    def _detect(self, text):
+        self.calls.append(text)
+        time.sleep(0.02)
+        return "SEAT_AVAILABILITY"
+
+    def test_lexical_rules_skip_the_detector(self):
+        cases = {
+            "Can I book?": "SEAT_AVAILABILITY",
+            "Can we still book the Kashmir trip for 3rd March?": "SEAT_AVAILABILITY",
+            "Is the trip still available?": "SEAT_AVAILABILITY",
+            "How do I book this trip?": "OTHER",
+            "Is wifi available at the camps?": "OTHER",
+        }
+        for text, expected in cases.items():
+            self.assertEqual(detect_question_intent(text, self._detect), expected, text)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.cache.stats()["lexical"], len(cases))
+
+    def test_non_seat_bookings_are_not_seat_questions(self):
+        for text in (
+            "Can you book a cab from the airport for us?",
+            "Can we book an extra night at the hotel?",
+            "Is parking available on 24th January 2026?",
+        ):
+            self.assertNotEqual(lexical_intent(text), "SEAT_AVAILABILITY", text)
+            self.assertEqual(detect_question_intent(text, lambda text: "OTHER"), "OTHER", text)
+        # Objects the rules do not know are left to the detector
+        self.assertIsNone(lexical_intent("Can we book a stay by the lake?"))
+
+    def test_detector_runs_once_per_normalized_question(self):
+        question = "Booking for Kashmir, any luck?"
+        self.assertIsNone(lexical_intent(question))
+        threads = [threading.Thread(target=detect_question_intent, args=(question, self._detect)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        detect_question_intent("  booking FOR kashmir -- any luck ", self._detect)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(normalize_question("Booking for 12 people?"), "booking for 0 people")
+
+    def test_failed_detection_is_not_cached(self):
+        self.assertEqual(detect_question_intent("booking for goa", lambda text: None), "OTHER")
+        self.assertEqual(detect_question_intent("booking for goa", self._detect), "SEAT_AVAILABILITY")
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""End-to-end graph tests against the deterministic fake LLM backend (no API key needed)."""
+
+import os
+import sys
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
+
+from app.warmup import warmup
+from graph.build_graph import get_compiled_graph
+from graph.state import InputPayload, Questions, new_turn_state
+from llm.call_ledger import get_call_ledger
+from llm.client import set_llm_backend
+from llm.fake_backend import fake_backend_factory
+from utils.stream_events import stream_facts_config
+
+
+class TestOfflineGraph(unittest.TestCase):
+    """Runs the compiled graph with canned LLM responses."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._previous_backend = set_llm_backend(fake_backend_factory(seed=1))
+        cls.graph = get_compiled_graph()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_llm_backend(cls._previous_backend)
+
+    def _run(self, text):
+        return self.graph.invoke(new_turn_state(text))
+
+    def test_logistics_query_resolves_trip(self):
+        final_state = self._run("Is pickup included in the Kashmir trip, or do I need to reach Srinagar on my own?")
+
+        self.assertTrue(final_state["merged_output"]["final_text"])
+        trip_context = final_state["answerable_processing"]["trip_context"]
+        self.assertEqual(trip_context["trip_id"], "kashmir_zo_trip_TR-4Q7QMQQJ")
+
+    def test_pydantic_entry_is_converted_once(self):
+        text = "Can you guarantee a refund if I cancel next week?"
+        final_state = self.graph.invoke({"input": InputPayload(raw_text=text), "questions": Questions()})
+        self.assertIsInstance(final_state["input"], dict)
+        self.assertEqual(final_state["questions"]["classified"][0]["class"], "FORBIDDEN")
+        self.assertEqual(final_state["merged_output"], self._run(text)["merged_output"])
+
+    def test_booking_confirmation_behavior(self):
+        final_state = self._run("I just booked the trip!")
+        self.assertEqual(final_state["merged_output"]["final_text"], "Zo Zo 😍")
+
+    def test_forbidden_question_sets_boundary(self):
+        final_state = self._run("Can you guarantee a refund if I cancel next week?")
+        self.assertTrue(final_state["interaction_state"]["escalation_flag"])
+
+    def test_llm_calls_are_recorded(self):
+        ledger = get_call_ledger()
+        before = ledger.total_calls
+        self._run("What is the price of the Rajasthan trip?")
+        self.assertGreater(ledger.total_calls, before)
+        self.assertTrue(all(r.model.startswith("fake-") for r in ledger.records()[-(ledger.total_calls - before):]))
+
+    def test_facts_events_only_when_requested(self):
+        state = new_turn_state("What is the itinerary for the Kashmir trip and is pickup included?")
+        self.assertEqual(list(self.graph.stream(state, stream_mode="custom")), [])
+        events = list(self.graph.stream(state, stream_mode="custom", config=stream_facts_config()))
+        self.assertTrue(events)
+        self.assertTrue(all(event["event"] == "facts" for event in events))
+
+    def test_warmup_reuses_compiled_graph(self):
+        timings = warmup()
+        self.assertEqual(set(timings), {"graph", "trip_index", "seat_inventory", "llm_client"})
+        self.assertIs(get_compiled_graph(), self.graph)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,51 @@
+"""Tests for compact prompt rendering and token budgets (no API key required)."""
+
+import os
+import sys
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from llm.prompt_builder import PromptBuilder, compact_json, get_prompt_builder
+
+
+TRIP = {
+    "trip_summary": "Kashmir in winter",
+    "itinerary": [{"day": d, "activities": ["Sightseeing around the valley"] * 5} for d in range(1, 8)],
+    "itinerary_highlights": ["Gulmarg gondola ride", "Shikara on Dal Lake", "Sonmarg snow point"],
+}
+
+
+class TestPromptBuilder(unittest.TestCase):
+    """Compiled once, compact payloads, low-priority sections trimmed to budget."""
+
+    def test_templates_are_shared(self):
+        self.assertIs(get_prompt_builder().get("extractor"), get_prompt_builder().get("extractor"))
+        self.assertEqual(compact_json({"a": [1, 2]}), '{"a":[1,2]}')
+
+    def test_trims_itinerary_days_before_highlights(self):
+        builder = PromptBuilder({"extractor": "Question: {question_text}\n{trip_data}"}, {"extract": 150})
+        text = builder.trip_data("extract_facts", "extractor", TRIP, "Tell me about the trip?")
+        self.assertLessEqual(len(text) // 4, 150)
+        self.assertIn('"itinerary_highlights"', text)
+        self.assertIn('"day":1', text)
+        self.assertNotIn('"day":7', text)
+
+    def test_plan_budget_applies_to_trip_context(self):
+        builder = PromptBuilder({"planner": "{structured_questions}\n{trip_context}"}, {"plan": 150})
+        text = builder.trip_data("plan_answer", "planner", TRIP, compact_json([{"text": "Itinerary?"}]))
+        self.assertLessEqual(len(text) // 4, 150)
+        self.assertNotIn('"day":7', text)
+
+    def test_no_budget_keeps_everything(self):
+        builder = PromptBuilder({"extractor": "{trip_data}"})
+        self.assertEqual(builder.trip_data("extract_facts", "extractor", TRIP), compact_json(TRIP))
+
+
+if __name__ == "__main__":
+    unittest.main()
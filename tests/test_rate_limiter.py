@@ -0,0 +1,65 @@
+"""Tests for the LLM token-bucket scheduler (no API key required)."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from llm.rate_limiter import LLMScheduler, RateLimitTimeout
+
+
+class TestLLMScheduler(unittest.TestCase):
+    """Bucket limits, priority order and timeouts."""
+
+    def test_unlimited_model_does_not_wait(self):
+        scheduler = LLMScheduler({"pro": {"rpm": 1}})
+        for _ in range(5):
+            self.assertEqual(scheduler.acquire("flash", "classify_question", 100), 0.0)
+
+    def test_requests_per_minute_is_enforced(self):
+        # 600 rpm = one request every 100ms once the burst is spent
+        scheduler = LLMScheduler({"flash": {"rpm": 600}})
+        scheduler._limits["flash"].requests.tokens = 0
+        waited = scheduler.acquire("flash", "classify_question", 10)
+        self.assertGreaterEqual(waited, 80)
+
+    def test_timeout_raises(self):
+        scheduler = LLMScheduler({"pro": {"rpm": 1}})
+        scheduler.acquire("pro", "plan_answer", 10)
+        with self.assertRaises(RateLimitTimeout):
+            scheduler.acquire("pro", "plan_answer", 10, timeout=0.05)
+        self.assertEqual(scheduler.queue_depth("pro"), 0)
+
+    def test_classification_is_served_before_composition(self):
+        scheduler = LLMScheduler({"flash": {"rpm": 600}})
+        limit = scheduler._limits["flash"]
+        order = []
+
+        def call(method):
+            scheduler.acquire("flash", method, 10)
+            order.append(method)
+
+        # Hold the lock so both callers start before either can be served
+        with scheduler._cond:
+            threads = [threading.Thread(target=call, args=(m,)) for m in ("compose_answer", "classify_questions_batch")]
+            for t in threads:
+                t.start()
+            time.sleep(0.05)
+            # Empty bucket: whoever checks first must wait ~100ms, long enough for both to queue
+            limit.requests.tokens = 0
+            limit.requests.updated = time.monotonic()
+        for t in threads:
+            t.join()
+        self.assertEqual(order, ["classify_questions_batch", "compose_answer"])
+
+
+if __name__ == "__main__":
+    unittest.main()
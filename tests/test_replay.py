@@ -0,0 +1,70 @@
+"""Tests for the offline conversation replay CLI (no API key required)."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
+
+from app.replay import iter_sessions, run_replay
+from llm.client import set_llm_backend
+from llm.fake_backend import fake_backend_factory
+
+
+class TestReplay(unittest.TestCase):
+    """Exports are grouped per session, replayed in timestamp order and reported per turn."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._previous_backend = set_llm_backend(fake_backend_factory(seed=1))
+
+    @classmethod
+    def tearDownClass(cls):
+        set_llm_backend(cls._previous_backend)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.export = os.path.join(self._tmp.name, "export.jsonl")
+        with open(self.export, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"session_id": "s1", "messages": [
+                {"role": "user", "content": "Tell me about the Kashmir trip", "timestamp": "2025-03-01T10:00:00Z"},
+                {"role": "assistant", "content": "old reply", "timestamp": "2025-03-01T10:00:05Z"},
+                {"role": "user", "content": "Can you guarantee a refund if I cancel?", "timestamp": "2025-03-01T10:02:00Z"},
+            ]}) + "\n")
+            f.write(json.dumps({"session_id": "s2", "role": "user", "text": "Is pickup included?", "timestamp": "2025-03-02T10:01:00Z"}) + "\n")
+            f.write("not json\n")
+            f.write(json.dumps({"session_id": "s2", "role": "user", "text": "Hi, the Kashmir trip?", "timestamp": "2025-03-02T10:00:00Z"}) + "\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_sessions_are_grouped_in_order(self):
+        self.assertEqual(list(iter_sessions(self.export)), [
+            ("s1", ["Tell me about the Kashmir trip", "Can you guarantee a refund if I cancel?"]),
+            ("s2", ["Hi, the Kashmir trip?", "Is pickup included?"]),
+        ])
+
+    def test_replay_writes_one_line_per_turn(self):
+        output = os.path.join(self._tmp.name, "results.jsonl")
+        summary = run_replay(self.export, output, workers=0)
+        with open(output, encoding="utf-8") as f:
+            turns = [json.loads(line) for line in f]
+        self.assertEqual((summary["sessions"], summary["turns"], summary["errors"]), (2, 4, 0))
+        self.assertEqual([(t["session_id"], t["turn"]) for t in turns], [("s1", 0), ("s1", 1), ("s2", 0), ("s2", 1)])
+        self.assertTrue(turns[1]["escalation_flag"])
+        self.assertEqual(turns[0]["trip_id"], "kashmir_zo_trip_TR-4Q7QMQQJ")
+        self.assertIn("final_state", turns[1])
+        self.assertNotIn("final_state", turns[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Tests for LLM retry backoff, deadlines and hedged requests (no API key required)."""
+
+import contextvars
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from llm.client import LLMClient, set_llm_backend
+from llm.fake_backend import FakeChatModel
+from llm import resilience
+from llm.resilience import LLMDeadlineExceeded, RetryPolicy, bounded_call, hedged_call, is_transient
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Backoff only for transient errors, within attempts and budget."""
+
+    def test_transient_detection(self):
+        self.assertTrue(is_transient(RuntimeError("429 Resource has been exhausted")))
+        self.assertTrue(is_transient(ConnectionError("reset")))
+        self.assertFalse(is_transient(ValueError("Invalid json output")))
+        self.assertFalse(is_transient(LLMDeadlineExceeded("out of budget")))
+        # Digits or words in the message are not a status code
+        self.assertFalse(is_transient(ValueError("Prompt of 5000 tokens mentions a 500 rupee timeout fee")))
+        status_error = RuntimeError("Bad request")
+        status_error.code = 503
+        self.assertTrue(is_transient(status_error))
+        try:
+            raise RuntimeError("Gemini call failed") from ConnectionError("reset")
+        except RuntimeError as wrapped:
+            self.assertTrue(is_transient(wrapped))
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(max_retries=2, base_ms=100, max_ms=150)
+        error = RuntimeError("503 UNAVAILABLE")
+        for attempt in range(2):
+            delay = policy.backoff(attempt, error)
+            self.assertIsNotNone(delay)
+            self.assertLessEqual(delay, 0.15)
+        self.assertIsNone(policy.backoff(2, error))
+
+    def test_no_retry_past_deadline(self):
+        policy = RetryPolicy(max_retries=5, base_ms=10000, max_ms=10000)
+        error = RuntimeError("503 UNAVAILABLE")
+        # Almost no budget left: any non-trivial backoff would overrun it
+        delays = [policy.backoff(0, error, deadline=time.time() + 0.001) for _ in range(20)]
+        self.assertTrue(all(d is None or d < 0.001 for d in delays))
+
+
+class TestHedgedCall(unittest.TestCase):
+    """A slow primary is raced by one duplicate."""
+
+    def test_duplicate_wins_when_primary_stalls(self):
+        calls = []
+        lock = threading.Lock()
+
+        def fn():
+            with lock:
+                calls.append(1)
+                first = len(calls) == 1
+            time.sleep(1.0 if first else 0.01)
+            return "slow" if first else "fast"
+
+        start = time.perf_counter()
+        result = hedged_call(fn, hedge_after_s=0.05)
+        self.assertEqual(result, "fast")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(len(calls), 2)
+
+    def test_fast_primary_is_not_hedged(self):
+        calls = []
+        result = hedged_call(lambda: calls.append(1) or "ok", hedge_after_s=0.5)
+        self.assertEqual(result, "ok")
+        self.assertEqual(len(calls), 1)
+
+    def test_calls_see_the_callers_context(self):
+        turn = contextvars.ContextVar("turn", default=None)
+        turn.set("turn-1")
+        seen = []
+
+        def fn():
+            seen.append(turn.get())
+            time.sleep(0.1 if len(seen) == 1 else 0.0)
+            return "ok"
+
+        self.assertEqual(hedged_call(fn, hedge_after_s=0.02), "ok")
+        self.assertEqual(seen, ["turn-1", "turn-1"])
+
+    def test_hedge_delay_starts_when_primary_runs(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        previous = resilience._CALL_EXECUTOR
+        resilience._CALL_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+        try:
+            # Both threads busy: the primary waits in the queue longer than the hedge delay
+            for _ in range(2):
+                resilience._CALL_EXECUTOR.submit(time.sleep, 0.2)
+            calls = []
+            result = hedged_call(lambda: calls.append(1) or time.sleep(0.05) or "ok", hedge_after_s=0.1)
+            self.assertEqual(result, "ok")
+            self.assertEqual(len(calls), 1)
+        finally:
+            resilience._CALL_EXECUTOR.shutdown(wait=False)
+            resilience._CALL_EXECUTOR = previous
+
+    def test_deadline_is_enforced(self):
+        with self.assertRaises(LLMDeadlineExceeded):
+            hedged_call(lambda: time.sleep(0.5), hedge_after_s=1.0, deadline=time.time() + 0.05)
+
+
+class TestDeadlineBoundedCall(unittest.TestCase):
+    """A single slow attempt is abandoned once the turn deadline passes."""
+
+    def test_no_deadline_runs_inline(self):
+        self.assertIs(bounded_call(threading.current_thread), threading.current_thread())
+
+    def test_slow_model_is_abandoned_at_the_deadline(self):
+        slow = FakeChatModel(model="fake-slow", latency_ms=1000)
+        previous = set_llm_backend(lambda settings: (slow, slow))
+        try:
+            client = LLMClient().for_turn(time.time() + 0.1)
+        finally:
+            set_llm_backend(previous)
+        start = time.perf_counter()
+        with self.assertRaises(LLMDeadlineExceeded):
+            client._invoke("detect_intent", client.intent_detector_prompt, client.str_parser, {"question_text": "Any seats left?"})
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIsNone(client.detect_intent("Any seats left?", fallback=None))
+
+
+if __name__ == "__main__":
+    unittest.main()
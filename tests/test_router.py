@@ -0,0 +1,76 @@
+"""Tests for per-task LLM model routing (no API key required)."""
+
+import os
+import sys
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from llm.call_ledger import CallLedger
+from llm.router import ModelRouter
+
+
+class _Model:
+    def __init__(self, model):
+        self.model = model
+
+
+class TestModelRouter(unittest.TestCase):
+    """Static routes, A/B splits and latency-driven overrides."""
+
+    def setUp(self):
+        self.tiers = {"pro": _Model("pro-model"), "flash": _Model("flash-model")}
+
+    def test_static_route_and_failover(self):
+        router = ModelRouter({"extract": {"models": {"pro": 1.0}, "failover": "flash"}})
+        llm, failover, decision = router.route("extract_facts_batch", self.tiers)
+        self.assertIs(llm, self.tiers["pro"])
+        self.assertIs(failover, self.tiers["flash"])
+        self.assertEqual((decision.task, decision.reason), ("extract", "static"))
+        self.assertEqual(len(router.decisions("extract")), 1)
+
+    def test_ab_split_follows_weights(self):
+        router = ModelRouter({"compose": {"models": {"pro": 0.2, "flash": 0.8}}}, seed=7)
+        picks = [router.route("compose_answer", self.tiers)[2].tier for _ in range(1000)]
+        self.assertAlmostEqual(picks.count("flash") / len(picks), 0.8, delta=0.05)
+
+    def test_slow_model_is_routed_around(self):
+        ledger = CallLedger(max_records=100)
+        for _ in range(5):
+            ledger.record(method="plan_answer", model="pro-model", latency_ms=9000)
+            ledger.record(method="plan_answer", model="flash-model", latency_ms=800)
+        router = ModelRouter(
+            {"plan": {"models": {"pro": 1.0, "flash": 0.0001}, "max_p95_ms": 3000}},
+            ledger=ledger, min_samples=5, seed=1
+        )
+        llm, _, decision = router.route("plan_answer", self.tiers)
+        self.assertIs(llm, self.tiers["flash"])
+        self.assertTrue(decision.reason.startswith("latency"))
+
+    def test_fast_failing_model_is_not_preferred(self):
+        ledger = CallLedger(max_records=100)
+        for _ in range(5):
+            ledger.record(method="plan_answer", model="pro-model", latency_ms=5000)
+            ledger.record(method="plan_answer", model="flash-model", latency_ms=20, error="ResourceExhausted")
+        router = ModelRouter(
+            {"plan": {"models": {"pro": 0.0001, "flash": 1.0}, "max_p95_ms": 3000}},
+            ledger=ledger, min_samples=5, seed=1
+        )
+        llm, _, decision = router.route("plan_answer", self.tiers)
+        self.assertIs(llm, self.tiers["pro"])
+        self.assertTrue(decision.reason.startswith("errors"))
+        # The slow-but-healthy tier stays put: the failing one is not a faster alternative
+        router = ModelRouter(
+            {"plan": {"models": {"pro": 1.0, "flash": 0.0001}, "max_p95_ms": 3000}},
+            ledger=ledger, min_samples=5, seed=1
+        )
+        self.assertIs(router.route("plan_answer", self.tiers)[0], self.tiers["pro"])
+
+
+if __name__ == "__main__":
+    unittest.main()
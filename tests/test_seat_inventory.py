@@ -0,0 +1,71 @@
+"""Tests for the seat inventory and its feeds (no API key required)."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from domain.behaviors.seat_availability import check_seat_availability_behavior
+from domain.inventory import InventoryUpdater, JsonFileFeed, QueueFeed, SeatInventory, set_seat_inventory
+
+TRIP = {
+    "trip_id": "TR-TEST",
+    "batches": {"available_batches": [
+        {"batch_id": "b1", "start_date": "2026-01-10", "seats_left": "3", "status": "open"},
+        {"batch_id": "b2", "start_date": "2026-02-07", "seats_left": "0", "status": "open"},
+        {"batch_id": "b3", "start_date": "2026-03-01", "seats_left": "<dynamic>", "status": "open"},
+    ]},
+}
+
+
+class TestSeatInventory(unittest.TestCase):
+    """Date-indexed lookups, incremental feed updates and the availability answers."""
+
+    def setUp(self):
+        self.inventory = SeatInventory.from_trips({TRIP["trip_id"]: TRIP})
+        self._previous = set_seat_inventory(self.inventory)
+
+    def tearDown(self):
+        set_seat_inventory(self._previous)
+
+    def test_next_available_is_after_the_requested_date(self):
+        seats = self.inventory.trip("TR-TEST")
+        self.assertEqual(seats.next_available("2026-01-20"), None)
+        answer = check_seat_availability_behavior(TRIP, "Are seats available on 20th January 2026?")
+        # b1 (10th January) is earlier than the requested date, so it must not be suggested
+        self.assertEqual(answer, "Unfortunately, we do not have seats on this date (20th January 2026).")
+
+    def test_feed_updates_are_served_immediately(self):
+        feed = QueueFeed()
+        updater = InventoryUpdater(self.inventory, [feed])
+        feed.push([
+            {"trip_id": "TR-TEST", "batch_id": "b3", "seats_left": 6},
+            {"trip_id": "TR-TEST", "start_date": "2026-01-10", "status": "closed"},
+        ])
+        self.assertEqual(updater.poll_once(), 2)
+        answer = check_seat_availability_behavior(TRIP, "Are seats available on 7th February 2026?")
+        self.assertIn("next available date (1st March 2026)", answer)
+        self.assertEqual(self.inventory.trip("TR-TEST").next_available()["batch_id"], "b3")
+
+    def test_json_file_feed_reports_only_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "inventory.json")
+            feed = JsonFileFeed(path)
+            self.assertIsNone(feed.poll())
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"updates": [{"trip_id": "TR-TEST", "batch_id": "b2", "seats_left": "4"}]}, f)
+            self.assertEqual(self.inventory.apply(feed.poll()), 1)
+            self.assertIsNone(feed.poll())
+        self.assertEqual(self.inventory.trip("TR-TEST").batch_on("2026-02-07")["seats_left"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+"""Tests for the graph state reducers (no API key required)."""
+
+import os
+import sys
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from graph.state import combine_answerable_processing, merge_handler_outputs_by_block
+
+
+class TestStateReducers(unittest.TestCase):
+    """handler_outputs merges by block_id without touching the previous value; answerable_processing is a shallow merge."""
+
+    def test_handler_outputs_merge_leaves_previous_value(self):
+        current = merge_handler_outputs_by_block({}, {"b1": {"block_id": "b1", "facts": ["a"]}})
+        merged = merge_handler_outputs_by_block(current, {"b2": {"block_id": "b2", "facts": ["b"]}})
+        self.assertEqual(list(merged), ["b1", "b2"])
+        # An earlier snapshot holding ``current`` does not see later blocks
+        self.assertEqual(list(current), ["b1"])
+
+    def test_answerable_processing_newer_fields_win(self):
+        plan = {"answer_blocks": [{"block_id": "b1"}]}
+        current = {"normalized_text": "hi", "answer_plan": plan}
+        merged = combine_answerable_processing(current, {"normalized_text": "hi", "answer_text": "Hello"})
+        self.assertEqual(merged["answer_text"], "Hello")
+        self.assertIs(merged["answer_plan"], plan)
+        self.assertNotIn("answer_text", current)
+
+
+if __name__ == "__main__":
+    unittest.main()
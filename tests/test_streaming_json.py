@@ -0,0 +1,66 @@
+"""Tests for streamed batch fact extraction (no API key required)."""
+
+import json
+import os
+import sys
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
+
+from llm.client import LLMClient, set_llm_backend
+from llm.fake_backend import FakeChatModel
+from llm.streaming_json import ResultsStreamParser
+
+
+class TestResultsStreamParser(unittest.TestCase):
+    """Elements are emitted as soon as they close, whatever the chunking."""
+
+    def test_emits_each_element_when_it_closes(self):
+        text = json.dumps({"results": [
+            {"index": 1, "facts": ["Pickup at 6 {am}", "Bring \"warm\" clothes ]"]},
+            {"index": 2, "facts": []}
+        ]})
+        parser = ResultsStreamParser()
+        emitted = []
+        for i in range(0, len(text), 3):
+            emitted.append(parser.feed(text[i:i + 3]))
+        items = [item for chunk in emitted for item in chunk]
+        self.assertEqual([item["index"] for item in items], [1, 2])
+        self.assertEqual(items[0]["facts"][1], 'Bring "warm" clothes ]')
+        # The first element arrives before the stream ends
+        first_at = next(i for i, chunk in enumerate(emitted) if chunk)
+        self.assertLess(first_at, len(emitted) - 1)
+        self.assertTrue(parser.done)
+
+
+class TestStreamedExtraction(unittest.TestCase):
+    """extract_facts_batch delivers every question once and returns the full result."""
+
+    def setUp(self):
+        model = FakeChatModel(model="fake-stream", stream_chunk_chars=8)
+        self._previous_backend = set_llm_backend(lambda settings: (model, model))
+
+    def tearDown(self):
+        set_llm_backend(self._previous_backend)
+
+    def test_on_facts_receives_each_question(self):
+        questions = ["Is pickup included?", "What is the price?", "What should I pack?"]
+        delivered = []
+        result = LLMClient().extract_facts_batch(
+            questions,
+            {"trip_summary": "Kashmir", "pricing": {"total": 1}},
+            on_facts=lambda question, facts: delivered.append((question, facts))
+        )
+        self.assertEqual([q for q, _ in delivered], questions)
+        self.assertEqual(dict(delivered), result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for index-keyed structured output of batch LLM calls (no API key required)."""
+
+import os
+import sys
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
+
+from langchain_core.messages import AIMessage
+
+from llm.call_ledger import get_call_ledger
+from llm.client import LLMClient, set_llm_backend
+from llm.fake_backend import fake_backend_factory
+from llm.schemas import ClassificationBatch, SchemaParser, StructuredOutputError, by_index
+
+
+class TestSchemaParser(unittest.TestCase):
+    """One validated parse, results mapped back by index."""
+
+    def test_parse_and_map_by_index(self):
+        parser = SchemaParser(ClassificationBatch)
+        message = AIMessage(content='```json\n{"results": [{"index": 2, "label": "FORBIDDEN"}, {"index": 9, "label": "HOSTILE"}]}\n```')
+        result = parser.invoke(message)
+        self.assertEqual(by_index(["a", "b"], result.results, "label"), {"b": "FORBIDDEN"})
+        self.assertEqual(parser.model_kwargs["response_mime_type"], "application/json")
+
+    def test_invalid_label_is_rejected(self):
+        parser = SchemaParser(ClassificationBatch)
+        with self.assertRaises(StructuredOutputError):
+            parser.invoke(AIMessage(content='{"results": [{"index": 1, "label": "MAYBE"}]}'))
+
+
+class TestBatchCalls(unittest.TestCase):
+    """Batch methods make exactly one call through the fake backend."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._previous_backend = set_llm_backend(fake_backend_factory(seed=3))
+
+    @classmethod
+    def tearDownClass(cls):
+        set_llm_backend(cls._previous_backend)
+
+    def test_classify_batch_single_call(self):
+        ledger = get_call_ledger()
+        before = ledger.total_calls
+        questions = ["What is the price of the trip?", "Can you guarantee a refund?", "Is pickup included?"]
+        result = LLMClient().classify_questions_batch(questions)
+        self.assertEqual(result, {
+            "What is the price of the trip?": "ANSWERABLE",
+            "Can you guarantee a refund?": "FORBIDDEN",
+            "Is pickup included?": "ANSWERABLE",
+        })
+        self.assertEqual(ledger.total_calls - before, 1)
+
+    def test_extract_batch_keeps_question_order(self):
+        questions = ["Is pickup included?", "What is the price?"]
+        result = LLMClient().extract_facts_batch(questions, {"trip_summary": "Kashmir", "pricing": {"total": 1}})
+        self.assertEqual(list(result), questions)
+        self.assertIn("What is the price?", result["What is the price?"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Tests for sampled turn tracing (no API key required)."""
+
+import os
+import sys
+import threading
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+os.environ.setdefault("TRANSFORMERS_NO_TORCH", "1")
+
+from app import tracing
+from app.tracing import TraceExporter, TracePolicy, TurnTrace, get_trace_exporter, set_trace_exporter
+from app.turn import process_turn
+from graph.build_graph import get_compiled_graph
+from llm.client import set_llm_backend
+from llm.fake_backend import fake_backend_factory
+from state.memory import ConversationMemory
+from state.store import StateStore
+
+
+class TestTracePolicy(unittest.TestCase):
+    """Head sampling plus always-keep for errors and slow turns."""
+
+    def test_export_reasons(self):
+        policy = TracePolicy(sample_rate=0.0, slow_turn_ms=1000)
+        trace = TurnTrace("s1", "t1", sampled=policy.head_sample())
+        self.assertIsNone(policy.export_reason(trace, 10, None))
+        self.assertEqual(policy.export_reason(trace, 1500, None), "slow")
+        trace.add_span("llm", "compose_answer", 5, error="FakeLLMError")
+        self.assertEqual(policy.export_reason(trace, 10, None), "error")
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        release = threading.Event()
+        exporter = TraceExporter(lambda trace: release.wait(5), max_queue=1)
+        results = [exporter.submit({"n": i}) for i in range(4)]
+        release.set()
+        self.assertFalse(all(results))
+        self.assertGreaterEqual(exporter.stats()["dropped"], 2)
+        self.assertTrue(exporter.flush())
+
+
+class TestTracedTurn(unittest.TestCase):
+    """process_turn exports a trace with session/turn ids, node and LLM spans."""
+
+    def setUp(self):
+        self._previous_backend = set_llm_backend(fake_backend_factory(seed=5))
+        self._previous = (get_trace_exporter(), tracing._POLICY)
+        self.exported = []
+        set_trace_exporter(TraceExporter(self.exported.append), TracePolicy(sample_rate=1.0))
+
+    def tearDown(self):
+        set_trace_exporter(*self._previous)
+        set_llm_backend(self._previous_backend)
+
+    def test_sampled_turn_is_exported(self):
+        exporter = get_trace_exporter()
+        result = process_turn(get_compiled_graph(), ConversationMemory(StateStore()), "session-42", "What is the price of the Kashmir trip?")
+        self.assertTrue(exporter.flush())
+        self.assertEqual(len(self.exported), 1)
+        trace = self.exported[0]
+        self.assertEqual((trace["session_id"], trace["turn_id"], trace["reason"]), ("session-42", result["turn_id"], "sampled"))
+        kinds = {span["kind"] for span in trace["spans"]}
+        self.assertEqual(kinds, {"node", "llm"})
+        self.assertEqual(trace["outputs"]["final_text"], result["final_text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
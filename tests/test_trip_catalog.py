@@ -0,0 +1,140 @@
+"""Tests for the hot-reloadable trip catalog (no API key required)."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path - use absolute path to handle running from different directories
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+_src_dir = os.path.join(_project_root, 'src')
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+from domain.inventory import get_seat_inventory
+from domain.trips.catalog import TripCatalog, set_trip_catalog
+from domain.trips.loader import get_all_trips, get_trip_data
+from domain.trips.store import SqliteTripStore
+from state.memory import topic_to_trip_id, trip_id_to_topic
+from graph.nodes.non_skippable.resolve_trip_context import get_trip_keyword_index
+
+
+def _trip(trip_id, name, seats="4"):
+    return {
+        "trip_id": trip_id,
+        "name": name,
+        "destination": name,
+        "batches": {"available_batches": [{"batch_id": f"{trip_id}-1", "start_date": "2026-05-01", "seats_left": seats, "status": "open"}]},
+    }
+
+
+class TestTripCatalog(unittest.TestCase):
+    """Data-dir trips load into versioned snapshots; reloads touch only changed trips."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self._tmp.name
+        self._write("ladakh.json", _trip("ladakh_zo_trip_TR-1", "Ladakh"))
+        self._write("meghalaya.json", _trip("meghalaya_zo_trip_TR-2", "Meghalaya"))
+        self.catalog = TripCatalog(self.data_dir, include_modules=False)
+        self._previous = set_trip_catalog(self.catalog)
+
+    def tearDown(self):
+        set_trip_catalog(self._previous)
+        self._tmp.cleanup()
+
+    def _write(self, name, payload):
+        path = os.path.join(self.data_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        # Force a new signature even within the filesystem's mtime resolution
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+
+    def test_snapshot_is_read_only_and_versioned(self):
+        snapshot = self.catalog.snapshot
+        self.assertEqual((snapshot.version, len(snapshot)), (1, 2))
+        with self.assertRaises(TypeError):
+            snapshot.trips["x"] = {}
+        self.assertEqual(self.catalog.reload(), (set(), set()))
+        self.assertIs(self.catalog.snapshot, snapshot)
+
+    def test_reload_updates_derived_indexes_for_changed_trips_only(self):
+        self.assertIn("meghalaya_zo_trip_TR-2", get_trip_keyword_index())
+        self.assertEqual(get_seat_inventory().trip("ladakh_zo_trip_TR-1").next_available()["seats_left"], 4)
+
+        self._write("ladakh.json", _trip("ladakh_zo_trip_TR-1", "Leh Ladakh", seats="0"))
+        os.remove(os.path.join(self.data_dir, "meghalaya.json"))
+        self.assertEqual(self.catalog.reload(), ({"ladakh_zo_trip_TR-1"}, {"meghalaya_zo_trip_TR-2"}))
+
+        index = get_trip_keyword_index()
+        self.assertEqual(index["ladakh_zo_trip_TR-1"]["name"], "leh ladakh")
+        self.assertNotIn("meghalaya_zo_trip_TR-2", index)
+        self.assertIsNone(get_seat_inventory().trip("ladakh_zo_trip_TR-1").next_available())
+        self.assertEqual(get_trip_data("ladakh_zo_trip_TR-1")["name"], "Leh Ladakh")
+
+    def test_bad_file_keeps_last_good_version(self):
+        self.assertEqual(self.catalog.snapshot.version, 1)
+        with open(os.path.join(self.data_dir, "ladakh.json"), "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.catalog.reload()
+        self.assertEqual(get_trip_data("ladakh_zo_trip_TR-1")["name"], "Ladakh")
+        self.assertEqual((self.catalog.reload_errors, self.catalog.snapshot.version), (1, 1))
+
+
+class TestSqliteTripStore(unittest.TestCase):
+    """A store-backed catalog keeps only ids and checksums; trips load lazily through a bounded LRU."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = SqliteTripStore(os.path.join(self._tmp.name, "trips.db"), cache_size=8)
+        self.store.upsert(_trip(f"dest{i}_zo_trip_TR-{i}", f"Dest {i}") for i in range(300))
+        self.catalog = TripCatalog(store=self.store)
+        self._previous = set_trip_catalog(self.catalog)
+
+    def tearDown(self):
+        set_trip_catalog(self._previous)
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_topic_maps_and_views_load_nothing(self):
+        self.assertEqual(len(get_all_trips()), 300)
+        self.assertEqual(topic_to_trip_id("DEST42"), "dest42_zo_trip_TR-42")
+        self.assertEqual(trip_id_to_topic("dest7_zo_trip_TR-7"), "dest7")
+        self.assertEqual(self.store.loads, 0)
+        self.assertEqual(get_trip_data("dest42_zo_trip_TR-42")["name"], "Dest 42")
+        get_trip_data("dest42_zo_trip_TR-42")
+        self.assertEqual(self.store.loads, 1)
+
+    def test_derived_indexes_do_not_load_trips(self):
+        from domain.inventory.seats import get_seat_inventory, set_seat_inventory
+        from graph.nodes.non_skippable.resolve_trip_context import _reset_trip_index, get_trip_keyword_index
+
+        _reset_trip_index()
+        previous = set_seat_inventory(None)
+        try:
+            index = get_trip_keyword_index()
+            inventory = get_seat_inventory()
+            self.assertEqual(len(index), 300)
+            self.assertIn("dest 42", index["dest42_zo_trip_TR-42"]["keywords"])
+            self.assertEqual(inventory.stats()["trips"], 300)
+            self.assertEqual(self.store.loads, 0)
+        finally:
+            set_seat_inventory(previous)
+            _reset_trip_index()
+
+    def test_store_writes_reload_changed_trips(self):
+        snapshot = self.catalog.snapshot
+        self.assertEqual(self.store.upsert([_trip("dest1_zo_trip_TR-1", "Dest 1")]), 0)
+        self.assertEqual(self.catalog.reload(), (set(), set()))
+        self.store.upsert([_trip("dest1_zo_trip_TR-1", "Renamed")])
+        self.store.delete(["dest2_zo_trip_TR-2"])
+        self.assertEqual(self.catalog.reload(), ({"dest1_zo_trip_TR-1"}, {"dest2_zo_trip_TR-2"}))
+        self.assertEqual(self.catalog.snapshot.version, snapshot.version + 1)
+        self.assertEqual(get_trip_data("dest1_zo_trip_TR-1")["name"], "Renamed")
+        self.assertIsNone(topic_to_trip_id("dest2"))
+
+
+if __name__ == "__main__":
+    unittest.main()